@@ -0,0 +1,4 @@
+"""
+Klipify Benchmarks
+Performance benchmarks that run against the offline fake backends.
+"""
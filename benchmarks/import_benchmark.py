@@ -0,0 +1,172 @@
+"""
+Klipify Import-Time Benchmark
+Measures the cold-start cost of importing the app in fresh interpreters and
+checks it against a budget.
+
+The figure that is budgeted is Klipify's own overhead: the median time to
+import klipify_new_ui minus the median time to import Streamlit alone. The
+benchmark also fails if modules that should load lazily (VideoDB, GenAI,
+requests, page modules other than the landing page) are imported at startup.
+
+Usage:
+    python -m benchmarks.import_benchmark
+    python -m benchmarks.import_benchmark --repeat 10 --budget-ms 150
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APP_MODULE = "klipify_new_ui"
+BASELINE_MODULE = "streamlit"
+
+# Klipify's own import overhead allowed on top of Streamlit's
+DEFAULT_BUDGET_MS = 250.0
+
+# Modules the first page paint must not need
+LAZY_MODULES = (
+    "videodb",
+    "google.genai",
+    "numpy",
+    "requests",
+    "http.server",
+    "urllib.request",
+    "src.services.videodb_manager",
+    "src.services.fake_backends",
+    "src.ui.ui_components.clips_page",
+    "src.ui.ui_components.summary_page",
+    "src.ui.ui_components.notes_page",
+    "src.ui.ui_components.chat_page",
+    "src.ui.ui_components.video_management",
+)
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - started
+print(json.dumps({{'seconds': seconds, 'modules': sorted(sys.modules)}}))
+"""
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(.*)$")
+
+
+def measure_import(module, python=sys.executable):
+    """
+    Import a module in a fresh interpreter.
+
+    Args:
+        module (str): Module to import
+        python (str): Interpreter to run
+
+    Returns:
+        dict: seconds, loaded module names and per-module self time (us)
+    """
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", _PROBE.format(module=module)],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise Exception(f"Importing {module} failed: {result.stderr.strip().splitlines()[-1:]}")
+
+    self_us = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us[match.group(3).strip()] = int(match.group(1))
+
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    return {'seconds': probe['seconds'], 'modules': probe['modules'], 'self_us': self_us}
+
+
+def run_import_benchmark(repeat=5, budget_ms=DEFAULT_BUDGET_MS, top=15):
+    """
+    Measure cold imports of the app and of Streamlit alone.
+
+    Args:
+        repeat (int): Fresh interpreters per module (medians are reported)
+        budget_ms (float): Allowed Klipify overhead in milliseconds
+        top (int): Slowest Klipify-side modules to list
+
+    Returns:
+        dict: Timings, eagerly loaded lazy modules, slowest imports and verdict
+    """
+    app_runs = [measure_import(APP_MODULE) for _ in range(repeat)]
+    baseline_runs = [measure_import(BASELINE_MODULE) for _ in range(repeat)]
+
+    app_ms = statistics.median(run['seconds'] for run in app_runs) * 1000
+    baseline_ms = statistics.median(run['seconds'] for run in baseline_runs) * 1000
+    overhead_ms = max(app_ms - baseline_ms, 0.0)
+
+    loaded = set(app_runs[-1]['modules'])
+    baseline_modules = set(baseline_runs[-1]['modules'])
+    # Only modules Klipify itself pulls in count; Streamlit imports some (e.g. urllib.request)
+    eager = [name for name in LAZY_MODULES if name in loaded - baseline_modules]
+
+    # Modules the app adds on top of Streamlit, by median self time
+    added = {}
+    for run in app_runs:
+        for name, micros in run['self_us'].items():
+            if name not in baseline_modules:
+                added.setdefault(name, []).append(micros)
+    slowest = sorted(
+        ((name, statistics.median(samples) / 1000) for name, samples in added.items()),
+        key=lambda item: -item[1]
+    )[:top]
+
+    return {
+        'repeat': repeat,
+        'app_import_ms': app_ms,
+        'streamlit_import_ms': baseline_ms,
+        'klipify_overhead_ms': overhead_ms,
+        'budget_ms': budget_ms,
+        'modules_added': len(loaded - baseline_modules),
+        'eager_lazy_modules': eager,
+        'slowest_imports_ms': dict(slowest),
+        'within_budget': overhead_ms <= budget_ms and not eager,
+    }
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Klipify import-time benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Allowed Klipify import overhead on top of Streamlit")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--output", help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run_import_benchmark(args.repeat, args.budget_ms, args.top)
+
+    print(f"⏱️ import {APP_MODULE}: {results['app_import_ms']:.0f} ms "
+          f"(streamlit alone {results['streamlit_import_ms']:.0f} ms)")
+    print(f"   Klipify overhead: {results['klipify_overhead_ms']:.0f} ms "
+          f"across {results['modules_added']} modules (budget {args.budget_ms:.0f} ms)")
+    for name, ms in results['slowest_imports_ms'].items():
+        print(f"   {ms:7.1f} ms  {name}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+        print(f"📄 Results written to {args.output}")
+
+    if results['eager_lazy_modules']:
+        print(f"❌ Loaded at startup but should be lazy: {', '.join(results['eager_lazy_modules'])}")
+    if results['klipify_overhead_ms'] > args.budget_ms:
+        print("❌ Import overhead is over budget")
+    if not results['within_budget']:
+        return 1
+    print("✅ Startup imports are within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
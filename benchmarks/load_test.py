@@ -0,0 +1,421 @@
+"""
+Klipify Load Test
+Ramps up concurrent simulated learners driving the Streamlit app through
+AppTest on the offline fake backends. Each learner opens a processed video,
+moves between Clips, Summary, Notes and Chat, filters clips, searches and
+pages through the transcript and asks the chat assistant questions.
+
+AppTest swaps process-wide Streamlit state on every rerun, so each
+learner runs in its own process with its own AppTest; latencies and
+resident memory are gathered from all of them in the parent.
+
+For every concurrency level it reports p50/p95/p99 rerun latency,
+throughput, errors and resident memory per session, then names the
+saturation point: the first level where latency breaks the SLO, errors
+appear, or throughput stops scaling with the number of sessions.
+
+Usage:
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --sessions 1 10 50 100 200 --duration 30
+    python -m benchmarks.load_test --think-time 0.5 --slo-ms 500 --latency-scale 0.05
+
+Requires Streamlit's testing API (streamlit.testing.v1).
+"""
+
+import argparse
+import multiprocessing
+import os
+import queue
+import random
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime
+
+from benchmarks.pipeline_benchmark import RESULTS_DIR, run_pipeline_once, write_results
+from src.services.fake_backends import configure_fake_backend
+
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "klipify_new_ui.py")
+
+DEFAULT_SESSIONS = (1, 5, 10, 25, 50, 100)
+
+# Navigation labels in the sidebar radio (navigation.py)
+NAV_CLIPS = "🎬 Clips"
+NAV_SUMMARY = "📊 Summary"
+NAV_NOTES = "📝 Notes"
+NAV_CHAT = "💬 Chat"
+
+TRANSCRIPT_QUERIES = ("gradient", "the model", "equi*", '"key idea"', "loss function")
+CLIP_FILTERS = ("a", "learning", "concept", "")
+CHAT_QUESTIONS = (
+    "Can you summarize the key points?",
+    "Explain the main concept in simple terms.",
+    "Give me three quiz questions about this video.",
+)
+
+# A level is saturated once throughput per session drops below this
+# fraction of the single-session rate
+MIN_SCALING_EFFICIENCY = 0.8
+MAX_ERROR_RATE = 0.01
+
+
+def _rss_mb():
+    """Current resident set size in MB (peak size where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as handle:
+            pages = int(handle.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS bytes
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _widget(widgets, label_prefix):
+    """Find a widget by the start of its label."""
+    for widget in widgets:
+        if (widget.label or "").startswith(label_prefix):
+            return widget
+    raise LookupError(f"No widget labelled '{label_prefix}...'")
+
+
+class SimulatedLearner:
+    """One learner session looping through the app until stopped."""
+
+    def __init__(self, index, youtube_id, recorder, stop_event, think_time, timeout, seed):
+        self.index = index
+        self.youtube_id = youtube_id
+        self.recorder = recorder
+        self.stop_event = stop_event
+        self.think_time = think_time
+        self.timeout = timeout
+        self.random = random.Random(seed + index)
+        self.app = None
+
+    def run(self):
+        if self._step('open', self._open):
+            return
+        actions = [
+            ('clips', lambda: self._navigate(NAV_CLIPS)),
+            ('clip_filter', self._filter_clips),
+            ('summary', lambda: self._navigate(NAV_SUMMARY)),
+            ('notes', lambda: self._navigate(NAV_NOTES)),
+            ('transcript_search', self._search_transcript),
+            ('transcript_next_page', self._next_transcript_page),
+            ('chat', lambda: self._navigate(NAV_CHAT)),
+            ('chat_message', self._send_chat_message),
+        ]
+        while not self.stop_event.is_set():
+            for name, action in actions:
+                if self._think():
+                    return
+                self._step(name, action)
+
+    def _think(self):
+        """Pause like a reader would; True once the test is stopping."""
+        delay = self.random.expovariate(1 / self.think_time) if self.think_time > 0 else 0
+        return self.stop_event.wait(delay)
+
+    def _step(self, name, action):
+        """Time one interaction; returns its error, if any."""
+        started = time.perf_counter()
+        error = None
+        try:
+            action()
+            if self.app.exception:
+                error = str(self.app.exception[0].message)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self.recorder.put(('sample', time.time(), name, (time.perf_counter() - started) * 1000, error))
+        self.recorder.put(('rss', self.index, _rss_mb()))
+        return error
+
+    def _open(self):
+        from streamlit.testing.v1 import AppTest
+
+        self.app = AppTest.from_file(APP_PATH, default_timeout=self.timeout)
+        self.app.query_params["video"] = self.youtube_id
+        self.app.run()
+
+    def _navigate(self, label):
+        self.app.radio(key="nav_radio").set_value(label).run()
+
+    def _filter_clips(self):
+        _widget(self.app.text_input, "🔍 Search clips").set_value(self.random.choice(CLIP_FILTERS)).run()
+
+    def _search_transcript(self):
+        query = self.random.choice(TRANSCRIPT_QUERIES + ("",))
+        _widget(self.app.text_input, "🔍 Search transcript").set_value(query).run()
+
+    def _next_transcript_page(self):
+        for button in self.app.button:
+            if (button.label or "").startswith("Next Page") and not button.disabled:
+                button.click().run()
+                return
+        # Single-page results: a plain rerun, like any other interaction
+        self.app.run()
+
+    def _send_chat_message(self):
+        self.app.chat_input[0].set_value(self.random.choice(CHAT_QUESTIONS)).run()
+
+
+def _run_learner(index, youtube_id, recorder, stop_event, think_time, timeout, seed,
+                 latency_scale, minutes):
+    """Learner process entry point: one AppTest per process."""
+    # Fake backend settings live in process memory, so every learner applies its own
+    configure_fake_backend(latency_scale=latency_scale, transcript_minutes=minutes, seed=seed)
+    SimulatedLearner(index, youtube_id, recorder, stop_event, think_time, timeout, seed).run()
+
+
+class LatencyRecorder:
+    """Collects per-action latencies and memory readings from every learner process."""
+
+    def __init__(self, context):
+        self.queue = context.Queue()
+        self._samples = []
+        self._rss = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._drainer = threading.Thread(target=self._drain, name="klipify-load-recorder", daemon=True)
+        self._drainer.start()
+
+    def _drain(self):
+        while not self._stopped.is_set():
+            try:
+                message = self.queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            with self._lock:
+                if message[0] == 'sample':
+                    self._samples.append(message[1:])
+                else:
+                    self._rss[message[1]] = message[2]
+
+    def stop(self):
+        self._stopped.set()
+        self._drainer.join()
+
+    def window(self, started, ended):
+        """Samples recorded between two time.time() readings."""
+        with self._lock:
+            return [sample for sample in self._samples if started <= sample[0] < ended]
+
+    def learner_rss(self):
+        """Latest resident memory (MB) reported by each learner process."""
+        with self._lock:
+            return dict(self._rss)
+
+
+def summarize_window(samples, seconds, sessions):
+    """
+    Summarize one measurement window.
+
+    Args:
+        samples (list): (timestamp, action, ms, error) tuples
+        seconds (float): Window length
+        sessions (int): Concurrent learners during the window
+
+    Returns:
+        dict: Latency percentiles, throughput, errors and per-action medians
+    """
+    latencies = sorted(ms for _, _, ms, error in samples if error is None)
+    errors = [error for _, _, _, error in samples if error is not None]
+    by_action = {}
+    for _, action, ms, error in samples:
+        if error is None:
+            by_action.setdefault(action, []).append(ms)
+
+    summary = {
+        'sessions': sessions,
+        'actions': len(samples),
+        'errors': len(errors),
+        'error_rate': len(errors) / len(samples) if samples else 0.0,
+        'throughput_per_second': len(samples) / seconds if seconds else 0.0,
+        'p50_ms': _percentile(latencies, 0.50) if latencies else 0.0,
+        'p95_ms': _percentile(latencies, 0.95) if latencies else 0.0,
+        'p99_ms': _percentile(latencies, 0.99) if latencies else 0.0,
+        'max_ms': latencies[-1] if latencies else 0.0,
+        'action_p50_ms': {action: statistics.median(values) for action, values in sorted(by_action.items())},
+    }
+    if errors:
+        summary['sample_errors'] = sorted(set(errors))[:5]
+    return summary
+
+
+def find_saturation(levels, slo_ms):
+    """
+    Find the first concurrency level the host cannot sustain.
+
+    Args:
+        levels (list): Window summaries in ramp order
+        slo_ms (float): p95 latency objective
+
+    Returns:
+        dict: saturated_at (sessions or None), max_sustainable_sessions and the reason
+    """
+    base = next((level for level in levels if level['actions']), None)
+    per_session_rate = base['throughput_per_second'] / base['sessions'] if base else 0.0
+
+    sustainable = None
+    for level in levels:
+        reasons = []
+        if level['p95_ms'] > slo_ms:
+            reasons.append(f"p95 {level['p95_ms']:.0f} ms > SLO {slo_ms:.0f} ms")
+        if level['error_rate'] > MAX_ERROR_RATE:
+            reasons.append(f"error rate {level['error_rate']:.1%}")
+        expected = per_session_rate * level['sessions']
+        if expected and level['throughput_per_second'] < MIN_SCALING_EFFICIENCY * expected:
+            reasons.append(
+                f"throughput {level['throughput_per_second']:.1f}/s is "
+                f"{level['throughput_per_second'] / expected:.0%} of linear scaling"
+            )
+        if reasons:
+            return {
+                'saturated_at': level['sessions'],
+                'max_sustainable_sessions': sustainable,
+                'reason': "; ".join(reasons),
+            }
+        sustainable = level['sessions']
+
+    return {'saturated_at': None, 'max_sustainable_sessions': sustainable, 'reason': None}
+
+
+def seed_video(minutes, seed):
+    """
+    Process one synthetic video into the store for the learners to open.
+
+    Returns:
+        str: YouTube ID of the stored video
+    """
+    video_data, _wall = run_pipeline_once(minutes, latency_scale=0.0, seed=seed, case_index=99)
+    return video_data['youtube_id']
+
+
+def run_load_test(sessions=DEFAULT_SESSIONS, duration=20.0, warmup=5.0, think_time=1.0,
+                  latency_scale=0.05, slo_ms=1000.0, timeout=30.0, minutes=30, seed=0):
+    """
+    Ramp through the concurrency levels and measure each one.
+
+    Sessions started for one level keep running into the next, so every
+    level adds learners on top of an already loaded app.
+
+    Returns:
+        dict: JSON-serializable results
+    """
+    try:
+        import streamlit.testing.v1  # noqa: F401
+    except ImportError as e:
+        raise Exception(f"Streamlit's testing API is required for load tests: {str(e)}")
+
+    youtube_id = seed_video(minutes, seed)
+    # Fake API latency for what learners trigger (chat), after seeding at full speed
+    configure_fake_backend(latency_scale=latency_scale, transcript_minutes=minutes, seed=seed)
+
+    # spawn: a forked child would inherit the parent's threads and Streamlit state
+    context = multiprocessing.get_context("spawn")
+    recorder = LatencyRecorder(context)
+    stop_event = context.Event()
+    learners = []
+    levels = []
+    baseline_rss = _rss_mb()
+
+    try:
+        for level in sorted(set(sessions)):
+            print(f"👥 Ramping to {level} concurrent sessions...")
+            while len(learners) < level:
+                learner = context.Process(
+                    target=_run_learner,
+                    name=f"klipify-learner-{len(learners)}",
+                    args=(len(learners), youtube_id, recorder.queue, stop_event, think_time,
+                          timeout, seed, latency_scale, minutes),
+                    daemon=True,
+                )
+                learner.start()
+                learners.append(learner)
+
+            stop_event.wait(warmup)
+            window_started = time.time()
+            stop_event.wait(duration)
+            window_ended = time.time()
+
+            summary = summarize_window(
+                recorder.window(window_started, window_ended), window_ended - window_started, level
+            )
+            learner_rss = list(recorder.learner_rss().values())
+            summary['rss_mb'] = _rss_mb() + sum(learner_rss)
+            summary['memory_per_session_mb'] = statistics.mean(learner_rss) if learner_rss else 0.0
+            levels.append(summary)
+            print(
+                f"   p50 {summary['p50_ms']:.0f} ms, p95 {summary['p95_ms']:.0f} ms, "
+                f"p99 {summary['p99_ms']:.0f} ms, {summary['throughput_per_second']:.1f} actions/s, "
+                f"{summary['errors']} errors, {summary['memory_per_session_mb']:.1f} MB/session"
+            )
+    finally:
+        stop_event.set()
+        for learner in learners:
+            learner.join(timeout)
+            if learner.is_alive():
+                learner.terminate()
+        recorder.stop()
+
+    return {
+        'created_at': datetime.now().isoformat(timespec="seconds"),
+        'settings': {
+            'duration': duration, 'warmup': warmup, 'think_time': think_time,
+            'latency_scale': latency_scale, 'slo_ms': slo_ms, 'minutes': minutes, 'seed': seed,
+        },
+        'baseline_rss_mb': baseline_rss,
+        'levels': levels,
+        'saturation': find_saturation(levels, slo_ms),
+    }
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Klipify concurrent-session load test")
+    parser.add_argument("--sessions", type=int, nargs="+", default=list(DEFAULT_SESSIONS),
+                        help="Concurrency levels to ramp through")
+    parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds per level")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds after each ramp step")
+    parser.add_argument("--think-time", type=float, default=1.0,
+                        help="Mean seconds a learner pauses between interactions (0 for none)")
+    parser.add_argument("--latency-scale", type=float, default=0.05, help="Fake API latency multiplier")
+    parser.add_argument("--slo-ms", type=float, default=1000.0, help="p95 rerun latency objective")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds before a rerun counts as failed")
+    parser.add_argument("--minutes", type=float, default=30, help="Length of the synthetic video")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Results JSON path (defaults to benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    results = run_load_test(
+        args.sessions, args.duration, args.warmup, args.think_time,
+        args.latency_scale, args.slo_ms, args.timeout, args.minutes, args.seed
+    )
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"load-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    print(f"📄 Results written to {write_results(results, output)}")
+
+    saturation = results['saturation']
+    if saturation['saturated_at'] is None:
+        print(f"✅ No saturation up to {saturation['max_sustainable_sessions']} sessions")
+    else:
+        print(
+            f"📈 Saturated at {saturation['saturated_at']} sessions ({saturation['reason']}); "
+            f"max sustainable: {saturation['max_sustainable_sessions'] or 'none'}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,345 @@
+"""
+Klipify Pipeline Benchmark
+Drives VideoProcessingPipeline and the UI data paths over synthetic videos
+using the offline fake backends, and compares results against a baseline.
+
+Usage:
+    python -m benchmarks.pipeline_benchmark
+    python -m benchmarks.pipeline_benchmark --minutes 5 60 --repeat 5
+    python -m benchmarks.pipeline_benchmark --save-baseline
+    python -m benchmarks.pipeline_benchmark --compare benchmarks/baseline.json --threshold 0.2
+
+Exits with status 1 when a metric regresses beyond the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+# Benchmarks always run offline, against a throwaway data directory
+os.environ["KLIPIFY_BACKEND"] = "fake"
+os.environ.setdefault("KLIPIFY_DATA_DIR", tempfile.mkdtemp(prefix="klipify-bench-"))
+os.environ.setdefault("KLIPIFY_STATIC_DIR", os.path.join(os.environ["KLIPIFY_DATA_DIR"], "static"))
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from src.processing import VideoProcessingPipeline
+from src.services.fake_backends import (
+    configure_fake_backend,
+    get_fake_backend_stats,
+    reset_fake_backend_stats,
+    FakeVideoDBConnection,
+    FakeGenAIClient
+)
+from src.services.video_store import get_video_store
+from src.services.library_index import get_library_index
+from src.services.artifact_cache import open_video_handle
+from src.ui.ui_components.notes_page import _html_cache, _transcript_page_html
+from src.ui.ui_components.clips_page import _filter_clips
+from src.ui.styles.main_styles import CSS_PATH, get_css_markup
+
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+
+# Synthetic video lengths from a short lesson to a full-day workshop
+DEFAULT_MINUTES = (5, 30, 120, 300)
+
+# Differences below these floors are treated as noise, whatever the ratio
+_NOISE_FLOORS = {
+    'seconds': 0.005,
+    'ms': 0.05,
+    'mb': 1.0,
+}
+
+SEARCH_QUERIES = ("the", "gradient descent", "equi*", '"key idea behind"', "nonexistentterm")
+PAGE_SIZE = 25
+
+
+class _SilentReporter:
+    """Discards pipeline progress."""
+
+    def status(self, step, total_steps, message):
+        pass
+
+    def notify(self, level, message):
+        pass
+
+
+def run_pipeline_once(minutes, latency_scale, seed, case_index):
+    """
+    Process one synthetic video.
+
+    Returns:
+        tuple: (video_data, wall_seconds)
+    """
+    configure_fake_backend(latency_scale=latency_scale, transcript_minutes=minutes, seed=seed)
+    youtube_id = f"bench{case_index:02d}{int(minutes):04d}"[:11]
+    pipeline = VideoProcessingPipeline(
+        FakeVideoDBConnection(), FakeGenAIClient(), reporter=_SilentReporter()
+    )
+    started = time.perf_counter()
+    video_data = pipeline.run(f"https://www.youtube.com/watch?v={youtube_id}", youtube_id)
+    return video_data, time.perf_counter() - started
+
+
+def _time_ms(function, repeat):
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def measure_ui_paths(video_data, repeat):
+    """
+    Time the data work behind the notes, clips and library pages.
+
+    Args:
+        video_data (dict): Processed video data
+        repeat (int): Samples per measurement
+
+    Returns:
+        dict: Median milliseconds per operation
+    """
+    transcript = video_data['transcript_segments']
+    transcript_index = video_data['transcript_index']
+    youtube_id = video_data['youtube_id']
+
+    def search_and_page():
+        for query in SEARCH_QUERIES:
+            result = transcript_index.search(query)
+            for segment_index in result.page(0, PAGE_SIZE):
+                result.spans(segment_index)
+
+    # A query that hits this video, so highlighting is exercised
+    hit_query = (video_data.get('concepts') or [SEARCH_QUERIES[1]])[0]
+
+    def render_page(cached=False):
+        if not cached:
+            _html_cache.clear()
+        result = transcript_index.search(hit_query)
+        _transcript_page_html(transcript, youtube_id, result.page(0, PAGE_SIZE), result,
+                              (hit_query, 0, PAGE_SIZE))
+
+    def render_unfiltered_page(cached=False):
+        if not cached:
+            _html_cache.clear()
+        _transcript_page_html(transcript, youtube_id, range(min(PAGE_SIZE, len(transcript))), None,
+                              ("", 0, PAGE_SIZE))
+
+    video_store = get_video_store()
+
+    def open_and_list_clips():
+        handle = open_video_handle(key=youtube_id, loader=lambda: video_store.load_video(youtube_id))
+        _filter_clips(handle.get('clips', []), "a", only_playable=True)
+        handle.release()
+
+    library_index = get_library_index()
+
+    return {
+        'transcript_search_ms': _time_ms(search_and_page, repeat) / len(SEARCH_QUERIES),
+        'notes_page_render_ms': _time_ms(render_unfiltered_page, repeat),
+        'notes_search_page_render_ms': _time_ms(render_page, repeat),
+        'notes_page_cached_render_ms': _time_ms(lambda: render_unfiltered_page(cached=True), repeat),
+        'store_load_ms': _time_ms(lambda: video_store.load_video(youtube_id), repeat),
+        'clip_listing_ms': _time_ms(open_and_list_clips, repeat),
+        'library_search_ms': _time_ms(lambda: library_index.search("gradient descent"), repeat),
+    }
+
+
+def measure_rerun_payloads():
+    """
+    Bytes of stylesheet markup sent to the browser on every rerun.
+
+    Returns:
+        dict: Unminified inline CSS (as before static serving), minified
+            inline CSS (the fallback) and the static-file @import
+    """
+    with open(CSS_PATH, encoding="utf-8") as handle:
+        unminified = f"<style>\n{handle.read()}</style>"
+    return {
+        'css_inline_unminified': len(unminified.encode("utf-8")),
+        'css_inline_minified': len(get_css_markup(use_static=False).encode("utf-8")),
+        'css_static_import': len(get_css_markup(use_static=True).encode("utf-8")),
+    }
+
+
+def benchmark_case(minutes, repeat, latency_scale, seed, case_index):
+    """
+    Benchmark one synthetic video length.
+
+    Returns:
+        dict: Wall time, per-stage latency, API calls, tokens, peak memory and UI timings
+    """
+    walls = []
+    stages = {}
+    api_stats = {}
+    video_data = None
+
+    for _ in range(repeat):
+        reset_fake_backend_stats()
+        video_data, wall = run_pipeline_once(minutes, latency_scale, seed, case_index)
+        walls.append(wall)
+        for stage, seconds in video_data['stage_timings'].items():
+            stages.setdefault(stage, []).append(seconds)
+        api_stats = get_fake_backend_stats()
+
+    # Separate run for memory, since tracing slows everything down
+    tracemalloc.start()
+    run_pipeline_once(minutes, latency_scale, seed, case_index)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'minutes': minutes,
+        'segments': len(video_data['transcript_segments']),
+        'transcript_chars': len(video_data['transcript_text']),
+        'wall_seconds': statistics.median(walls),
+        'stages_seconds': {stage: statistics.median(samples) for stage, samples in stages.items()},
+        'api_calls': {operation: stats['calls'] for operation, stats in api_stats.items()},
+        'api_calls_total': sum(stats['calls'] for stats in api_stats.values()),
+        'prompt_tokens': sum(stats['prompt_tokens'] for stats in api_stats.values()),
+        'output_tokens': sum(stats['output_tokens'] for stats in api_stats.values()),
+        'peak_memory_mb': peak / (1024 * 1024),
+        'ui_ms': measure_ui_paths(video_data, repeat),
+    }
+
+
+def run_benchmarks(minutes_list=DEFAULT_MINUTES, repeat=3, latency_scale=0.0, seed=0):
+    """
+    Run every benchmark case.
+
+    Returns:
+        dict: JSON-serializable results
+    """
+    cases = {}
+    for case_index, minutes in enumerate(minutes_list):
+        name = f"{minutes:g}min"
+        print(f"⏱️ Benchmarking {name} video...")
+        cases[name] = benchmark_case(minutes, repeat, latency_scale, seed, case_index)
+        print(f"   {cases[name]['wall_seconds']:.3f}s wall, {cases[name]['peak_memory_mb']:.1f} MB peak")
+
+    payloads = measure_rerun_payloads()
+    print("📦 Stylesheet bytes per rerun: " + ", ".join(f"{name} {size}" for name, size in payloads.items()))
+
+    return {
+        'created_at': datetime.now().isoformat(timespec="seconds"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {'repeat': repeat, 'latency_scale': latency_scale, 'seed': seed},
+        'rerun_payload_bytes': payloads,
+        'cases': cases,
+    }
+
+
+def _tracked_metrics(case):
+    """Flatten the metrics that are compared against the baseline, with their unit."""
+    metrics = {
+        'wall_seconds': (case['wall_seconds'], 'seconds'),
+        'peak_memory_mb': (case['peak_memory_mb'], 'mb'),
+        'api_calls_total': (case['api_calls_total'], 'count'),
+        'prompt_tokens': (case['prompt_tokens'], 'count'),
+    }
+    for stage, seconds in case['stages_seconds'].items():
+        metrics[f"stages_seconds.{stage}"] = (seconds, 'seconds')
+    for name, ms in case['ui_ms'].items():
+        metrics[f"ui_ms.{name}"] = (ms, 'ms')
+    return metrics
+
+
+def compare_results(current, baseline, threshold):
+    """
+    Find metrics that got worse than the baseline by more than the threshold.
+
+    Args:
+        current (dict): Results from run_benchmarks()
+        baseline (dict): Previously saved results
+        threshold (float): Allowed relative increase (0.2 = 20%)
+
+    Returns:
+        list: Regression descriptions
+    """
+    regressions = []
+    for name, case in current['cases'].items():
+        baseline_case = baseline.get('cases', {}).get(name)
+        if not baseline_case:
+            continue
+        baseline_metrics = _tracked_metrics(baseline_case)
+        for metric, (value, unit) in _tracked_metrics(case).items():
+            if metric not in baseline_metrics:
+                continue
+            reference = baseline_metrics[metric][0]
+            if value - reference <= _NOISE_FLOORS.get(unit, 0):
+                continue
+            if value > reference * (1 + threshold):
+                change = (value / reference - 1) * 100 if reference else float('inf')
+                regressions.append(f"{name} {metric}: {reference:.4g} -> {value:.4g} (+{change:.0f}%)")
+    return regressions
+
+
+def write_results(results, path=None):
+    """
+    Save results as JSON.
+
+    Returns:
+        str: Path written
+    """
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"pipeline-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2)
+    return path
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Klipify pipeline benchmarks")
+    parser.add_argument("--minutes", type=float, nargs="+", default=list(DEFAULT_MINUTES),
+                        help="Synthetic video lengths to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (medians are reported)")
+    parser.add_argument("--latency-scale", type=float, default=0.0,
+                        help="Fake API latency multiplier (0 measures only Klipify's own overhead)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Results JSON path (defaults to benchmarks/results/)")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE,
+                        help="Baseline JSON to compare against (defaults to benchmarks/baseline.json)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression")
+    parser.add_argument("--save-baseline", action="store_true", help="Also save the results as the baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.minutes, args.repeat, args.latency_scale, args.seed)
+    print(f"📄 Results written to {write_results(results, args.output)}")
+
+    if args.save_baseline:
+        write_results(results, DEFAULT_BASELINE)
+        print(f"📌 Baseline saved to {DEFAULT_BASELINE}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            return 1
+        print(f"✅ No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,16 +19,13 @@ src_dir = os.path.join(current_dir, 'src')
 if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 
-# Import our modular components
+# Import our modular components; page modules load on first visit
+from src.ui import ui_components
 from src.ui.ui_components import (
     load_modern_css, 
     create_landing_page, 
     create_sidebar_navigation,
-    show_clips_page,
-    show_summary_page, 
-    show_notes_page,
-    show_chat_page,
-    show_my_videos_page
+    show_profiler_panel
 )
 from src.ui.displays import display_error_state
 from src.services.video_service import initialize_videodb_client
@@ -39,7 +36,26 @@ from src.utils.helpers import (
     validate_api_keys,
     reset_session_state
 )
-from src.processing import VideoProcessingPipeline, validate_processing_requirements
+from src.processing import (
+    validate_processing_requirements,
+    load_stored_video,
+    submit_processing_job,
+    get_pending_processing_job,
+    cancel_processing_job,
+    follow_processing_job
+)
+from src.services.metrics import start_metrics_server
+from src.utils.profiling import profile_rerun, profile_section, set_profiled_page
+
+
+# Renderer for each sidebar page, imported from ui_components on first visit
+PAGE_RENDERERS = {
+    "Clips": 'show_clips_page',
+    "Summary": 'show_summary_page',
+    "Notes": 'show_notes_page',
+    "Chat": 'show_chat_page',
+    "My Videos": 'show_my_videos_page'
+}
 
 
 def main():
@@ -55,11 +71,31 @@ def main():
         initial_sidebar_state="expanded"
     )
     
+    # Serve Prometheus metrics when KLIPIFY_METRICS_PORT is set (started once per process)
+    start_metrics_server()
+    
+    # Profile this rerun when KLIPIFY_PROFILE is set
+    with profile_rerun():
+        render_app()
+    
+    show_profiler_panel()
+
+
+def render_app():
+    """Render the page for the current session state."""
     # Load modern CSS
-    load_modern_css()
+    with profile_section('load_modern_css'):
+        load_modern_css()
     
     # Initialize chat session
-    initialize_chat_session()
+    with profile_section('initialize_chat_session'):
+        initialize_chat_session()
+    
+    # Restore a stored video by key (?video=<youtube_id>) after a reload or reset
+    stored_key = st.query_params.get("video")
+    if stored_key and st.session_state.get('video_data') is None:
+        if not load_stored_video(stored_key):
+            del st.query_params["video"]
     
     # Check if we have processed video data
     video_processed = st.session_state.get('video_data') is not None
@@ -74,13 +110,22 @@ def main():
 
 def show_landing_page():
     """Display the landing page for video input."""
+    set_profiled_page('show_landing_page')
+    
     # Validate API keys first
-    videodb_ok, genai_ok = validate_api_keys()
+    with profile_section('validate_api_keys'):
+        videodb_ok, genai_ok = validate_api_keys()
     
     if not videodb_ok or not genai_ok:
         display_error_state()
         return
     
+    # Keep following a run this session started or joined before the last rerun
+    pending_job = get_pending_processing_job()
+    if pending_job:
+        show_processing_job(pending_job)
+        return
+    
     # Check if user clicked a quick action button
     if st.session_state.get('current_page') in ["My Videos", "Clips", "Summary", "Chat"]:
         # If user has video data, show the dashboard
@@ -103,21 +148,24 @@ def show_landing_page():
 def show_dashboard_with_sidebar():
     """Display the main dashboard with sidebar navigation."""
     # Create sidebar navigation
-    current_page = create_sidebar_navigation()
+    with profile_section('create_sidebar_navigation'):
+        current_page = create_sidebar_navigation()
     
     # Display the selected page
     video_data = st.session_state.video_data
     
-    if current_page == "Clips":
-        show_clips_page(video_data)
-    elif current_page == "Summary":
-        show_summary_page(video_data)
-    elif current_page == "Notes":
-        show_notes_page(video_data)
-    elif current_page == "Chat":
-        show_chat_page(video_data)
-    elif current_page == "My Videos":
-        show_my_videos_page()
+    page_name = PAGE_RENDERERS.get(current_page)
+    if page_name is None:
+        return
+    set_profiled_page(page_name)
+    
+    with profile_section(page_name):
+        # The page's module is imported the first time it is shown
+        render_page = getattr(ui_components, page_name)
+        if current_page == "My Videos":
+            render_page()
+        else:
+            render_page(video_data)
 
 
 def process_video(youtube_url):
@@ -131,6 +179,12 @@ def process_video(youtube_url):
     
     youtube_id = result
     
+    # Reuse stored results instead of reprocessing the same video
+    if load_stored_video(youtube_id):
+        st.query_params["video"] = youtube_id
+        st.success("✅ Loaded previously processed results for this video!")
+        st.rerun()
+    
     # Initialize clients
     video_client = initialize_videodb_client()
     ai_client = initialize_genai_client()
@@ -141,15 +195,33 @@ def process_video(youtube_url):
         st.error(f"❌ {error_msg}")
         return
     
-    # Process the video
+    # Process the video, joining any run already in flight for the same video
+    job, started = submit_processing_job(youtube_url, youtube_id, video_client, ai_client)
+    if not started:
+        st.info("👥 This video is already being processed for another learner - joining that run.")
+    
+    show_processing_job(job)
+
+
+def show_processing_job(job):
+    """Follow a processing job's progress until it finishes."""
+    set_profiled_page('show_processing_job')
+    
     with st.container():
         st.markdown("## 🔄 Processing Your Video")
         st.markdown("Please wait while we analyze and create clips from your video...")
         
-        pipeline = VideoProcessingPipeline(video_client, ai_client)
-        video_data = pipeline.process_video(youtube_url, youtube_id)
+        if job.waiter_count > 1:
+            st.caption(f"👥 {job.waiter_count} learners are waiting on this video")
+        
+        if st.button("⏹️ Cancel", key=f"cancel_job_{job.job_id}"):
+            cancel_processing_job(job)
+            st.rerun()
+        
+        video_data = follow_processing_job(job)
         
         if video_data:
+            st.query_params["video"] = job.key
             st.success("✅ Video processed successfully! Redirecting to dashboard...")
             st.balloons()
             st.rerun()  # Refresh to show dashboard
@@ -0,0 +1,229 @@
+"""
+Klipify Processing Worker
+Runs queued video processing jobs outside the Streamlit process.
+
+Start the UI with KLIPIFY_PROCESSING_MODE=queue so submissions go to the
+durable job queue, then run one or more workers per host:
+
+    python klipify_worker.py --processes 4
+
+Workers lease jobs with a visibility timeout and keep the lease alive with
+heartbeats; if a worker dies, its job becomes visible again once the lease
+expires and another worker picks it up. Results are written to the shared
+video store and library index, where the UI loads them from.
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from src.processing import VideoProcessingPipeline, validate_processing_requirements
+from src.services.video_service import initialize_videodb_client
+from src.services.ai_service import initialize_genai_client
+from src.services.video_store import get_video_store
+from src.services.job_registry import ProcessingCancelled
+from src.services.job_queue import (
+    get_job_queue,
+    QueueReporter,
+    LeaseLost,
+    DEFAULT_LEASE_SECONDS
+)
+from src.services.metrics import start_metrics_server
+from src.services.tracing import trace_job
+
+
+class Worker:
+    """Leases jobs from the queue and runs them through the processing pipeline."""
+
+    def __init__(self, queue, video_client, ai_client, lease_seconds=DEFAULT_LEASE_SECONDS,
+                 poll_interval=2.0, worker_id=None):
+        """
+        Args:
+            queue (JobQueue): Shared job queue
+            video_client: VideoDB client
+            ai_client: GenAI client
+            lease_seconds (float): Visibility timeout for leased jobs
+            poll_interval (float): Seconds to sleep when the queue is empty
+            worker_id (str, optional): Identifier recorded as the lease owner
+        """
+        self.queue = queue
+        self.video_client = video_client
+        self.ai_client = ai_client
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self._stopping = threading.Event()
+
+    def stop(self):
+        """Finish the current job, then exit the loop."""
+        self._stopping.set()
+
+    def run_forever(self, drain=False):
+        """
+        Process jobs until stopped.
+
+        Args:
+            drain (bool): Exit once the queue is empty instead of polling
+        """
+        print(f"👷 Worker {self.worker_id} started")
+        while not self._stopping.is_set():
+            job = self.queue.lease(self.worker_id, self.lease_seconds)
+            if job is None:
+                if drain:
+                    break
+                self._stopping.wait(self.poll_interval)
+                continue
+            self.process(job)
+        print(f"👋 Worker {self.worker_id} stopped")
+
+    def process(self, job):
+        """
+        Run one leased job and record its outcome.
+
+        Args:
+            job (dict): Job returned by JobQueue.lease()
+        """
+        job_id = job['id']
+        payload = job['payload']
+        print(f"▶️ Job {job_id} ({job['key']}), attempt {job['attempts']}")
+
+        lease_lost = threading.Event()
+        finished = threading.Event()
+
+        def keep_lease():
+            # Renew well before expiry so slow stages never lose the lease
+            while not finished.wait(self.lease_seconds / 3):
+                try:
+                    self.queue.heartbeat(job_id, self.worker_id, self.lease_seconds)
+                except LeaseLost:
+                    lease_lost.set()
+                    return
+                except Exception as e:
+                    print(f"⚠️ Heartbeat for job {job_id} failed: {str(e)}")
+
+        heartbeat = threading.Thread(target=keep_lease, name=f"klipify-lease-{job_id}", daemon=True)
+        heartbeat.start()
+
+        def should_cancel():
+            return lease_lost.is_set() or self.queue.is_cancel_requested(job_id)
+
+        try:
+            pipeline = VideoProcessingPipeline(
+                self.video_client, self.ai_client,
+                reporter=QueueReporter(self.queue, job_id)
+            )
+            with trace_job('queue_job', job_id=job_id, youtube_id=payload['youtube_id'],
+                           attempt=job['attempts'], worker=self.worker_id):
+                pipeline.run(
+                    payload['youtube_url'], payload['youtube_id'],
+                    should_cancel=should_cancel, expected_cost=job['expected_cost']
+                )
+        except ProcessingCancelled:
+            if lease_lost.is_set():
+                print(f"⚠️ Lost the lease on job {job_id}; another worker owns it now")
+            else:
+                self.queue.cancelled(job_id, self.worker_id)
+                print(f"⏹️ Job {job_id} cancelled")
+        except Exception as e:
+            self.queue.fail(job_id, self.worker_id, str(e))
+            print(f"❌ Job {job_id} failed: {str(e)}")
+        else:
+            # The UI loads results from the store, so an unsaved result is a failure
+            video_store = get_video_store()
+            if video_store and video_store.has_video(payload['youtube_id']):
+                self.queue.complete(job_id, self.worker_id)
+                print(f"✅ Job {job_id} done")
+            else:
+                self.queue.fail(job_id, self.worker_id, "Results could not be saved to the video store")
+                print(f"❌ Job {job_id} finished but its results were not stored")
+        finally:
+            finished.set()
+            heartbeat.join()
+
+
+def run_worker(lease_seconds, poll_interval, drain, metrics_port=None):
+    """
+    Run a single worker in the current process.
+
+    Args:
+        lease_seconds (float): Visibility timeout for leased jobs
+        poll_interval (float): Seconds to sleep when the queue is empty
+        drain (bool): Exit once the queue is empty
+        metrics_port (int, optional): Port for this worker's /metrics endpoint
+
+    Returns:
+        int: Process exit code
+    """
+    if metrics_port is not None:
+        start_metrics_server(metrics_port)
+
+    video_client = initialize_videodb_client()
+    ai_client = initialize_genai_client()
+    is_valid, error_message = validate_processing_requirements(video_client, ai_client)
+    if not is_valid:
+        print(f"❌ {error_message}")
+        return 1
+
+    worker = Worker(
+        get_job_queue(), video_client, ai_client,
+        lease_seconds=lease_seconds, poll_interval=poll_interval
+    )
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    signal.signal(signal.SIGINT, lambda *_: worker.stop())
+    worker.run_forever(drain=drain)
+    return 0
+
+
+def _worker_process(*worker_args):
+    """Child process target that turns run_worker()'s result into an exit code."""
+    sys.exit(run_worker(*worker_args))
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Run Klipify processing workers.")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes to run on this host")
+    parser.add_argument("--lease-seconds", type=float, default=DEFAULT_LEASE_SECONDS,
+                        help="Visibility timeout before an unresponsive worker's job is retried")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between polls of an empty queue")
+    parser.add_argument("--drain", action="store_true", help="Exit once the queue is empty")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Serve Prometheus metrics; worker N listens on this port + N")
+    args = parser.parse_args(argv)
+
+    worker_args = (args.lease_seconds, args.poll_interval, args.drain)
+    if args.processes <= 1:
+        return run_worker(*worker_args, metrics_port=args.metrics_port)
+
+    processes = [
+        multiprocessing.Process(
+            target=_worker_process,
+            args=worker_args + (None if args.metrics_port is None else args.metrics_port + index,),
+            name=f"klipify-worker-{index}"
+        )
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # Children received the same SIGINT and stop after their current job
+        for process in processes:
+            process.join()
+    return 0 if all(process.exitcode == 0 for process in processes) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,92 +3,463 @@ Video Processing Pipeline for Klipify
 Orchestrates the complete video processing workflow.
 """
 
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 import streamlit as st
 from datetime import datetime
 from .services.video_service import VideoProcessor
-from .services.ai_service import AIService
+from .services.ai_service import AIService, FALLBACK_DEADLINE, FALLBACK_QUOTA
 from .ui.displays import display_processing_status
+from .utils.helpers import get_youtube_id
+from .utils.transcript import CompactTranscript
+from .utils.transcript_index import build_transcript_index
+from .services.library_index import get_library_index
+from .services.video_store import get_video_store
+from .services.artifact_cache import VideoHandle, get_artifact_cache, open_video_handle
+from .services.job_registry import (
+    get_job_registry,
+    ProcessingCancelled,
+    JOB_SUCCEEDED,
+    JOB_CANCELLED
+)
+from .services.job_queue import get_job_queue, use_worker_queue, QueuedJob
+from .services.metrics import stage_context
+from .services.tracing import propagate, span, trace_job
+from .services.scheduler import (
+    get_resource_pools,
+    estimate_processing_seconds,
+    POOL_VIDEODB,
+    POOL_GEMINI
+)
+
+
+# Chapters whose notes are generated at once; each call also needs a Gemini slot
+NOTES_WORKERS = 4
+
+# Why Gemini was not used for a stage, as shown to the user
+_FALLBACK_LABELS = {
+    FALLBACK_QUOTA: "is over quota",
+    FALLBACK_DEADLINE: "is responding slowly",
+}
+
+
+class StreamlitReporter:
+    """Reports pipeline progress directly into the running Streamlit page."""
+    
+    def status(self, step, total_steps, message):
+        """Show a step transition with a progress bar."""
+        display_processing_status(step, total_steps, message)
+    
+    def notify(self, level, message):
+        """Show a status message ('info', 'success', 'warning', 'error')."""
+        getattr(st, level)(message)
+
+
+class SilentReporter:
+    """Discards progress; for runs whose caller shows its own progress."""
+    
+    def status(self, step, total_steps, message):
+        pass
+    
+    def notify(self, level, message):
+        pass
 
 
 class VideoProcessingPipeline:
     """Orchestrates the complete video processing workflow."""
     
-    def __init__(self, video_client, ai_client):
+    def __init__(self, video_client, ai_client, reporter=None, pools=None):
         """
         Initialize the processing pipeline.
         
         Args:
             video_client: VideoDB client
             ai_client: GenAI client
+            reporter (optional): Progress reporter with status() and notify();
+                defaults to writing into the current Streamlit page
+            pools (ResourcePools, optional): Concurrency pools for VideoDB- and
+                Gemini-bound stages; defaults to the shared pools
         """
-        self.video_processor = VideoProcessor(video_client)
+        self.reporter = reporter or StreamlitReporter()
+        self.pools = pools if pools is not None else get_resource_pools()
+        self.video_processor = VideoProcessor(video_client, notify=self.reporter.notify)
         self.ai_service = AIService(ai_client)
     
-    def process_video(self, youtube_url, youtube_id):
+    def run(self, youtube_url, youtube_id, should_cancel=None, expected_cost=None):
         """
-        Process a YouTube video through the complete pipeline.
+        Run the complete pipeline without touching session state.
+        
+        Safe to call from a background thread when the reporter does not
+        write to the page. Results are persisted to the local store and the
+        library search index.
         
         Args:
             youtube_url (str): YouTube video URL
             youtube_id (str): YouTube video ID
+            should_cancel (callable, optional): Returns True to abort between stages
+            expected_cost (float, optional): Expected processing seconds, used to
+                order this run among others waiting for a VideoDB slot
             
         Returns:
-            dict: Complete video data or None if processing fails
-        """
-        try:
-            total_steps = 5
+            dict: Complete video data, including per-stage wall times in
+                'stage_timings' (seconds)
             
-            # Step 1: Upload and Index Video
-            display_processing_status(1, total_steps, "Processing video with VideoDB...")
+        Raises:
+            ProcessingCancelled: If should_cancel() returned True
+            Exception: If any stage fails
+        """
+        with trace_job('process_video', youtube_id=youtube_id):
+            return self._run_stages(youtube_url, youtube_id, should_cancel, expected_cost)
+    
+    def _stage_helpers(self, stage_timings, should_cancel):
+        """
+        Build the per-run helpers shared by every stage.
+        
+        Returns:
+            tuple: (timed(stage), check_cancelled(), slot(pool, cost, announce, stop))
+        """
+        report = self.reporter
+        
+        @contextmanager
+        def timed(stage):
+            # Accumulate wall time per stage, including any wait for a pool slot
+            started = time.perf_counter()
+            try:
+                with stage_context(stage), span(f"stage.{stage}"):
+                    yield
+            finally:
+                stage_timings[stage] = stage_timings.get(stage, 0.0) + time.perf_counter() - started
+        
+        def check_cancelled():
+            if should_cancel and should_cancel():
+                raise ProcessingCancelled("Processing was cancelled")
+        
+        def slot(pool, cost, announce=True, stop=None):
+            # Hold a fleet-wide concurrency slot for one API-bound stage; calls
+            # from worker threads pass announce=False, as they cannot write to the
+            # page, and stop() to give up waiting once the stage has moved on
+            if not self.pools:
+                return nullcontext()
+            give_up = should_cancel
+            if stop:
+                give_up = lambda: stop() or bool(should_cancel and should_cancel())
+            return self.pools.slot(
+                pool, uuid.uuid4().hex, cost=cost, should_cancel=give_up,
+                on_wait=(lambda: report.notify('info', f"⏳ Waiting for a free {pool} slot...")) if announce else None
+            )
+        
+        return timed, check_cancelled, slot
+    
+    def _run_stages(self, youtube_url, youtube_id, should_cancel, expected_cost):
+        """Run every pipeline stage; see run()."""
+        report = self.reporter
+        total_steps = 5
+        stage_timings = {}
+        run_started = time.perf_counter()
+        timed, check_cancelled, slot = self._stage_helpers(stage_timings, should_cancel)
+        
+        # Step 1: Upload and Index Video
+        report.status(1, total_steps, "Processing video with VideoDB...")
+        with timed('upload_index'), slot(POOL_VIDEODB, expected_cost):
             video, transcript_text, transcript_segments = self.video_processor.upload_and_index_video(youtube_url)
-            st.success("✅ Video processed and indexed!")
+        with timed('transcript_index'):
+            transcript_segments = CompactTranscript.from_segments(transcript_segments)
+            transcript_index = build_transcript_index(transcript_segments)
+        with timed('chapters'):
+            chapters = _segment_chapters(transcript_segments)
+        # The transcript size is now known, so later stages queue by a real estimate
+        stage_cost = estimate_processing_seconds(
+            duration=transcript_segments.duration, transcript_chars=len(transcript_text or "")
+        )
+        report.notify('success', "✅ Video processed and indexed!")
+        check_cancelled()
+        
+        # Step 2: Generate Video Summary
+        report.status(2, total_steps, "Generating video summary...")
+        degraded = {}
+        with timed('summary'):
+            video_summary = self._summary(transcript_text, transcript_segments, degraded, slot, stage_cost)
+        report.notify('success', "✅ Summary generated!")
+        check_cancelled()
+        
+        # Step 3: Extract Key Concepts
+        report.status(3, total_steps, "Identifying key concepts...")
+        with timed('concepts'):
+            concepts = self._concepts(transcript_text, transcript_segments, degraded, slot, stage_cost)
+        report.notify('success', f"✅ Identified {len(concepts)} key concepts!")
+        check_cancelled()
+        
+        # Step 4: Find Video Segments
+        report.status(4, total_steps, "Finding video segments...")
+        with timed('segments'), slot(POOL_VIDEODB, stage_cost):
+            concepts_with_segments = self.video_processor.find_concept_segments(concepts)
+        report.notify('success', f"✅ Found segments for {len(concepts_with_segments)} concepts!")
+        check_cancelled()
+        
+        # Step 5: Create Video Clips and Notes
+        report.status(5, total_steps, "Creating clips and notes...")
+        with timed('clips'), slot(POOL_VIDEODB, stage_cost):
+            video_clips = self.video_processor.create_video_clips(concepts_with_segments)
+        with timed('notes'):
+            timestamped_notes = self._chapter_notes(
+                transcript_segments, chapters, youtube_id, degraded, slot, stage_cost
+            )
+        report.notify('success', "🎉 Complete educational package ready!")
+        
+        # Compile all data
+        video_data = {
+            'youtube_id': youtube_id,
+            'youtube_url': youtube_url,
+            'videodb_id': getattr(video, 'id', None),
+            'title': getattr(video, 'name', None) or youtube_id,
+            'video_object': video,
+            'transcript_text': transcript_text,
+            'transcript_segments': transcript_segments,
+            'transcript_index': transcript_index,
+            'summary': video_summary,
+            'concepts': concepts,
+            'clips': video_clips,
+            'notes': timestamped_notes,
+            'chapters': chapters,
+            'processed_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'stage_timings': stage_timings,
+            'degraded': degraded
+        }
+        
+        # Persist results so they outlive this session
+        with timed('store'):
+            _save_to_store(video_data, report.notify)
+        
+        # Make the video searchable from the cross-video library index
+        with timed('library_index'):
+            _add_to_library_index(video_data, report.notify)
+        
+        video_data['processing_seconds'] = time.perf_counter() - run_started
+        return video_data
+    
+    def _summary(self, transcript_text, transcript_segments, degraded, slot, stage_cost):
+        """
+        Generate the summary, recording a local fallback in degraded.
+        
+        The Gemini slot is taken by the call itself, so waiting for it counts
+        against the deadline and a call abandoned at the deadline keeps
+        counting against the pool until it returns.
+        """
+        summary, reason = self.ai_service.summary_with_fallback(
+            transcript_text, transcript_segments,
+            hold=lambda abandoned: slot(POOL_GEMINI, stage_cost, announce=False, stop=abandoned)
+        )
+        if reason:
+            degraded['summary'] = reason
+            self.reporter.notify('warning', f"⚡ Gemini {_FALLBACK_LABELS[reason]}; using a quick local summary")
+        return summary
+    
+    def _concepts(self, transcript_text, transcript_segments, degraded, slot, stage_cost):
+        """Extract concepts, recording a local fallback in degraded; see _summary()."""
+        concepts, reason = self.ai_service.concepts_with_fallback(
+            transcript_text, transcript_segments,
+            hold=lambda abandoned: slot(POOL_GEMINI, stage_cost, announce=False, stop=abandoned)
+        )
+        if reason:
+            degraded['concepts'] = reason
+            self.reporter.notify('warning', f"⚡ Gemini {_FALLBACK_LABELS[reason]}; using locally extracted concepts")
+        return concepts
+    
+    def _chapter_notes(self, transcript_segments, chapters, youtube_id, degraded, slot, stage_cost):
+        """
+        Generate notes chapter by chapter in parallel and join them.
+        
+        Each chapter's call holds its own Gemini slot, so the fan-out stays
+        within the fleet-wide Gemini limit. A chapter Gemini cannot answer in
+        time gets local notes, and the stage is recorded in degraded.
+        """
+        if not chapters:
+            notes, reason = self.ai_service.notes_with_fallback(
+                transcript_segments, youtube_id,
+                hold=lambda abandoned: slot(POOL_GEMINI, stage_cost, announce=False, stop=abandoned)
+            )
+            reasons = [reason]
+        else:
+            duration = max(transcript_segments.duration, 1.0)
             
-            # Step 2: Generate Video Summary
-            display_processing_status(2, total_steps, "Generating video summary...")
-            video_summary = self.ai_service.generate_video_summary(transcript_text)
-            st.success("✅ Summary generated!")
+            def chapter_notes(chapter):
+                cost = stage_cost * (chapter['end'] - chapter['start']) / duration
+                return self.ai_service.chapter_notes_with_fallback(
+                    transcript_segments, chapter,
+                    hold=lambda abandoned: slot(POOL_GEMINI, cost, announce=False, stop=abandoned)
+                )
             
-            # Step 3: Extract Key Concepts
-            display_processing_status(3, total_steps, "Identifying key concepts...")
-            concepts = self.ai_service.extract_key_concepts(transcript_text)
-            st.success(f"✅ Identified {len(concepts)} key concepts!")
+            workers = min(len(chapters), NOTES_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="klipify-notes") as pool:
+                futures = [pool.submit(propagate(chapter_notes), chapter) for chapter in chapters]
+                results = [future.result() for future in futures]
+            notes = self.ai_service.assemble_chapter_notes(chapters, [notes for notes, _ in results], youtube_id)
+            reasons = [reason for _, reason in results]
+        
+        reason = next((reason for reason in reasons if reason), None)
+        if reason:
+            degraded['notes'] = reason
+            self.reporter.notify('warning', f"⚡ Gemini {_FALLBACK_LABELS[reason]}; using locally extracted notes")
+        return notes
+    
+    def regenerate(self, video, stored=None, youtube_id=None, should_cancel=None):
+        """
+        Generate clips for a video already in VideoDB, reusing stored results.
+        
+        Attaches to the existing video instead of uploading it again. The
+        stored transcript, summary, concepts and notes are reused and only the
+        missing stages run; concept segments and clips are always rebuilt.
+        Results are persisted like a normal run.
+        
+        Args:
+            video: VideoDB video object
+            stored (dict, optional): Stored video data for this video (see
+                VideoStore.load_video)
+            youtube_id (str, optional): YouTube ID; defaults to the stored one,
+                then the one in the video's source URL, then the VideoDB ID
+            should_cancel (callable, optional): Returns True to abort between stages
             
-            # Step 4: Find Video Segments
-            display_processing_status(4, total_steps, "Finding video segments...")
+        Returns:
+            dict: Complete video data, with the reused artifacts listed in 'reused'
+        """
+        stored = dict(stored or {})
+        if not stored.get('youtube_url'):
+            # Videos uploaded from YouTube keep their source URL in VideoDB
+            source_url = getattr(video, 'url', None) or ''
+            if get_youtube_id(source_url):
+                stored['youtube_url'] = source_url
+        youtube_id = (
+            youtube_id or stored.get('youtube_id')
+            or get_youtube_id(stored.get('youtube_url') or '')
+            or getattr(video, 'id', None)
+        )
+        with trace_job('regenerate_clips', youtube_id=youtube_id):
+            return self._regenerate_stages(video, stored, youtube_id, should_cancel)
+    
+    def _regenerate_stages(self, video, stored, youtube_id, should_cancel):
+        """Run only the stages stored results do not cover; see regenerate()."""
+        report = self.reporter
+        total_steps = 5
+        stage_timings = {}
+        run_started = time.perf_counter()
+        timed, check_cancelled, slot = self._stage_helpers(stage_timings, should_cancel)
+        reused = []
+        # Locally generated results are replaced, so rerunning upgrades them
+        degraded = {}
+        for stage in (stored.get('degraded') or {}):
+            stored.pop(stage, None)
+        
+        # Step 1: Attach to the VideoDB video; fetch the transcript only if not stored
+        report.status(1, total_steps, "Loading video from VideoDB...")
+        transcript_text = stored.get('transcript_text')
+        transcript_segments = stored.get('transcript_segments')
+        has_transcript = bool(transcript_text) and transcript_segments is not None and len(transcript_segments) > 0
+        with timed('upload_index'), (nullcontext() if has_transcript else slot(POOL_VIDEODB, None)):
+            video, fetched_text, fetched_segments = self.video_processor.attach_video(
+                video, fetch_transcript=not has_transcript
+            )
+        if has_transcript:
+            reused.append('transcript')
+        else:
+            transcript_text, transcript_segments = fetched_text, fetched_segments
+        with timed('transcript_index'):
+            transcript_segments = CompactTranscript.from_segments(transcript_segments)
+            transcript_index = stored.get('transcript_index') or build_transcript_index(transcript_segments)
+        with timed('chapters'):
+            chapters = stored.get('chapters') or _segment_chapters(transcript_segments)
+        stage_cost = estimate_processing_seconds(
+            duration=transcript_segments.duration, transcript_chars=len(transcript_text or "")
+        )
+        check_cancelled()
+        
+        # Step 2: Summary
+        report.status(2, total_steps, "Generating video summary...")
+        video_summary = stored.get('summary')
+        if video_summary:
+            reused.append('summary')
+        else:
+            with timed('summary'):
+                video_summary = self._summary(transcript_text, transcript_segments, degraded, slot, stage_cost)
+        check_cancelled()
+        
+        # Step 3: Concepts
+        report.status(3, total_steps, "Identifying key concepts...")
+        concepts = stored.get('concepts')
+        if concepts:
+            reused.append('concepts')
+        else:
+            with timed('concepts'):
+                concepts = self._concepts(transcript_text, transcript_segments, degraded, slot, stage_cost)
+        check_cancelled()
+        
+        # Step 4: Segments are always searched again for the new clips
+        report.status(4, total_steps, "Finding video segments...")
+        with timed('segments'), slot(POOL_VIDEODB, stage_cost):
             concepts_with_segments = self.video_processor.find_concept_segments(concepts)
-            st.success(f"✅ Found segments for {len(concepts_with_segments)} concepts!")
-            
-            # Step 5: Create Video Clips and Notes
-            display_processing_status(5, total_steps, "Creating clips and notes...")
+        check_cancelled()
+        
+        # Step 5: Clips, plus notes when none are stored
+        report.status(5, total_steps, "Creating clips and notes...")
+        with timed('clips'), slot(POOL_VIDEODB, stage_cost):
             video_clips = self.video_processor.create_video_clips(concepts_with_segments)
-            timestamped_notes = self.ai_service.generate_timestamped_notes(transcript_segments, youtube_id)
-            st.success("🎉 Complete educational package ready!")
+        timestamped_notes = stored.get('notes')
+        if timestamped_notes:
+            reused.append('notes')
+        else:
+            with timed('notes'):
+                timestamped_notes = self._chapter_notes(
+                    transcript_segments, chapters, youtube_id, degraded, slot, stage_cost
+                )
+        report.notify('success', f"🎉 Generated {len(video_clips)} clips!")
+        
+        video_data = {
+            'youtube_id': youtube_id,
+            'youtube_url': stored.get('youtube_url'),
+            'videodb_id': getattr(video, 'id', None),
+            'title': getattr(video, 'name', None) or stored.get('title') or youtube_id,
+            'video_object': video,
+            'transcript_text': transcript_text,
+            'transcript_segments': transcript_segments,
+            'transcript_index': transcript_index,
+            'summary': video_summary,
+            'concepts': concepts,
+            'clips': video_clips,
+            'notes': timestamped_notes,
+            'chapters': chapters,
+            'duration': stored.get('duration') or getattr(video, 'length', 0) or transcript_segments.duration,
+            'processed_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'stage_timings': stage_timings,
+            'degraded': degraded,
+            'reused': reused
+        }
+        
+        with timed('store'):
+            _save_to_store(video_data, report.notify)
+        with timed('library_index'):
+            _add_to_library_index(video_data, report.notify)
+        
+        video_data['processing_seconds'] = time.perf_counter() - run_started
+        return video_data
+    
+    def process_video(self, youtube_url, youtube_id):
+        """
+        Process a YouTube video through the complete pipeline.
+        
+        Args:
+            youtube_url (str): YouTube video URL
+            youtube_id (str): YouTube video ID
             
-            # Compile all data
-            video_data = {
-                'youtube_id': youtube_id,
-                'youtube_url': youtube_url,
-                'video_object': video,
-                'transcript_text': transcript_text,
-                'transcript_segments': transcript_segments,
-                'summary': video_summary,
-                'concepts': concepts,
-                'clips': video_clips,
-                'notes': timestamped_notes,
-                'processed_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
+        Returns:
+            dict: Complete video data or None if processing fails
+        """
+        try:
+            video_data = self.run(youtube_url, youtube_id)
             
             # Store in session state
-            st.session_state.video_data = video_data
-            
-            # Set video context for chat
-            st.session_state.video_context = {
-                'transcript': transcript_text,
-                'summary': video_summary,
-                'concepts': concepts
-            }
-            
-            st.session_state.processing_complete = True
+            load_video_into_session(video_data)
             
             return video_data
             
@@ -98,6 +469,252 @@ class VideoProcessingPipeline:
             return None
 
 
+def get_session_waiter_id():
+    """
+    Get a stable identifier for the current session, used to follow jobs.
+    
+    Returns:
+        str: Session identifier
+    """
+    if 'session_waiter_id' not in st.session_state:
+        st.session_state.session_waiter_id = uuid.uuid4().hex
+    return st.session_state.session_waiter_id
+
+
+def get_session_tenant():
+    """
+    Get the tenant this session's jobs are scheduled under.
+    
+    Sessions default to their own tenant so one learner bulk-submitting
+    videos cannot starve others; deployments can group users with
+    ?tenant=<name> or KLIPIFY_TENANT.
+    
+    Returns:
+        str: Tenant name
+    """
+    if 'tenant' not in st.session_state:
+        st.session_state.tenant = (
+            st.query_params.get("tenant")
+            or os.getenv("KLIPIFY_TENANT")
+            or get_session_waiter_id()
+        )
+    return st.session_state.tenant
+
+
+def submit_processing_job(youtube_url, youtube_id, video_client, ai_client):
+    """
+    Start processing a video, or join the run already in flight for it.
+    
+    With KLIPIFY_PROCESSING_MODE=queue the job is handed to the durable
+    queue and run by a klipify_worker.py process instead of this one.
+    
+    Args:
+        youtube_url (str): YouTube video URL
+        youtube_id (str): Normalized YouTube video ID
+        video_client: VideoDB client
+        ai_client: GenAI client
+        
+    Returns:
+        tuple: (job, started) where started is False when joining an existing run
+    """
+    if use_worker_queue():
+        return _submit_queued_job(youtube_url, youtube_id)
+    
+    def run(job):
+        pipeline = VideoProcessingPipeline(video_client, ai_client, reporter=job)
+        video_data = pipeline.run(youtube_url, youtube_id, should_cancel=job.is_cancel_requested)
+        # Waiters open the result from the shared cache; the job keeps only its key
+        get_artifact_cache().put(video_data)
+    
+    job, started = get_job_registry().submit(
+        youtube_id, run, get_session_waiter_id(), result_loader=_open_processed_video
+    )
+    st.session_state.processing_job_key = youtube_id
+    return job, started
+
+
+def _open_processed_video(key):
+    """Open a finished video from the artifact cache, falling back to the store."""
+    video_store = get_video_store()
+    return open_video_handle(key=key, loader=(lambda: video_store.load_video(key)) if video_store else None)
+
+
+def _submit_queued_job(youtube_url, youtube_id):
+    """Enqueue a video for the worker fleet and follow it from this session."""
+    queue = get_job_queue()
+    job_id, created = queue.enqueue(
+        youtube_id, {'youtube_url': youtube_url, 'youtube_id': youtube_id},
+        tenant=get_session_tenant(), waiter_id=get_session_waiter_id()
+    )
+    job = _open_queued_job(queue, job_id, youtube_id)
+    st.session_state.processing_job_key = youtube_id
+    return job, created
+
+
+def _open_queued_job(queue, job_id, youtube_id):
+    """Wrap a queue job so it can be followed like an in-process job."""
+    video_store = get_video_store()
+    return QueuedJob(
+        queue, job_id, youtube_id,
+        result_loader=video_store.load_video if video_store else None
+    )
+
+
+def get_pending_processing_job():
+    """
+    Get the job this session is following, if it is still known.
+    
+    Returns:
+        ProcessingJob or None
+    """
+    key = st.session_state.get('processing_job_key')
+    if not key:
+        return None
+    
+    if use_worker_queue():
+        queue = get_job_queue()
+        row = queue.get_latest_job(key)
+        job = _open_queued_job(queue, row['id'], key) if row else None
+    else:
+        job = get_job_registry().get(key)
+    if job is None:
+        del st.session_state['processing_job_key']
+    return job
+
+
+def cancel_processing_job(job):
+    """
+    Stop following a job; the run is only aborted if nobody else is waiting.
+    
+    Args:
+        job (ProcessingJob): Job this session follows
+    """
+    job.cancel(get_session_waiter_id())
+    st.session_state.pop('processing_job_key', None)
+
+
+def follow_processing_job(job, poll_interval=0.5):
+    """
+    Replay a job's progress in this page and block until it finishes.
+    
+    Args:
+        job (ProcessingJob or QueuedJob): Job to follow
+        poll_interval (float): Seconds between progress checks
+        
+    Returns:
+        VideoHandle: Handle to the processed video, or None if the job failed
+    """
+    reporter = StreamlitReporter()
+    cursor = 0
+    done = False
+    
+    while not done:
+        events, cursor, done = job.wait_for_events(cursor, timeout=poll_interval)
+        for event in events:
+            if event[0] == 'status':
+                reporter.status(*event[1:])
+            else:
+                reporter.notify(*event[1:])
+    
+    job.detach(get_session_waiter_id())
+    st.session_state.pop('processing_job_key', None)
+    
+    result = job.result if job.state == JOB_SUCCEEDED else None
+    if result:
+        load_video_into_session(result)
+        return st.session_state.video_data
+    
+    if job.state == JOB_CANCELLED:
+        st.warning("⏹️ Processing was cancelled.")
+    else:
+        st.error(f"❌ Error processing video: {job.error or 'results are no longer available'}")
+        st.info("💡 Try with a different video or check your API keys.")
+    return None
+
+
+def load_video_into_session(video_data):
+    """
+    Make a video the active video for this session.
+    
+    The session keeps only a lightweight handle; heavy artifacts are shared
+    with other sessions through the process-wide artifact cache.
+    
+    Args:
+        video_data (dict or VideoHandle): Processed video data or an open handle
+    """
+    if isinstance(video_data, VideoHandle):
+        handle = video_data
+    else:
+        handle = open_video_handle(video_data=video_data)
+    
+    st.session_state.video_data = handle
+    
+    # Set video context for chat (the transcript is read through the handle when needed)
+    st.session_state.video_context = {
+        'youtube_id': handle['youtube_id'],
+        'title': handle.get('title', ''),
+        'summary': handle.get('summary', ''),
+        'concepts': handle.get('concepts', [])
+    }
+    
+    st.session_state.processing_complete = True
+
+
+def load_stored_video(key):
+    """
+    Load a previously processed video into the session.
+    
+    Uses the shared artifact cache when another session already has the
+    video open, otherwise reads it from the local store.
+    
+    Args:
+        key (str): YouTube ID or VideoDB ID
+        
+    Returns:
+        VideoHandle: Handle to the video, or None if the video is not stored
+    """
+    video_store = get_video_store()
+    
+    try:
+        handle = open_video_handle(
+            key=key,
+            loader=(lambda: video_store.load_video(key)) if video_store else None
+        )
+    except Exception as e:
+        st.warning(f"Could not load stored video: {str(e)}")
+        return None
+    
+    if handle:
+        load_video_into_session(handle)
+    return handle
+
+
+def _segment_chapters(transcript_segments):
+    """Split a transcript into chapters; imported here so NumPy loads on first use."""
+    from .services.topic_segmentation import segment_chapters
+    return segment_chapters(transcript_segments)
+
+
+def _save_to_store(video_data, notify):
+    """Persist processed video artifacts; failures are non-fatal."""
+    try:
+        video_store = get_video_store()
+        if video_store:
+            video_store.save_video(video_data)
+    except Exception as e:
+        notify('warning', f"Could not save video results locally: {str(e)}")
+
+
+def _add_to_library_index(video_data, notify):
+    """Index a processed video for library search; failures are non-fatal."""
+    try:
+        library_index = get_library_index()
+        if library_index:
+            library_index.index_video(video_data)
+    except Exception as e:
+        notify('warning', f"Could not add video to library search: {str(e)}")
+
+
 def validate_processing_requirements(video_client, ai_client):
     """
     Validate that all requirements for processing are met.
@@ -137,7 +754,9 @@ def create_processing_summary(video_data):
         'transcript_length': len(video_data.get('transcript_text', '')),
         'processing_time': video_data.get('processed_at', 'Unknown'),
         'has_summary': bool(video_data.get('summary')),
-        'has_notes': bool(video_data.get('notes'))
+        'has_notes': bool(video_data.get('notes')),
+        'processing_seconds': video_data.get('processing_seconds'),
+        'stage_timings': video_data.get('stage_timings', {})
     }
 
 
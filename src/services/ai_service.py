@@ -3,8 +3,25 @@ AI Service for Klipify
 Handles all AI operations including summary generation, concept extraction, and chat.
 """
 
+import os
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 import streamlit as st
-from google import genai
+from ..utils.transcript import as_compact_transcript
+from .backends import create_genai_client, use_fake_backend
+from .metrics import LOCAL_FALLBACKS, track_call, record_usage
+from .tracing import propagate, traced
+
+
+# Seconds a summary, concepts or notes call may take before the local fallback answers
+DEFAULT_STAGE_DEADLINE_SECONDS = 60.0
+
+# Why a stage was answered locally; stored under video_data['degraded']
+FALLBACK_QUOTA = 'quota'
+FALLBACK_DEADLINE = 'deadline'
+
+_QUOTA_MARKERS = ('429', 'resource_exhausted', 'resourceexhausted', 'quota', 'rate limit')
 
 
 class AIService:
@@ -15,6 +32,27 @@ class AIService:
         self.client = client
         self.model_name = "gemini-2.5-flash"
     
+    def _generate(self, prompt, purpose):
+        """
+        Call Gemini with timing, outcome and token metrics.
+        
+        Args:
+            prompt (str): Prompt text
+            purpose (str): What the call is for; labels the call's stage when
+                it is not made from a pipeline stage (e.g. chat)
+            
+        Returns:
+            GenAI response
+        """
+        with track_call('gemini', 'generate_content', default_stage=purpose) as call:
+            response = self.client.models.generate_content(
+                model=self.model_name,
+                contents=prompt
+            )
+            record_usage(call, response, prompt)
+        return response
+    
+    @traced()
     def generate_video_summary(self, transcript_text):
         """
         Generate a comprehensive summary of the video.
@@ -41,14 +79,12 @@ class AIService:
         """
         
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
-            )
+            response = self._generate(prompt, 'summary')
             return response.text
         except Exception as e:
             raise Exception(f"Failed to generate summary: {str(e)}")
     
+    @traced()
     def extract_key_concepts(self, transcript_text):
         """
         Extract key concepts from the video transcript.
@@ -73,10 +109,7 @@ class AIService:
         """
         
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
-            )
+            response = self._generate(prompt, 'concepts')
             
             concepts = [concept.strip() for concept in response.text.strip().split('\n') if concept.strip()]
             return concepts[:8]  # Limit to 8 concepts
@@ -84,23 +117,174 @@ class AIService:
         except Exception as e:
             raise Exception(f"Failed to extract concepts: {str(e)}")
     
+    def summary_with_fallback(self, transcript_text, transcript_segments, deadline=None, hold=None):
+        """
+        Generate the video summary, answering locally if Gemini cannot.
+        
+        Args:
+            transcript_text (str): Full video transcript
+            transcript_segments (CompactTranscript or list): Transcript segments
+            deadline (float, optional): Seconds to wait for Gemini; defaults to
+                get_stage_deadline()
+            hold (callable, optional): hold(abandoned) returns a context manager
+                held while the Gemini call runs (see _with_fallback())
+            
+        Returns:
+            tuple: (summary, fallback_reason); the reason is None when Gemini
+                answered, otherwise FALLBACK_QUOTA or FALLBACK_DEADLINE
+        """
+        def local_summary():
+            from .local_summarizer import extract_keyphrases, extractive_summary
+            return extractive_summary(transcript_segments, concepts=extract_keyphrases(transcript_segments, limit=5))
+        
+        return self._with_fallback(
+            'summary', lambda: self.generate_video_summary(transcript_text), local_summary, deadline, hold
+        )
+    
+    def concepts_with_fallback(self, transcript_text, transcript_segments, deadline=None, hold=None):
+        """
+        Extract key concepts, answering locally if Gemini cannot.
+        
+        Args:
+            transcript_text (str): Full video transcript
+            transcript_segments (CompactTranscript or list): Transcript segments
+            deadline (float, optional): Seconds to wait for Gemini; defaults to
+                get_stage_deadline()
+            hold (callable, optional): hold(abandoned) returns a context manager
+                held while the Gemini call runs (see _with_fallback())
+            
+        Returns:
+            tuple: (concepts, fallback_reason); see summary_with_fallback()
+        """
+        def local_concepts():
+            from .local_summarizer import extract_keyphrases
+            return extract_keyphrases(transcript_segments)
+        
+        return self._with_fallback(
+            'concepts', lambda: self.extract_key_concepts(transcript_text), local_concepts, deadline, hold
+        )
+    
+    @traced()
+    def notes_with_fallback(self, transcript_segments, youtube_id=None, deadline=None, hold=None):
+        """
+        Generate timestamped notes for the whole video, answering locally if Gemini cannot.
+        
+        Args:
+            transcript_segments (CompactTranscript or list): Transcript segments
+            youtube_id (str, optional): YouTube video ID for creating clickable links
+            deadline (float, optional): Seconds to wait for Gemini; defaults to
+                get_stage_deadline()
+            hold (callable, optional): hold(abandoned) returns a context manager
+                held while the Gemini call runs (see _with_fallback())
+            
+        Returns:
+            tuple: (notes, fallback_reason); see summary_with_fallback()
+        """
+        def local_notes():
+            from .local_summarizer import extractive_notes
+            notes = extractive_notes(transcript_segments)
+            return self._add_youtube_links_to_notes(notes, youtube_id) if youtube_id else notes
+        
+        return self._with_fallback(
+            'notes', lambda: self.generate_timestamped_notes(transcript_segments, youtube_id),
+            local_notes, deadline, hold
+        )
+    
+    def chapter_notes_with_fallback(self, transcript_segments, chapter, deadline=None, hold=None):
+        """
+        Generate one chapter's notes, answering locally if Gemini cannot.
+        
+        The local notes are the chapter's most central transcript sentences.
+        
+        Args:
+            transcript_segments (CompactTranscript or list): Full transcript segments
+            chapter (dict): Chapter from topic_segmentation.segment_chapters()
+            deadline (float, optional): Seconds to wait for Gemini; defaults to
+                get_stage_deadline()
+            hold (callable, optional): hold(abandoned) returns a context manager
+                held while the Gemini call runs (see _with_fallback())
+            
+        Returns:
+            tuple: (notes, fallback_reason); see summary_with_fallback()
+        """
+        def local_notes():
+            from .local_summarizer import extractive_notes
+            transcript = as_compact_transcript(transcript_segments)
+            return extractive_notes(transcript.take(range(chapter['first_segment'], chapter['stop_segment'])))
+        
+        return self._with_fallback(
+            'notes', lambda: self.generate_chapter_notes(transcript_segments, chapter), local_notes, deadline, hold
+        )
+    
+    def _with_fallback(self, stage, generate, fallback, deadline=None, hold=None):
+        """
+        Run a Gemini call under a deadline, falling back on timeout or quota errors.
+        
+        A call that misses the deadline is cancelled if it has not started,
+        otherwise it is left to finish in the background and its result is
+        discarded. Waiting for the hold (e.g. a Gemini pool slot) counts
+        against the deadline. Other errors are raised as before.
+        
+        Args:
+            stage (str): Stage name for the fallback metric
+            generate (callable): Makes the Gemini call
+            fallback (callable): Produces the local result
+            deadline (float, optional): Seconds to wait; defaults to get_stage_deadline()
+            hold (callable, optional): hold(abandoned) returns a context manager
+                (e.g. a Gemini pool slot) held until the call returns, even
+                after the stage has moved on; abandoned() turns True once the
+                stage has fallen back, so a pending wait can give up
+        
+        Returns:
+            tuple: (result, fallback_reason)
+        """
+        deadline = get_stage_deadline() if deadline is None else deadline
+        abandoned = threading.Event()
+        
+        def call():
+            with hold(abandoned.is_set) if hold else nullcontext():
+                if abandoned.is_set():
+                    # The slot came too late; nobody is waiting for the answer
+                    return None
+                return generate()
+        
+        try:
+            if deadline > 0:
+                future = _get_deadline_pool().submit(propagate(call))
+                try:
+                    return future.result(timeout=deadline), None
+                except FutureTimeout:
+                    abandoned.set()
+                    future.cancel()
+                    raise
+            return call(), None
+        except FutureTimeout:
+            reason = FALLBACK_DEADLINE
+        except Exception as e:
+            if not is_quota_error(e):
+                raise
+            reason = FALLBACK_QUOTA
+        
+        LOCAL_FALLBACKS.inc(stage=stage, reason=reason)
+        return fallback(), reason
+    
+    @traced()
     def generate_timestamped_notes(self, transcript_segments, youtube_id=None):
         """
         Generate detailed timestamped notes from transcript segments.
         
         Args:
-            transcript_segments (list): List of transcript segments with timestamps
+            transcript_segments (CompactTranscript or list): Transcript segments with timestamps
             youtube_id (str, optional): YouTube video ID for creating clickable links
             
         Returns:
             str: Formatted timestamped notes with clickable links
         """
         # Prepare transcript with timestamps for analysis
-        timestamped_content = ""
-        for segment in transcript_segments:
-            start_time = self._format_timestamp(segment.get('start', 0))
-            text = segment.get('text', '')
-            timestamped_content += f"[{start_time}] {text}\n"
+        timestamped_content = "\n".join(
+            f"[{self._format_timestamp(start)}] {text}"
+            for start, _end, text in as_compact_transcript(transcript_segments).iter_rows()
+        )
         
         prompt = f"""
         You are an expert note-taker. Analyze this timestamped video transcript and create comprehensive study notes.
@@ -120,10 +304,7 @@ class AIService:
         """
         
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
-            )
+            response = self._generate(prompt, 'notes')
             
             # Post-process to add clickable YouTube links if video ID is provided
             notes = response.text
@@ -135,6 +316,71 @@ class AIService:
         except Exception as e:
             raise Exception(f"Failed to generate notes: {str(e)}")
     
+    @traced()
+    def generate_chapter_notes(self, transcript_segments, chapter):
+        """
+        Generate study notes for one chapter of the video.
+        
+        Only the chapter's part of the transcript is sent, so chapters can be
+        processed independently and in parallel.
+        
+        Args:
+            transcript_segments (CompactTranscript or list): Full transcript segments
+            chapter (dict): Chapter from topic_segmentation.segment_chapters()
+            
+        Returns:
+            str: Markdown notes for the chapter, without its heading
+        """
+        transcript = as_compact_transcript(transcript_segments)
+        timestamped_content = "\n".join(
+            f"[{self._format_timestamp(start)}] {text}"
+            for start, _end, text in transcript.take(range(chapter['first_segment'], chapter['stop_segment'])).iter_rows()
+        )
+        
+        prompt = f"""
+        You are an expert note-taker. Create study notes for one chapter of a video, "{chapter['title']}",
+        running from {self._format_timestamp(chapter['start'])} to {self._format_timestamp(chapter['end'])}.
+        
+        Include:
+        1. Key concepts and definitions
+        2. Important examples or explanations
+        3. Takeaways
+        
+        Format as markdown bullet points, using ### subheadings only if the chapter covers several topics.
+        Do not repeat the chapter title. Start each point with the timestamp [MM:SS] from the transcript
+        where it is discussed, using only timestamps that appear below.
+        
+        Timestamped transcript:
+        {timestamped_content}
+        """
+        
+        try:
+            response = self._generate(prompt, 'notes')
+            return response.text.strip()
+        except Exception as e:
+            raise Exception(f"Failed to generate notes for chapter '{chapter['title']}': {str(e)}")
+    
+    def assemble_chapter_notes(self, chapters, chapter_notes, youtube_id=None):
+        """
+        Combine per-chapter notes into the video's notes, one section per chapter.
+        
+        Args:
+            chapters (list): Chapters in time order
+            chapter_notes (list): Notes for each chapter, in the same order
+            youtube_id (str, optional): YouTube video ID for creating clickable links
+            
+        Returns:
+            str: Formatted timestamped notes with clickable links
+        """
+        sections = [
+            f"## [{self._format_timestamp(chapter['start'])}] {chapter['title']}\n\n{notes}"
+            for chapter, notes in zip(chapters, chapter_notes)
+        ]
+        notes = "\n\n".join(sections)
+        if youtube_id:
+            notes = self._add_youtube_links_to_notes(notes, youtube_id)
+        return notes
+    
     def _add_youtube_links_to_notes(self, notes, youtube_id):
         """
         Add clickable YouTube links to timestamp references in notes.
@@ -172,6 +418,7 @@ class AIService:
         
         return header + enhanced_notes
     
+    @traced()
     def chat_with_assistant(self, user_message, video_context, chat_history):
         """
         Handle chat with the AI assistant using video context.
@@ -205,10 +452,7 @@ class AIService:
         """
         
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=context_prompt
-            )
+            response = self._generate(context_prompt, 'chat')
             return response.text
         except Exception as e:
             raise Exception(f"Failed to generate chat response: {str(e)}")
@@ -221,39 +465,99 @@ class AIService:
         return f"{minutes:02d}:{seconds:02d}"
 
 
-def initialize_genai_client():
+def get_stage_deadline():
     """
-    Initialize Google GenAI client from API keys using the new API.
+    Get how long summary, concepts and notes calls wait for Gemini.
     
     Returns:
-        GenAI client or None if initialization fails
+        float: KLIPIFY_GEMINI_DEADLINE_SECONDS (default 60); 0 waits forever
     """
     try:
-        # Try to get API key from various sources
-        api_key = None
+        return max(0.0, float(os.getenv("KLIPIFY_GEMINI_DEADLINE_SECONDS", DEFAULT_STAGE_DEADLINE_SECONDS)))
+    except ValueError:
+        return DEFAULT_STAGE_DEADLINE_SECONDS
+
+
+def is_quota_error(error):
+    """
+    Check whether an error means Gemini is rate-limited or out of quota.
+    
+    Args:
+        error (Exception): Error raised by a Gemini call
         
-        # Try Streamlit secrets first
-        if hasattr(st, 'secrets'):
+    Returns:
+        bool: True for 429 / RESOURCE_EXHAUSTED style errors
+    """
+    text = f"{type(error).__name__} {error}".lower()
+    return any(marker in text for marker in _QUOTA_MARKERS)
+
+
+_deadline_pool = None
+_deadline_pool_lock = threading.Lock()
+
+
+def _get_deadline_pool():
+    """Threads that run Gemini calls while the stage waits on a deadline."""
+    global _deadline_pool
+    with _deadline_pool_lock:
+        if _deadline_pool is None:
+            _deadline_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="klipify-gemini")
+        return _deadline_pool
+
+
+def _get_api_key():
+    """Gemini API key from Streamlit secrets or the environment, if any."""
+    api_key = None
+    
+    # Try Streamlit secrets first
+    if hasattr(st, 'secrets'):
+        try:
             api_key = (st.secrets.get("GEMINI_API_KEY") or 
                       st.secrets.get("GOOGLE_API_KEY") or 
                       st.secrets.get("gemini_api_key") or 
                       st.secrets.get("google_api_key"))
+        except Exception:
+            # No secrets.toml
+            api_key = None
+    
+    # Try environment variables
+    if not api_key:
+        api_key = (os.getenv("GEMINI_API_KEY") or 
+                  os.getenv("GOOGLE_API_KEY"))
+    
+    return api_key
+
+
+def has_genai_credentials():
+    """
+    Check whether Gemini can be used, without creating a client.
+    
+    Returns:
+        bool: True on the fake backend or when an API key is configured
+    """
+    return use_fake_backend() or bool(_get_api_key())
+
+
+def initialize_genai_client():
+    """
+    Initialize Google GenAI client from API keys using the new API.
+    
+    Returns:
+        GenAI client or None if initialization fails
+    """
+    try:
+        if use_fake_backend():
+            return create_genai_client()
         
-        # Try environment variables
-        if not api_key:
-            import os
-            api_key = (os.getenv("GEMINI_API_KEY") or 
-                      os.getenv("GOOGLE_API_KEY"))
-        
+        api_key = _get_api_key()
         if not api_key:
             return None
         
         # Set the API key as environment variable for the new client
-        import os
         os.environ["GOOGLE_API_KEY"] = api_key
         
         # Initialize client using new API format - no configure needed
-        return genai.Client()
+        return create_genai_client()
         
     except Exception as e:
         st.error(f"Failed to initialize GenAI client: {str(e)}")
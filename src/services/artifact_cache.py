@@ -0,0 +1,403 @@
+"""
+Shared Artifact Cache for Klipify
+Process-wide, reference-counted, size-bounded cache of heavy video artifacts.
+
+Sessions hold a lightweight VideoHandle instead of their own copy of the
+transcript, notes and clips; every session viewing the same video shares
+one cached copy.
+"""
+
+import json
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+
+# Keys kept on the per-session handle itself; everything else is shared
+HANDLE_KEYS = ('youtube_id', 'youtube_url', 'videodb_id', 'title', 'processed_at', 'duration')
+
+DEFAULT_MAX_CACHE_MB = 512
+
+
+class _CacheEntry:
+    """Cached artifacts for one video."""
+
+    __slots__ = ('metadata', 'artifacts', 'size_bytes', 'refcount', 'video_object')
+
+    def __init__(self, metadata, artifacts, size_bytes):
+        self.metadata = metadata
+        self.artifacts = artifacts
+        self.size_bytes = size_bytes
+        self.refcount = 0
+        self.video_object = None
+
+
+class ArtifactCache:
+    """
+    LRU cache of video artifacts keyed by YouTube ID.
+
+    Entries referenced by at least one live VideoHandle are pinned; only
+    unreferenced entries are evicted when the cache exceeds its budget.
+    """
+
+    def __init__(self, max_bytes=None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes (int, optional): Size budget (defaults to KLIPIFY_CACHE_MAX_MB or 512 MB)
+        """
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("KLIPIFY_CACHE_MAX_MB", DEFAULT_MAX_CACHE_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._aliases = {}
+        self._lock = threading.RLock()
+        self._size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _resolve(self, key):
+        """Map a VideoDB ID alias to its YouTube ID."""
+        return self._aliases.get(key, key)
+
+    def put(self, video_data):
+        """
+        Insert or replace a video's artifacts.
+
+        Args:
+            video_data (dict): Full video data from the pipeline or the store
+
+        Returns:
+            str: YouTube ID the artifacts are cached under
+        """
+        metadata, artifacts = split_artifacts(video_data)
+        youtube_id = metadata['youtube_id']
+        size_bytes = estimate_size(artifacts)
+
+        with self._lock:
+            entry = self._entries.get(youtube_id)
+            if entry is None:
+                entry = _CacheEntry(metadata, artifacts, size_bytes)
+                self._entries[youtube_id] = entry
+            else:
+                self._size_bytes -= entry.size_bytes
+                entry.metadata = metadata
+                entry.artifacts = artifacts
+                entry.size_bytes = size_bytes
+            if video_data.get('video_object') is not None:
+                entry.video_object = video_data['video_object']
+            self._size_bytes += size_bytes
+            self._entries.move_to_end(youtube_id)
+            if metadata.get('videodb_id'):
+                self._aliases[metadata['videodb_id']] = youtube_id
+            self._evict(protect=youtube_id)
+        return youtube_id
+
+    def acquire(self, key, loader=None):
+        """
+        Take a reference to a video's cached artifacts, loading them on a miss.
+
+        Args:
+            key (str): YouTube ID or VideoDB ID
+            loader (callable, optional): Returns full video data on a cache miss
+
+        Returns:
+            str: Resolved YouTube ID, or None if not cached and not loadable
+        """
+        with self._lock:
+            youtube_id = self._resolve(key)
+            entry = self._entries.get(youtube_id)
+            if entry is not None:
+                self.hits += 1
+                entry.refcount += 1
+                self._entries.move_to_end(youtube_id)
+                return youtube_id
+            self.misses += 1
+
+        # Load outside the lock so other sessions are not blocked on disk I/O
+        video_data = loader() if loader else None
+        if not video_data:
+            return None
+
+        with self._lock:
+            youtube_id = video_data['youtube_id']
+            if youtube_id not in self._entries:
+                self.put(video_data)
+            self._entries[youtube_id].refcount += 1
+        return youtube_id
+
+    def release(self, key):
+        """
+        Drop a reference taken by acquire().
+
+        Args:
+            key (str): YouTube ID or VideoDB ID
+        """
+        with self._lock:
+            entry = self._entries.get(self._resolve(key))
+            if entry is not None and entry.refcount > 0:
+                entry.refcount -= 1
+                self._evict()
+
+    def get_metadata(self, youtube_id):
+        """Return a copy of the handle metadata cached for a video."""
+        with self._lock:
+            entry = self._entries.get(youtube_id)
+            return dict(entry.metadata) if entry else {'youtube_id': youtube_id}
+
+    def get_artifact(self, youtube_id, name, default=None):
+        """Read one artifact from a cached entry."""
+        with self._lock:
+            entry = self._entries.get(youtube_id)
+            if entry is None:
+                return default
+            return entry.artifacts.get(name, default)
+
+    def set_artifact(self, youtube_id, name, value):
+        """Add or replace one artifact on a cached entry (e.g. a lazily built index)."""
+        with self._lock:
+            entry = self._entries.get(youtube_id)
+            if entry is None:
+                return
+            entry.artifacts[name] = value
+            new_size = estimate_size(entry.artifacts)
+            self._size_bytes += new_size - entry.size_bytes
+            entry.size_bytes = new_size
+
+    def artifact_names(self, youtube_id):
+        """List the artifact names cached for a video."""
+        with self._lock:
+            entry = self._entries.get(youtube_id)
+            return list(entry.artifacts) if entry else []
+
+    def is_cached(self, key):
+        """Check whether a video's artifacts are in the cache."""
+        with self._lock:
+            return self._resolve(key) in self._entries
+
+    def get_video_object(self, youtube_id, videodb_id):
+        """
+        Get the VideoDB SDK object for a video, rehydrating it from its ID once.
+
+        Args:
+            youtube_id (str): YouTube video ID (cache key)
+            videodb_id (str): VideoDB video ID
+
+        Returns:
+            VideoDB video object or None
+        """
+        with self._lock:
+            entry = self._entries.get(youtube_id)
+            if entry is not None and entry.video_object is not None:
+                return entry.video_object
+
+        if not videodb_id:
+            return None
+
+        from .video_service import initialize_videodb_client
+        from .metrics import track_call
+
+        client = initialize_videodb_client()
+        if not client:
+            return None
+        with track_call('videodb', 'get_video'):
+            video_object = client.get_collection().get_video(videodb_id)
+
+        with self._lock:
+            entry = self._entries.get(youtube_id)
+            if entry is not None:
+                entry.video_object = video_object
+        return video_object
+
+    def _evict(self, protect=None):
+        """Evict unreferenced entries, least recently used first, until within budget."""
+        if self._size_bytes <= self.max_bytes:
+            return
+        for youtube_id in list(self._entries):
+            if self._size_bytes <= self.max_bytes:
+                break
+            entry = self._entries[youtube_id]
+            if entry.refcount > 0 or youtube_id == protect:
+                continue
+            del self._entries[youtube_id]
+            self._size_bytes -= entry.size_bytes
+            for alias in [alias for alias, target in self._aliases.items() if target == youtube_id]:
+                del self._aliases[alias]
+
+    def get_stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Entry count, pinned entries, bytes used, budget, hits and misses
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'pinned': sum(1 for entry in self._entries.values() if entry.refcount > 0),
+                'references': sum(entry.refcount for entry in self._entries.values()),
+                'size_bytes': self._size_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+class VideoHandle(MutableMapping):
+    """
+    Lightweight per-session reference to a cached video.
+
+    Behaves like the pipeline's video_data dict: small metadata lives on the
+    handle, heavy artifacts are read through the shared cache, and
+    'video_object' is rehydrated lazily from the VideoDB ID. The cache
+    reference is released when the handle is garbage collected (session end
+    or switching videos).
+    """
+
+    def __init__(self, cache, youtube_id, metadata):
+        """
+        Args:
+            cache (ArtifactCache): Cache holding a reference for this handle
+            youtube_id (str): YouTube video ID
+            metadata (dict): Handle-level metadata (see HANDLE_KEYS)
+        """
+        self._cache = cache
+        self._local = {key: metadata.get(key) for key in HANDLE_KEYS}
+        self._local['youtube_id'] = youtube_id
+        self._finalizer = weakref.finalize(self, cache.release, youtube_id)
+
+    @property
+    def youtube_id(self):
+        return self._local['youtube_id']
+
+    def __getitem__(self, key):
+        if key in self._local:
+            return self._local[key]
+        if key == 'video_object':
+            return self._cache.get_video_object(self.youtube_id, self._local.get('videodb_id'))
+        missing = object()
+        value = self._cache.get_artifact(self.youtube_id, key, missing)
+        if value is missing:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        # Derived artifacts (e.g. a lazily built search index) are shared
+        if key in HANDLE_KEYS:
+            self._local[key] = value
+        else:
+            self._cache.set_artifact(self.youtube_id, key, value)
+
+    def __delitem__(self, key):
+        del self._local[key]
+
+    def __iter__(self):
+        yield from self._local
+        yield from (name for name in self._cache.artifact_names(self.youtube_id) if name not in self._local)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def release(self):
+        """Release the cache reference now instead of at garbage collection."""
+        self._finalizer()
+
+    def __repr__(self):
+        return f"VideoHandle({self.youtube_id!r})"
+
+
+def split_artifacts(video_data):
+    """
+    Split pipeline video data into handle metadata and shared artifacts.
+
+    Args:
+        video_data (dict): Full video data
+
+    Returns:
+        tuple: (metadata, artifacts)
+    """
+    metadata = {key: video_data.get(key) for key in HANDLE_KEYS}
+    artifacts = {
+        key: value for key, value in video_data.items()
+        if key not in HANDLE_KEYS and key != 'video_object'
+    }
+    return metadata, artifacts
+
+
+def estimate_size(artifacts):
+    """
+    Roughly estimate the memory held by a video's artifacts in bytes.
+
+    Args:
+        artifacts (dict): Artifact name -> value
+
+    Returns:
+        int: Estimated size in bytes
+    """
+    total = 0
+    for value in artifacts.values():
+        if value is None:
+            continue
+        if hasattr(value, 'nbytes') and callable(value.nbytes):
+            total += value.nbytes()
+        elif hasattr(value, 'token_count'):
+            # Inverted index: occurrence columns plus postings
+            total += value.token_count * 16
+        elif isinstance(value, str):
+            total += len(value)
+        else:
+            try:
+                total += len(json.dumps(value, default=str))
+            except (TypeError, ValueError):
+                total += 1024
+    return total
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_artifact_cache():
+    """
+    Get the process-wide artifact cache.
+
+    Returns:
+        ArtifactCache: Shared cache instance
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ArtifactCache()
+        return _cache
+
+
+def open_video_handle(video_data=None, key=None, loader=None):
+    """
+    Create a session handle for a video, sharing its artifacts process-wide.
+
+    Pass full video_data after processing, or a key plus loader to open a
+    video that may already be cached by another session.
+
+    Args:
+        video_data (dict, optional): Full video data to cache
+        key (str, optional): YouTube ID or VideoDB ID to open
+        loader (callable, optional): Loads full video data on a cache miss
+
+    Returns:
+        VideoHandle or None if the video could not be found
+    """
+    cache = get_artifact_cache()
+
+    if video_data is not None:
+        with cache._lock:
+            youtube_id = cache.put(video_data)
+            cache._entries[youtube_id].refcount += 1
+    else:
+        youtube_id = cache.acquire(key, loader)
+        if youtube_id is None:
+            return None
+
+    return VideoHandle(cache, youtube_id, cache.get_metadata(youtube_id))
@@ -0,0 +1,107 @@
+"""
+Backend Selection for Klipify
+Chooses between the live VideoDB/Gemini SDKs and the in-process fakes.
+
+Set KLIPIFY_BACKEND=fake to run the whole app, the worker, benchmarks and
+load tests without API keys or network access. The live SDKs are imported
+only when a live backend is actually used.
+"""
+
+import os
+
+
+BACKEND_LIVE = 'live'
+BACKEND_FAKE = 'fake'
+
+
+def get_backend_name():
+    """
+    Get the configured backend.
+
+    Returns:
+        str: 'live' (default) or 'fake'
+    """
+    backend = os.getenv("KLIPIFY_BACKEND", BACKEND_LIVE).strip().lower()
+    return BACKEND_FAKE if backend == BACKEND_FAKE else BACKEND_LIVE
+
+
+def use_fake_backend():
+    """Whether the in-process fakes replace the live services."""
+    return get_backend_name() == BACKEND_FAKE
+
+
+def connect_videodb(api_key=None):
+    """
+    Connect to VideoDB, or to the fake backend.
+
+    Args:
+        api_key (str, optional): VideoDB API key (ignored by the fake)
+
+    Returns:
+        VideoDB connection
+    """
+    if use_fake_backend():
+        from .fake_backends import FakeVideoDBConnection
+
+        return FakeVideoDBConnection()
+
+    import videodb
+
+    return videodb.connect(api_key=api_key)
+
+
+def create_genai_client():
+    """
+    Create a Google GenAI client, or the fake one.
+
+    The live client reads GOOGLE_API_KEY from the environment.
+
+    Returns:
+        GenAI client
+    """
+    if use_fake_backend():
+        from .fake_backends import FakeGenAIClient
+
+        return FakeGenAIClient()
+
+    from google import genai
+
+    return genai.Client()
+
+
+def get_search_types():
+    """
+    Get the SDK's search and index type enums.
+
+    Returns:
+        tuple: (SearchType, IndexType)
+    """
+    if use_fake_backend():
+        from .fake_backends import FakeSearchType, FakeIndexType
+
+        return FakeSearchType, FakeIndexType
+
+    from videodb import SearchType, IndexType
+
+    return SearchType, IndexType
+
+
+def get_timeline_classes():
+    """
+    Get the SDK's timeline editing classes.
+
+    Returns:
+        tuple: (Timeline, VideoAsset)
+
+    Raises:
+        ImportError: If the installed VideoDB SDK has no timeline support
+    """
+    if use_fake_backend():
+        from .fake_backends import FakeTimeline, FakeVideoAsset
+
+        return FakeTimeline, FakeVideoAsset
+
+    from videodb.timeline import Timeline
+    from videodb.asset import VideoAsset
+
+    return Timeline, VideoAsset
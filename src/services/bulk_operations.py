@@ -0,0 +1,125 @@
+"""
+Bulk Operations for Klipify
+Runs one operation over many videos through a bounded worker pool.
+
+Each item is retried with exponential backoff before it is reported as
+failed, and a failed item never stops the rest of the batch. Progress is
+reported on the calling thread, so Streamlit progress bars can be updated
+from the callback. The pool size comes from KLIPIFY_BULK_CONCURRENCY
+(default 4).
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .tracing import propagate
+
+
+DEFAULT_BULK_CONCURRENCY = 4
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF_SECONDS = 0.5
+
+
+class BulkResult:
+    """Outcome of a bulk operation, item by item."""
+
+    def __init__(self, action, item_ids):
+        """
+        Args:
+            action (str): Operation name (e.g. 'delete')
+            item_ids (list): Items the operation ran over, in order
+        """
+        self.action = action
+        self.item_ids = list(item_ids)
+        self.results = {}
+        self.errors = {}
+        self.attempts = {}
+        self.seconds = 0.0
+
+    @property
+    def succeeded(self):
+        """IDs of items that completed, in the original order."""
+        return [item_id for item_id in self.item_ids if item_id in self.results]
+
+    @property
+    def failed(self):
+        """IDs of items that failed after all retries, in the original order."""
+        return [item_id for item_id in self.item_ids if item_id in self.errors]
+
+    def to_dict(self):
+        """Summary safe to keep in session state."""
+        return {
+            'action': self.action,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'errors': dict(self.errors),
+            'seconds': self.seconds,
+        }
+
+
+def get_bulk_concurrency():
+    """
+    Get the number of items a bulk operation processes at once.
+
+    Returns:
+        int: KLIPIFY_BULK_CONCURRENCY, at least 1 (default 4)
+    """
+    try:
+        return max(1, int(os.getenv("KLIPIFY_BULK_CONCURRENCY", DEFAULT_BULK_CONCURRENCY)))
+    except ValueError:
+        return DEFAULT_BULK_CONCURRENCY
+
+
+def run_bulk(action, item_ids, operation, max_workers=None, retries=DEFAULT_RETRIES,
+             backoff=DEFAULT_BACKOFF_SECONDS, on_progress=None):
+    """
+    Run an operation over many items concurrently.
+
+    Args:
+        action (str): Operation name for reporting
+        item_ids (list): Items to process (duplicates are processed once)
+        operation (callable): operation(item_id) -> result; raises on failure
+        max_workers (int, optional): Pool size (defaults to get_bulk_concurrency())
+        retries (int): Extra attempts per item after a failure
+        backoff (float): Seconds before the first retry, doubled on each retry
+        on_progress (callable, optional): on_progress(done, total, item_id, error)
+            called on the calling thread as each item finishes
+
+    Returns:
+        BulkResult: Per-item results and errors
+    """
+    item_ids = list(dict.fromkeys(item_ids))
+    result = BulkResult(action, item_ids)
+    if not item_ids:
+        return result
+
+    def attempt(item_id):
+        delay = backoff
+        for attempt_number in range(1, retries + 2):
+            try:
+                return attempt_number, operation(item_id), None
+            except Exception as e:
+                if attempt_number > retries:
+                    return attempt_number, None, str(e) or type(e).__name__
+                time.sleep(delay)
+                delay *= 2
+
+    started = time.perf_counter()
+    workers = min(max_workers or get_bulk_concurrency(), len(item_ids))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"klipify-bulk-{action}") as pool:
+        # Workers join the caller's trace, if it is being traced
+        futures = {pool.submit(propagate(attempt), item_id): item_id for item_id in item_ids}
+        for done, future in enumerate(as_completed(futures), start=1):
+            item_id = futures[future]
+            attempts, value, error = future.result()
+            result.attempts[item_id] = attempts
+            if error is None:
+                result.results[item_id] = value
+            else:
+                result.errors[item_id] = error
+            if on_progress:
+                on_progress(done, len(item_ids), item_id, error)
+
+    result.seconds = time.perf_counter() - started
+    return result
@@ -0,0 +1,523 @@
+"""
+VideoDB Collection Mirror for Klipify
+Local SQLite copy of the VideoDB collection listing, synced incrementally.
+
+The My Videos page lists, filters and pages videos from the mirror instead
+of fetching the whole collection on every rerun. The VideoDB SDK only
+offers a full listing (no created_at filter or ETag), so a sync makes one
+get_videos() call and applies the delta: every mirrored row keeps a hash of
+its fields, new uploads are inserted, renamed or otherwise edited videos
+are rewritten and re-indexed, and deleted videos are removed. A fingerprint
+of all row hashes acts as the ETag; when it matches the last sync no rows
+are written at all. Syncs run at most every
+KLIPIFY_COLLECTION_SYNC_SECONDS (default 300) unless forced.
+
+Names and descriptions are indexed as word trigrams, so search is ranked by
+trigram overlap and tolerates typos ("gradiant" finds "gradient").
+"""
+
+import hashlib
+import html
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from ..utils.helpers import get_data_dir
+from .metrics import track_call
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mirrored_videos (
+    collection_id TEXT NOT NULL,
+    video_id TEXT NOT NULL,
+    name TEXT,
+    description TEXT,
+    length REAL DEFAULT 0,
+    created_at TEXT,
+    status TEXT,
+    thumbnail TEXT,
+    stream_url TEXT,
+    search_text TEXT NOT NULL,
+    row_hash TEXT,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (collection_id, video_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_mirrored_videos_created ON mirrored_videos(collection_id, created_at);
+
+CREATE TABLE IF NOT EXISTS mirrored_trigrams (
+    collection_id TEXT NOT NULL,
+    trigram TEXT NOT NULL,
+    video_id TEXT NOT NULL,
+    field INTEGER NOT NULL,
+    PRIMARY KEY (collection_id, trigram, video_id, field)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS mirror_state (
+    collection_id TEXT PRIMARY KEY,
+    fingerprint TEXT,
+    video_count INTEGER DEFAULT 0,
+    synced_at REAL
+);
+"""
+
+DEFAULT_SYNC_SECONDS = 300
+DEFAULT_PAGE_SIZE = 20
+
+# Bumped when the schema needs existing mirrors backfilled
+_SCHEMA_VERSION = 1
+
+# Share of the query's trigrams a video must contain to match
+MIN_SIMILARITY = 0.5
+
+# Trigram fields; name matches rank above description matches
+FIELD_NAME = 0
+FIELD_DESCRIPTION = 1
+
+# Only the start of long descriptions is indexed, which keeps the index small
+DESCRIPTION_INDEX_CHARS = 1000
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+# Columns added after the first release of the mirror, for existing databases
+_ADDED_COLUMNS = (
+    ('row_hash', "TEXT"),
+)
+
+_COLUMNS = ('video_id', 'name', 'description', 'length', 'created_at', 'status', 'thumbnail', 'stream_url')
+
+
+def video_info(video):
+    """
+    Build the listing dict for a VideoDB video.
+
+    Args:
+        video: VideoDB video object
+
+    Returns:
+        dict: id, name, description, length, upload_date, status, thumbnail, stream_url
+    """
+    return {
+        'id': video.id,
+        'name': video.name or 'Untitled',
+        'description': getattr(video, 'description', '') or '',
+        'length': getattr(video, 'length', 0),
+        'upload_date': getattr(video, 'created_at', 'Unknown'),
+        'status': getattr(video, 'status', 'Unknown'),
+        'thumbnail': getattr(video, 'thumbnail_url', ''),
+        'stream_url': getattr(video, 'stream_url', ''),
+    }
+
+
+class CollectionMirror:
+    """Mirrors VideoDB collection listings into SQLite."""
+
+    _init_lock = threading.Lock()
+    _initialized_paths = set()
+
+    def __init__(self, db_path=None, sync_seconds=None):
+        """
+        Initialize the mirror.
+
+        Args:
+            db_path (str, optional): SQLite database path (defaults to data/collection.db)
+            sync_seconds (float, optional): Minimum age before an automatic sync
+                (defaults to KLIPIFY_COLLECTION_SYNC_SECONDS or 300)
+        """
+        self.db_path = db_path or os.path.join(get_data_dir(), "collection.db")
+        if sync_seconds is None:
+            sync_seconds = float(os.getenv("KLIPIFY_COLLECTION_SYNC_SECONDS", DEFAULT_SYNC_SECONDS))
+        self.sync_seconds = sync_seconds
+        # One sync at a time per process; other sessions wait and reuse its result
+        self._sync_lock = threading.Lock()
+        self._ensure_schema()
+
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection; SQLite handles cross-session locking."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.row_factory = sqlite3.Row
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _ensure_schema(self):
+        """Create tables on first use of a database file."""
+        with self._init_lock:
+            if self.db_path in self._initialized_paths:
+                return
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                existing = {row[1] for row in conn.execute("PRAGMA table_info(mirrored_videos)")}
+                for column, definition in _ADDED_COLUMNS:
+                    if column not in existing:
+                        # Rows without a hash are rewritten on the next sync
+                        conn.execute(f"ALTER TABLE mirrored_videos ADD COLUMN {column} {definition}")
+                if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+                    # Mirrors created before the trigram index get it built once
+                    self._rebuild_trigrams(conn)
+                    conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            self._initialized_paths.add(self.db_path)
+
+    def _rebuild_trigrams(self, conn):
+        """Rebuild the trigram index from the mirrored rows."""
+        conn.execute("DELETE FROM mirrored_trigrams")
+        _insert_trigrams(conn, [
+            (row['collection_id'], row['video_id'], row['name'], row['description'])
+            for row in conn.execute("SELECT collection_id, video_id, name, description FROM mirrored_videos")
+        ])
+
+    def get_state(self, collection_id):
+        """
+        Get the last sync's bookkeeping for a collection.
+
+        Args:
+            collection_id (str): VideoDB collection ID
+
+        Returns:
+            dict: fingerprint, video_count and synced_at, or None if never synced
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM mirror_state WHERE collection_id = ?", (collection_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def is_stale(self, collection_id):
+        """Whether the collection is due for an automatic sync."""
+        state = self.get_state(collection_id)
+        return state is None or time.time() - (state['synced_at'] or 0) >= self.sync_seconds
+
+    def sync(self, collection, force=False):
+        """
+        Bring the mirror up to date with a VideoDB collection.
+
+        Args:
+            collection: VideoDB collection object
+            force (bool): Sync even if the last sync is still fresh
+
+        Returns:
+            dict: Counts of added, updated, removed and unchanged videos, and
+                whether the collection was fetched at all
+        """
+        collection_id = getattr(collection, 'id', None) or "default"
+        result = {'fetched': False, 'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+
+        with self._sync_lock:
+            # Another session may have synced while this one waited
+            if not force and not self.is_stale(collection_id):
+                return result
+
+            with track_call('videodb', 'get_videos'):
+                videos = collection.get_videos()
+            result['fetched'] = True
+
+            now = time.time()
+            listed = {row[1]: row for row in (_row(collection_id, video_info(video), now) for video in videos)}
+            fingerprint = hashlib.sha1(
+                "\n".join(f"{video_id} {listed[video_id][-2]}" for video_id in sorted(listed)).encode("utf-8")
+            ).hexdigest()
+
+            with self._connect() as conn:
+                state = conn.execute(
+                    "SELECT fingerprint FROM mirror_state WHERE collection_id = ?", (collection_id,)
+                ).fetchone()
+
+                if state and state['fingerprint'] == fingerprint:
+                    # Same videos as last time: nothing to write
+                    result['unchanged'] = len(listed)
+                    conn.execute(
+                        "UPDATE mirror_state SET synced_at = ? WHERE collection_id = ?",
+                        (now, collection_id)
+                    )
+                    return result
+
+                known = {
+                    row['video_id']: row['row_hash'] for row in conn.execute(
+                        "SELECT video_id, row_hash FROM mirrored_videos WHERE collection_id = ?", (collection_id,)
+                    )
+                }
+
+                added = [listed[video_id] for video_id in listed.keys() - known.keys()]
+                # Renamed, re-described or re-processed videos are rewritten and re-indexed
+                updated = [
+                    listed[video_id] for video_id in listed.keys() & known.keys()
+                    if listed[video_id][-2] != known[video_id]
+                ]
+                removed = [(collection_id, video_id) for video_id in known.keys() - listed.keys()]
+                stale_trigrams = removed + [(collection_id, row[1]) for row in updated]
+
+                conn.executemany(
+                    f"""
+                    INSERT OR REPLACE INTO mirrored_videos (
+                        collection_id, {', '.join(_COLUMNS)}, search_text, row_hash, synced_at
+                    ) VALUES ({', '.join('?' * (len(_COLUMNS) + 4))})
+                    """,
+                    added + updated
+                )
+                conn.executemany(
+                    "DELETE FROM mirrored_videos WHERE collection_id = ? AND video_id = ?", removed
+                )
+                conn.executemany(
+                    "DELETE FROM mirrored_trigrams WHERE collection_id = ? AND video_id = ?", stale_trigrams
+                )
+                _insert_trigrams(conn, [(collection_id, row[1], row[2], row[3]) for row in added + updated])
+
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO mirror_state (collection_id, fingerprint, video_count, synced_at)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (collection_id, fingerprint, len(listed), now)
+                )
+
+            result.update(
+                added=len(added), updated=len(updated), removed=len(removed),
+                unchanged=len(known) - len(removed) - len(updated)
+            )
+            return result
+
+    def query(self, collection_id, search_term=None, page=0, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Search and page mirrored videos.
+
+        Without a search term videos are listed newest first. With one,
+        videos are ranked by exact substring match, then by the share of the
+        query's trigrams they contain (name matches first), so misspelled
+        queries still find their videos.
+
+        Args:
+            collection_id (str): VideoDB collection ID
+            search_term (str, optional): Text to look for in names and descriptions
+            page (int): Zero-based page number
+            page_size (int): Videos per page
+
+        Returns:
+            dict: videos on the page, matching total, total_length of all
+                matches (seconds), collection_total and page count
+        """
+        query_trigrams = sorted(trigrams(search_term or ""))
+
+        if query_trigrams:
+            # Candidate videos come from the trigram index, never a scan of every row
+            placeholders = ', '.join('?' * len(query_trigrams))
+            matches = f"""
+                WITH matches AS (
+                    SELECT video_id, COUNT(DISTINCT trigram) AS hits,
+                           COUNT(DISTINCT CASE WHEN field = {FIELD_NAME} THEN trigram END) AS name_hits
+                    FROM mirrored_trigrams
+                    WHERE collection_id = ? AND trigram IN ({placeholders})
+                    GROUP BY video_id
+                    HAVING hits >= ?
+                )
+            """
+            params = [collection_id] + query_trigrams + [
+                max(1, math.ceil(len(query_trigrams) * MIN_SIMILARITY))
+            ]
+            source = "matches m JOIN mirrored_videos v ON v.collection_id = ? AND v.video_id = m.video_id"
+            params.append(collection_id)
+            order = "instr(v.search_text, ?) > 0 DESC, m.hits DESC, m.name_hits DESC, v.created_at DESC"
+            order_params = [search_term.strip().lower()]
+        else:
+            matches = ""
+            source = "mirrored_videos v"
+            params = []
+            order = "v.created_at DESC, v.video_id"
+            order_params = []
+        where = "v.collection_id = ?"
+        params.append(collection_id)
+
+        with self._connect() as conn:
+            # One ranked pass yields the totals and the page
+            ranked = conn.execute(
+                f"{matches} SELECT v.video_id, v.length FROM {source} WHERE {where} ORDER BY {order}",
+                params + order_params
+            ).fetchall()
+            total = len(ranked)
+            total_length = sum(row['length'] or 0 for row in ranked)
+            collection_total = total if not query_trigrams else conn.execute(
+                "SELECT COUNT(*) FROM mirrored_videos WHERE collection_id = ?", (collection_id,)
+            ).fetchone()[0]
+
+            pages = max((total - 1) // page_size + 1, 1)
+            page = min(max(page, 0), pages - 1)
+            page_ids = [row['video_id'] for row in ranked[page * page_size:(page + 1) * page_size]]
+            by_id = {
+                row['video_id']: row for row in conn.execute(
+                    f"""
+                    SELECT {', '.join(_COLUMNS)} FROM mirrored_videos
+                    WHERE collection_id = ? AND video_id IN ({', '.join('?' * len(page_ids))})
+                    """,
+                    [collection_id] + page_ids
+                )
+            } if page_ids else {}
+            rows = [by_id[video_id] for video_id in page_ids if video_id in by_id]
+
+        return {
+            'videos': [_listing(row) for row in rows],
+            'total': total,
+            'total_length': total_length,
+            'collection_total': collection_total,
+            'page': page,
+            'pages': pages,
+        }
+
+    def remove_video(self, collection_id, video_id):
+        """
+        Drop a deleted video from the mirror without waiting for a sync.
+
+        Args:
+            collection_id (str): VideoDB collection ID
+            video_id (str): VideoDB video ID
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM mirrored_videos WHERE collection_id = ? AND video_id = ?",
+                (collection_id, video_id)
+            )
+            conn.execute(
+                "DELETE FROM mirrored_trigrams WHERE collection_id = ? AND video_id = ?",
+                (collection_id, video_id)
+            )
+            # The next sync must diff again rather than trust the old fingerprint
+            conn.execute(
+                "UPDATE mirror_state SET fingerprint = NULL, video_count = MAX(video_count - 1, 0) "
+                "WHERE collection_id = ?",
+                (collection_id,)
+            )
+
+
+def trigrams(text):
+    """
+    Get the word trigrams of a text.
+
+    Each word is padded ("  word ") so short words and word starts match,
+    as in PostgreSQL's pg_trgm.
+
+    Args:
+        text (str): Text to index or search for
+
+    Returns:
+        set: Trigram strings
+    """
+    grams = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(a, b):
+    """Share of trigrams two words have in common (0 to 1)."""
+    grams_a, grams_b = trigrams(a), trigrams(b)
+    if not grams_a or not grams_b:
+        return 0.0
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
+
+
+def highlight_matches(text, search_term):
+    """
+    Escape text for HTML, marking the words that match a search.
+
+    A word matches when it contains a query word or is a close misspelling
+    of one.
+
+    Args:
+        text (str): Video name or description
+        search_term (str): Search query
+
+    Returns:
+        str: Escaped text with <mark> around matching words
+    """
+    query_words = _WORD.findall((search_term or "").lower())
+    if not text or not query_words:
+        return html.escape(text or "")
+
+    parts = []
+    position = 0
+    for match in _WORD.finditer(text):
+        word = match.group(0).lower()
+        if any(query_word in word or similarity(query_word, word) >= MIN_SIMILARITY
+               for query_word in query_words):
+            parts.append(html.escape(text[position:match.start()]))
+            parts.append(f"<mark>{html.escape(match.group(0))}</mark>")
+            position = match.end()
+    parts.append(html.escape(text[position:]))
+    return "".join(parts)
+
+
+def _insert_trigrams(conn, videos):
+    """
+    Add videos' name and description trigrams to the index.
+
+    Args:
+        conn (sqlite3.Connection): Open connection
+        videos (list): (collection_id, video_id, name, description) tuples
+    """
+    rows = []
+    for collection_id, video_id, name, description in videos:
+        rows.extend((collection_id, gram, video_id, FIELD_NAME) for gram in trigrams(name or ""))
+        rows.extend((collection_id, gram, video_id, FIELD_DESCRIPTION) for gram in trigrams((description or "")[:DESCRIPTION_INDEX_CHARS]))
+    # Inserting in key order appends to the index instead of splitting pages at random
+    rows.sort()
+    conn.executemany(
+        "INSERT OR IGNORE INTO mirrored_trigrams (collection_id, trigram, video_id, field) VALUES (?, ?, ?, ?)",
+        rows
+    )
+
+
+def _row(collection_id, info, synced_at):
+    """Convert a listing dict to a mirrored_videos row, ending with its hash and sync time."""
+    search_text = f"{info['name']}\n{info['description']}".lower()
+    fields = (
+        info['id'], info['name'], info['description'], info['length'] or 0,
+        None if info['upload_date'] in (None, 'Unknown') else str(info['upload_date']),
+        str(info['status']), info['thumbnail'] or '', info['stream_url'] or '',
+    )
+    row_hash = hashlib.sha1(repr(fields).encode("utf-8")).hexdigest()
+    return (collection_id, *fields, search_text, row_hash, synced_at)
+
+
+def _listing(row):
+    """Convert a mirrored_videos row back to the listing dict format."""
+    return {
+        'id': row['video_id'],
+        'name': row['name'],
+        'description': row['description'] or '',
+        'length': row['length'] or 0,
+        'upload_date': row['created_at'] or 'Unknown',
+        'status': row['status'],
+        'thumbnail': row['thumbnail'],
+        'stream_url': row['stream_url'],
+    }
+
+
+_mirror = None
+_mirror_lock = threading.Lock()
+
+
+def get_collection_mirror():
+    """
+    Get the shared process-wide collection mirror, or None if it cannot be opened.
+
+    Returns:
+        CollectionMirror or None
+    """
+    global _mirror
+    with _mirror_lock:
+        if _mirror is None:
+            try:
+                _mirror = CollectionMirror()
+            except (OSError, sqlite3.Error):
+                return None
+        return _mirror
@@ -0,0 +1,551 @@
+"""
+Fake VideoDB and Gemini Backends for Klipify
+In-process stand-ins for the subset of the VideoDB and Google GenAI SDKs the
+app uses, with configurable latency, error injection and synthetic
+transcripts of any length. Enabled with KLIPIFY_BACKEND=fake.
+"""
+
+import hashlib
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+
+
+# Median latency in seconds and log-normal spread per operation, roughly
+# matching what the live services take for a ten-minute lecture
+DEFAULT_LATENCY = {
+    'upload': (8.0, 0.4),
+    'index_spoken_words': (15.0, 0.5),
+    'get_transcript': (0.5, 0.3),
+    'search': (0.6, 0.3),
+    'generate_stream': (0.8, 0.3),
+    'generate_content': (3.0, 0.5),
+    'generate_content_stream': (3.0, 0.5),
+    'get_videos': (0.4, 0.3),
+    'get_video': (0.2, 0.3),
+    'delete': (0.3, 0.3),
+}
+
+_TOPICS = [
+    ("photosynthesis", ["chlorophyll", "light reactions", "calvin cycle", "glucose", "carbon dioxide", "stomata"]),
+    ("neural networks", ["gradient descent", "backpropagation", "activation function", "loss function", "hidden layer", "overfitting"]),
+    ("supply and demand", ["equilibrium price", "price elasticity", "consumer surplus", "market shortage", "demand curve", "marginal cost"]),
+    ("thermodynamics", ["entropy", "heat engine", "internal energy", "first law", "carnot cycle", "temperature gradient"]),
+    ("linear algebra", ["eigenvalues", "matrix multiplication", "vector space", "linear transformation", "determinant", "orthogonal basis"]),
+]
+
+_SENTENCES = [
+    "Today we are going to look at {a} and why it matters.",
+    "The key idea behind {a} is how it connects to {b}.",
+    "If you remember one thing, remember that {a} depends on {b}.",
+    "Let's work through an example of {a} step by step.",
+    "A common mistake is to confuse {a} with {b}.",
+    "Notice how {a} changes when we adjust {b}.",
+    "This is where {a} really starts to make sense.",
+    "We can summarize {a} in a simple diagram.",
+    "Before moving on, let's review {a} and {b} together.",
+    "In practice, engineers use {a} to reason about {b}.",
+]
+
+_STOPWORDS = {
+    "the", "and", "that", "this", "with", "from", "into", "what", "when", "where", "which", "about",
+    "your", "you", "are", "for", "how", "why", "can", "let", "lets", "let's", "its", "it's", "one", "thing",
+    "we", "to", "of", "in", "is", "on", "a", "an", "it", "be", "as", "at", "or", "if", "by", "our",
+    "going", "look", "matters", "really", "starts", "make", "sense", "simple", "before", "moving",
+    "review", "together", "practice", "use", "reason", "notice", "changes", "adjust", "common", "mistake",
+    "confuse", "example", "step", "work", "through", "today", "remember", "depends", "key", "idea",
+    "behind", "connects", "diagram", "summarize", "engineers",
+}
+
+
+class FakeBackendError(Exception):
+    """Error injected by the fake backends."""
+
+
+class FakeBackendConfig:
+    """Latency, error and transcript settings shared by all fake clients."""
+
+    def __init__(self, latency=None, latency_scale=0.05, error_rates=None, seed=0,
+                 transcript_minutes=10, segment_seconds=6):
+        """
+        Args:
+            latency (dict, optional): Operation -> (median_seconds, sigma) overrides
+            latency_scale (float): Multiplier on every sampled latency (0 disables sleeping)
+            error_rates (dict, optional): Operation -> probability of an injected error
+            seed (int): Seed for latency, error and transcript generation
+            transcript_minutes (float): Length of synthetic videos
+            segment_seconds (float): Length of each synthetic transcript segment
+        """
+        self.latency = dict(DEFAULT_LATENCY)
+        self.latency.update(latency or {})
+        self.latency_scale = latency_scale
+        self.error_rates = dict(error_rates or {})
+        self.seed = seed
+        self.transcript_minutes = transcript_minutes
+        self.segment_seconds = segment_seconds
+
+    @classmethod
+    def from_env(cls):
+        """
+        Build a config from KLIPIFY_FAKE_* environment variables.
+
+        KLIPIFY_FAKE_LATENCY_SCALE, KLIPIFY_FAKE_ERROR_RATE (applied to every
+        operation), KLIPIFY_FAKE_SEED and KLIPIFY_FAKE_TRANSCRIPT_MINUTES.
+
+        Returns:
+            FakeBackendConfig: Configuration
+        """
+        error_rate = float(os.getenv("KLIPIFY_FAKE_ERROR_RATE", 0))
+        return cls(
+            latency_scale=float(os.getenv("KLIPIFY_FAKE_LATENCY_SCALE", 0.05)),
+            error_rates={operation: error_rate for operation in DEFAULT_LATENCY} if error_rate else None,
+            seed=int(os.getenv("KLIPIFY_FAKE_SEED", 0)),
+            transcript_minutes=float(os.getenv("KLIPIFY_FAKE_TRANSCRIPT_MINUTES", 10)),
+        )
+
+
+class _FakeState:
+    """Process-wide fake account: uploaded videos, call statistics and injected failures."""
+
+    def __init__(self, config):
+        self.config = config
+        self.videos = {}
+        self.stats = {}
+        self.forced_failures = {}
+        self.rng = random.Random(config.seed)
+        self.lock = threading.Lock()
+
+    def call(self, operation, tokens=None):
+        """Record a call, sleep for its sampled latency and maybe raise an injected error."""
+        with self.lock:
+            median, sigma = self.config.latency.get(operation, (0.1, 0.3))
+            latency = median * math.exp(self.rng.gauss(0, sigma)) * self.config.latency_scale
+            forced = self.forced_failures.get(operation)
+            if forced:
+                message = forced.pop(0)
+                if not forced:
+                    del self.forced_failures[operation]
+            elif self.rng.random() < self.config.error_rates.get(operation, 0):
+                message = _default_error_message(operation)
+            else:
+                message = None
+
+            stats = self.stats.setdefault(operation, {
+                'calls': 0, 'errors': 0, 'latency_seconds': 0.0,
+                'prompt_tokens': 0, 'output_tokens': 0,
+            })
+            stats['calls'] += 1
+            stats['latency_seconds'] += latency
+            if message:
+                stats['errors'] += 1
+            elif tokens:
+                stats['prompt_tokens'] += tokens[0]
+                stats['output_tokens'] += tokens[1]
+
+        if latency > 0:
+            time.sleep(latency)
+        if message:
+            raise FakeBackendError(message)
+
+
+def _default_error_message(operation):
+    """Realistic error text for an injected failure."""
+    if operation.startswith('generate_content'):
+        return "429 RESOURCE_EXHAUSTED: quota exceeded for model (injected by fake backend)"
+    return f"503 Service Unavailable during {operation} (injected by fake backend)"
+
+
+_state = None
+_state_lock = threading.Lock()
+
+
+def _get_state():
+    global _state
+    with _state_lock:
+        if _state is None:
+            _state = _FakeState(FakeBackendConfig.from_env())
+        return _state
+
+
+def configure_fake_backend(config=None, **settings):
+    """
+    Replace the fake backend configuration and clear all fake state.
+
+    Args:
+        config (FakeBackendConfig, optional): Full configuration
+        **settings: FakeBackendConfig arguments, used when config is not given
+    """
+    global _state
+    with _state_lock:
+        _state = _FakeState(config or FakeBackendConfig(**settings))
+
+
+def inject_failures(operation, count=1, message=None):
+    """
+    Make the next calls to an operation fail deterministically.
+
+    Args:
+        operation (str): Operation name (e.g. 'upload', 'generate_content')
+        count (int): Number of consecutive calls to fail
+        message (str, optional): Error message
+    """
+    state = _get_state()
+    with state.lock:
+        state.forced_failures.setdefault(operation, []).extend(
+            [message or _default_error_message(operation)] * count
+        )
+
+
+def get_fake_backend_stats():
+    """
+    Get per-operation call statistics.
+
+    Returns:
+        dict: Operation -> calls, errors, latency_seconds, prompt_tokens and output_tokens
+    """
+    state = _get_state()
+    with state.lock:
+        return {operation: dict(stats) for operation, stats in state.stats.items()}
+
+
+def reset_fake_backend_stats():
+    """Clear call statistics without touching uploaded videos."""
+    state = _get_state()
+    with state.lock:
+        state.stats.clear()
+
+
+def synthetic_transcript(seed_text, minutes=10, segment_seconds=6, seed=0):
+    """
+    Generate a deterministic lecture-style transcript.
+
+    Args:
+        seed_text (str): Varies the topic and wording (e.g. the video URL)
+        minutes (float): Transcript length
+        segment_seconds (float): Length of each segment
+        seed (int): Extra seed
+
+    Returns:
+        list: Segments as dicts with start, end and text
+    """
+    digest = int(hashlib.sha1(f"{seed}:{seed_text}".encode("utf-8")).hexdigest(), 16)
+    rng = random.Random(digest)
+    topic, terms = _TOPICS[digest % len(_TOPICS)]
+    vocabulary = [topic] + terms
+
+    segments = []
+    start = 0.0
+    total = max(minutes, 0) * 60
+    while start < total:
+        end = min(start + segment_seconds, total)
+        a, b = rng.sample(vocabulary, 2)
+        text = rng.choice(_SENTENCES).format(a=a, b=b)
+        segments.append({'start': round(start, 2), 'end': round(end, 2), 'text': text})
+        start = end
+    return segments
+
+
+# ---------------------------------------------------------------------------
+# VideoDB
+# ---------------------------------------------------------------------------
+
+class FakeSearchType:
+    semantic = 'semantic'
+    keyword = 'keyword'
+
+
+class FakeIndexType:
+    spoken_word = 'spoken_word'
+    scene = 'scene'
+
+
+class FakeShot:
+    """Search hit with the attributes the app reads."""
+
+    def __init__(self, video_id, start, end, text, search_score):
+        self.video_id = video_id
+        self.start = start
+        self.end = end
+        self.text = text
+        self.search_score = search_score
+
+
+class FakeSearchResult:
+    def __init__(self, shots):
+        self.shots = shots
+
+    def get_shots(self):
+        return self.shots
+
+
+class FakeVideo:
+    """Uploaded video with a synthetic transcript."""
+
+    def __init__(self, state, video_id, url, name, minutes):
+        self._state = state
+        self.id = video_id
+        self.url = url
+        self.name = name
+        self.description = f"Synthetic lecture generated for {url}"
+        self.length = minutes * 60
+        self.created_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.thumbnail_url = None
+        self.stream_url = f"https://fake.videodb.local/{video_id}/stream.m3u8"
+        self.player_url = f"https://fake.videodb.local/{video_id}/player"
+        self._segments = synthetic_transcript(
+            url, minutes, state.config.segment_seconds, state.config.seed
+        )
+        self._indexed = False
+
+    def index_spoken_words(self, *args, **kwargs):
+        self._state.call('index_spoken_words')
+        self._indexed = True
+
+    def get_transcript(self, *args, **kwargs):
+        self._state.call('get_transcript')
+        return [dict(segment) for segment in self._segments]
+
+    def get_transcript_text(self, *args, **kwargs):
+        self._state.call('get_transcript')
+        return " ".join(segment['text'] for segment in self._segments)
+
+    def search(self, query, search_type=None, index_type=None, result_threshold=5, **kwargs):
+        """Rank segments by word overlap with the query."""
+        self._state.call('search')
+        if not self._indexed:
+            raise FakeBackendError("Spoken words are not indexed for this video")
+
+        query_words = set(re.findall(r"\w+", query.lower()))
+        scored = []
+        for segment in self._segments:
+            words = set(re.findall(r"\w+", segment['text'].lower()))
+            overlap = len(query_words & words)
+            if overlap:
+                scored.append((overlap / len(query_words), segment))
+        scored.sort(key=lambda item: (-item[0], item[1]['start']))
+        return FakeSearchResult([
+            FakeShot(self.id, segment['start'], segment['end'], segment['text'], score)
+            for score, segment in scored[:result_threshold]
+        ])
+
+    def generate_stream(self, timeline=None):
+        self._state.call('generate_stream')
+        span = "-".join(f"{start:g}_{end:g}" for start, end in (timeline or []))
+        return f"https://fake.videodb.local/{self.id}/{span or 'full'}.m3u8"
+
+    def delete(self):
+        self._state.call('delete')
+        with self._state.lock:
+            self._state.videos.pop(self.id, None)
+
+
+class FakeCollection:
+    """Default collection holding every uploaded fake video."""
+
+    def __init__(self, state):
+        self._state = state
+        self.id = "c-fake-default"
+        self.name = "Default Collection"
+
+    def get_videos(self):
+        self._state.call('get_videos')
+        with self._state.lock:
+            return list(self._state.videos.values())
+
+    def get_video(self, video_id):
+        self._state.call('get_video')
+        with self._state.lock:
+            video = self._state.videos.get(video_id)
+        if video is None:
+            raise FakeBackendError(f"Video {video_id} not found")
+        return video
+
+    def upload(self, url=None, name=None, minutes=None, **kwargs):
+        return FakeVideoDBConnection(self._state).upload(url=url, name=name, minutes=minutes)
+
+
+class FakeVideoDBConnection:
+    """Stand-in for videodb.connect()."""
+
+    def __init__(self, state=None):
+        self._state = state or _get_state()
+
+    def upload(self, url=None, name=None, minutes=None, **kwargs):
+        """
+        Upload a video; uploading the same URL twice returns the same video.
+
+        Args:
+            url (str): Source URL
+            name (str, optional): Video name
+            minutes (float, optional): Synthetic length override
+        """
+        self._state.call('upload')
+        video_id = "m-" + hashlib.sha1((url or name or "").encode("utf-8")).hexdigest()[:12]
+        with self._state.lock:
+            video = self._state.videos.get(video_id)
+            if video is None:
+                video = FakeVideo(
+                    self._state, video_id, url,
+                    name or f"Synthetic lecture {video_id[2:8]}",
+                    minutes or self._state.config.transcript_minutes
+                )
+                self._state.videos[video_id] = video
+        return video
+
+    def get_collection(self, collection_id=None):
+        return FakeCollection(self._state)
+
+
+class FakeVideoAsset:
+    def __init__(self, asset_id, start=0, end=None, **kwargs):
+        self.asset_id = asset_id
+        self.start = start
+        self.end = end
+
+
+class FakeTimeline:
+    """Stand-in for videodb.timeline.Timeline."""
+
+    def __init__(self, connection):
+        self._state = getattr(connection, '_state', None) or _get_state()
+        self._assets = []
+
+    def add_inline(self, asset):
+        self._assets.append(asset)
+
+    def generate_stream(self, resolution=None):
+        self._state.call('generate_stream')
+        span = "-".join(f"{asset.asset_id}_{asset.start:g}_{asset.end:g}" for asset in self._assets)
+        suffix = f"_{resolution}" if resolution else ""
+        return f"https://fake.videodb.local/timeline/{span}{suffix}.m3u8"
+
+
+# ---------------------------------------------------------------------------
+# Gemini
+# ---------------------------------------------------------------------------
+
+class FakeUsageMetadata:
+    def __init__(self, prompt_token_count, candidates_token_count):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+        self.total_token_count = prompt_token_count + candidates_token_count
+
+
+class FakeResponse:
+    def __init__(self, text, usage_metadata=None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class FakeModels:
+    """Stand-in for genai.Client().models."""
+
+    def __init__(self, state):
+        self._state = state
+
+    def generate_content(self, model=None, contents=None, config=None, **kwargs):
+        prompt = _contents_text(contents)
+        text = _fake_completion(prompt)
+        usage = FakeUsageMetadata(count_tokens(prompt), count_tokens(text))
+        self._state.call('generate_content', (usage.prompt_token_count, usage.candidates_token_count))
+        return FakeResponse(text, usage)
+
+    def generate_content_stream(self, model=None, contents=None, config=None, **kwargs):
+        """Yield the completion in chunks; latency is spent before the first chunk."""
+        prompt = _contents_text(contents)
+        text = _fake_completion(prompt)
+        prompt_tokens = count_tokens(prompt)
+        self._state.call('generate_content_stream', (prompt_tokens, count_tokens(text)))
+        chunks = re.findall(r"\S+\s*", text) or [text]
+        for index in range(0, len(chunks), 8):
+            piece = "".join(chunks[index:index + 8])
+            yield FakeResponse(piece, FakeUsageMetadata(prompt_tokens, count_tokens(piece)))
+
+
+class FakeGenAIClient:
+    """Stand-in for google.genai.Client()."""
+
+    def __init__(self, state=None):
+        self.models = FakeModels(state or _get_state())
+
+
+def count_tokens(text):
+    """Approximate Gemini token count (about four characters per token)."""
+    return max(1, len(text or "") // 4)
+
+
+def _contents_text(contents):
+    if isinstance(contents, str):
+        return contents
+    if isinstance(contents, (list, tuple)):
+        return "\n".join(_contents_text(part) for part in contents)
+    return str(contents or "")
+
+
+def _key_phrases(text, limit=8):
+    """Most frequent content words and word pairs in a text."""
+    words = [word for word in re.findall(r"[a-z][a-z']+", text.lower()) if word not in _STOPWORDS]
+    counts = Counter(words)
+    # Favour word pairs so concepts read like "gradient descent", not "gradient"
+    pairs = Counter(f"{first} {second}" for first, second in zip(words, words[1:]))
+    counts.update({pair: count * 2 for pair, count in pairs.items()})
+    phrases = []
+    for phrase, _count in counts.most_common():
+        if any(phrase in chosen or chosen in phrase for chosen in phrases):
+            continue
+        phrases.append(phrase)
+        if len(phrases) == limit:
+            break
+    return phrases
+
+
+def _fake_completion(prompt):
+    """Deterministic completion shaped like the real prompt's expected answer."""
+    body = re.split(r"transcript:", prompt, flags=re.IGNORECASE)[-1]
+    phrases = _key_phrases(body) or ["the main topic"]
+
+    if "one concept per line" in prompt:
+        return "\n".join(phrase.title() for phrase in phrases[:8])
+
+    if "one chapter of a video" in prompt:
+        stamps = re.findall(r"\[(\d{1,2}:\d{2})\]", body)
+        step = max(1, len(stamps) // 4)
+        points = [
+            f"- [{stamp}] {phrases[number % len(phrases)].title()}: definition and a worked example"
+            for number, stamp in enumerate(stamps[::step][:4])
+        ]
+        return "\n".join(points) or "- No timestamps were provided"
+
+    if "timestamped video transcript" in prompt:
+        stamps = re.findall(r"\[(\d{1,2}:\d{2})\]", prompt)
+        step = max(1, len(stamps) // 6)
+        sections = []
+        for number, stamp in enumerate(stamps[::step][:6], start=1):
+            phrase = phrases[(number - 1) % len(phrases)]
+            sections.append(
+                f"## [{stamp}] Section {number}: {phrase.title()}\n"
+                f"- Definition and intuition for {phrase}\n"
+                f"- Worked example connecting {phrase} to {phrases[number % len(phrases)]}\n"
+            )
+        return "\n".join(sections) or "## Notes\n- No timestamps were provided"
+
+    if "comprehensive summary" in prompt:
+        topics = "\n".join(f"- **{phrase.title()}**: how it fits into the lecture" for phrase in phrases[:5])
+        return (
+            f"## Overview\nThis lecture introduces {phrases[0]} and related ideas.\n\n"
+            f"## Learning Objectives\n" + "\n".join(f"- Understand {phrase}" for phrase in phrases[:4]) +
+            f"\n\n## Main Topics\n{topics}\n\n## Target Audience\nStudents new to the subject\n\n"
+            f"## Difficulty Level\nIntermediate"
+        )
+
+    question = prompt.split("Current Question:", 1)[-1].split("Instructions:", 1)[0].strip()
+    return (
+        f"Great question! {question[:200]}\n\n"
+        f"The video explains this through {phrases[0]}"
+        + (f" and {phrases[1]}" if len(phrases) > 1 else "")
+        + ". Would you like a worked example?"
+    )
@@ -0,0 +1,771 @@
+"""
+Durable Processing Job Queue for Klipify
+SQLite-backed job queue with visibility-timeout leases, shared by the UI and
+standalone worker processes (see klipify_worker.py). Jobs are leased in
+fair order across tenants (see scheduler.py).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from ..utils.helpers import get_data_dir
+from .job_registry import JOB_RUNNING, JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED
+from .scheduler import (
+    DEFAULT_TENANT,
+    DEFAULT_JOB_SECONDS,
+    estimate_processing_seconds,
+    pick_next_job
+)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL,
+    tenant TEXT NOT NULL DEFAULT 'default',
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,
+    expected_cost REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    lease_owner TEXT,
+    lease_expires REAL,
+    visible_at REAL NOT NULL,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    first_leased_at REAL,
+    leased_at REAL,
+    finished_at REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_queue_jobs_ready ON queue_jobs(state, visible_at, priority);
+CREATE INDEX IF NOT EXISTS idx_queue_jobs_key ON queue_jobs(key, state);
+
+CREATE TABLE IF NOT EXISTS queue_job_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    event TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_queue_job_events_job ON queue_job_events(job_id, id);
+
+CREATE TABLE IF NOT EXISTS queue_job_waiters (
+    job_id INTEGER NOT NULL,
+    waiter_id TEXT NOT NULL,
+    PRIMARY KEY (job_id, waiter_id)
+);
+
+CREATE TABLE IF NOT EXISTS queue_tenants (
+    tenant TEXT PRIMARY KEY,
+    weight REAL NOT NULL DEFAULT 1,
+    vtime REAL NOT NULL DEFAULT 0
+);
+"""
+
+# Columns added after the first release of the queue, for existing databases
+_ADDED_COLUMNS = (
+    ('tenant', "TEXT NOT NULL DEFAULT 'default'"),
+    ('expected_cost', "REAL"),
+    ('first_leased_at', "REAL"),
+    ('leased_at', "REAL"),
+    ('finished_at', "REAL"),
+)
+
+# Queue job states
+STATE_QUEUED = 'queued'
+STATE_LEASED = 'leased'
+STATE_DONE = 'done'
+STATE_FAILED = 'failed'
+STATE_CANCELLED = 'cancelled'
+
+ACTIVE_STATES = (STATE_QUEUED, STATE_LEASED)
+FINISHED_STATES = (STATE_DONE, STATE_FAILED, STATE_CANCELLED)
+
+DEFAULT_LEASE_SECONDS = 120
+DEFAULT_RETRY_DELAY = 30
+
+
+class LeaseLost(Exception):
+    """Raised when a worker no longer owns the lease on its job."""
+
+
+class JobQueue:
+    """Durable FIFO-by-priority job queue with visibility-timeout leases."""
+
+    _init_lock = threading.Lock()
+    _initialized_paths = set()
+
+    def __init__(self, db_path=None):
+        """
+        Initialize the queue.
+
+        Args:
+            db_path (str, optional): SQLite database path (defaults to the data directory)
+        """
+        self.db_path = db_path or os.path.join(get_data_dir(), "queue.db")
+        self._ensure_schema()
+
+    @contextmanager
+    def _connect(self, immediate=False):
+        """Open a short-lived connection; immediate=True takes the write lock up front."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _ensure_schema(self):
+        """Create tables on first use of a database file."""
+        with self._init_lock:
+            if self.db_path in self._initialized_paths:
+                return
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                existing = {row[1] for row in conn.execute("PRAGMA table_info(queue_jobs)")}
+                for column, definition in _ADDED_COLUMNS:
+                    if column not in existing:
+                        conn.execute(f"ALTER TABLE queue_jobs ADD COLUMN {column} {definition}")
+                conn.commit()
+            finally:
+                conn.close()
+            self._initialized_paths.add(self.db_path)
+
+    def enqueue(self, key, payload, priority=0, max_attempts=3, tenant=None, expected_cost=None,
+                waiter_id=None):
+        """
+        Add a job unless an active job for the same key already exists.
+
+        Jobs whose cancellation has been requested are not joined; they are
+        already stopping, so a new job is queued instead.
+
+        Args:
+            key (str): Normalized YouTube video ID
+            payload (dict): JSON-serializable job arguments; optional 'duration'
+                and 'transcript_chars' hints improve the cost estimate
+            priority (float): Strict priority class; lower classes are leased first
+            max_attempts (int): Attempts before the job is marked failed
+            tenant (str, optional): User or team the job is scheduled fairly for
+            expected_cost (float, optional): Expected processing seconds
+            waiter_id (str, optional): Session to attach to the job, in the same
+                transaction, so a concurrent cancel cannot stop the job under it
+
+        Returns:
+            tuple: (job_id, created) where created is False for an existing active job
+        """
+        now = time.time()
+        tenant = tenant or DEFAULT_TENANT
+        if expected_cost is None:
+            expected_cost = estimate_processing_seconds(payload.get('duration'), payload.get('transcript_chars'))
+
+        with self._connect(immediate=True) as conn:
+            existing = conn.execute(
+                f"SELECT id FROM queue_jobs WHERE key = ? AND state IN ({_placeholders(ACTIVE_STATES)}) "
+                "AND cancel_requested = 0 ORDER BY id LIMIT 1",
+                (key, *ACTIVE_STATES)
+            ).fetchone()
+            if existing:
+                self._attach_waiter(conn, existing['id'], waiter_id)
+                return existing['id'], False
+
+            if expected_cost is None:
+                expected_cost = self._typical_runtime(conn)
+            self._activate_tenant(conn, tenant)
+
+            cursor = conn.execute(
+                """
+                INSERT INTO queue_jobs (key, tenant, payload, state, priority, expected_cost,
+                    max_attempts, visible_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, tenant, json.dumps(payload), STATE_QUEUED, priority, expected_cost,
+                 max_attempts, now, now, now)
+            )
+            self._attach_waiter(conn, cursor.lastrowid, waiter_id)
+            return cursor.lastrowid, True
+
+    def _attach_waiter(self, conn, job_id, waiter_id):
+        """Register a waiter inside an open transaction."""
+        if waiter_id:
+            conn.execute(
+                "INSERT OR IGNORE INTO queue_job_waiters (job_id, waiter_id) VALUES (?, ?)",
+                (job_id, waiter_id)
+            )
+
+    def _typical_runtime(self, conn):
+        """Median runtime of recently finished jobs, for jobs with no size hints."""
+        rows = conn.execute(
+            "SELECT finished_at - leased_at AS runtime FROM queue_jobs "
+            "WHERE state = ? AND leased_at IS NOT NULL AND finished_at IS NOT NULL "
+            "ORDER BY id DESC LIMIT 100",
+            (STATE_DONE,)
+        ).fetchall()
+        runtimes = sorted(row['runtime'] for row in rows)
+        return runtimes[len(runtimes) // 2] if runtimes else DEFAULT_JOB_SECONDS
+
+    def _activate_tenant(self, conn, tenant):
+        """
+        Register a tenant, catching its virtual time up to the busiest
+        active tenant's minimum so idle periods do not bank credit.
+        """
+        conn.execute("INSERT OR IGNORE INTO queue_tenants (tenant) VALUES (?)", (tenant,))
+        active = conn.execute(
+            f"SELECT 1 FROM queue_jobs WHERE tenant = ? AND state IN ({_placeholders(ACTIVE_STATES)}) LIMIT 1",
+            (tenant, *ACTIVE_STATES)
+        ).fetchone()
+        if active:
+            return
+        floor = conn.execute(
+            f"""
+            SELECT MIN(vtime) FROM queue_tenants WHERE tenant IN (
+                SELECT DISTINCT tenant FROM queue_jobs WHERE state IN ({_placeholders(ACTIVE_STATES)})
+            )
+            """,
+            ACTIVE_STATES
+        ).fetchone()[0]
+        if floor is not None:
+            conn.execute(
+                "UPDATE queue_tenants SET vtime = MAX(vtime, ?) WHERE tenant = ?", (floor, tenant)
+            )
+
+    def set_tenant_weight(self, tenant, weight):
+        """
+        Give a tenant a larger (or smaller) share of the workers.
+
+        Args:
+            tenant (str): Tenant name
+            weight (float): Relative share; the default is 1
+        """
+        if weight <= 0:
+            raise ValueError("Tenant weight must be positive")
+        with self._connect(immediate=True) as conn:
+            conn.execute(
+                """
+                INSERT INTO queue_tenants (tenant, weight) VALUES (?, ?)
+                ON CONFLICT(tenant) DO UPDATE SET weight = excluded.weight
+                """,
+                (tenant, weight)
+            )
+
+    def lease(self, worker_id, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """
+        Lease the next ready job.
+
+        Within the highest ready priority class, the tenant with the least
+        weighted service goes first, and that tenant's shortest expected
+        job is picked. Jobs whose previous lease expired (e.g. the worker
+        crashed) are ready again and count as a new attempt.
+
+        Args:
+            worker_id (str): Identifier of the leasing worker
+            lease_seconds (float): Visibility timeout
+
+        Returns:
+            dict: Leased job (id, key, payload, attempts), or None if the queue is empty
+        """
+        now = time.time()
+        with self._connect(immediate=True) as conn:
+            # Expired leases whose attempts are used up fail instead of looping forever
+            conn.execute(
+                """
+                UPDATE queue_jobs SET state = ?, error = 'Lease expired too many times',
+                    updated_at = ?, finished_at = ?
+                WHERE state = ? AND lease_expires < ? AND attempts >= max_attempts
+                """,
+                (STATE_FAILED, now, now, STATE_LEASED, now)
+            )
+            # Cancelled jobs whose worker died never report back
+            conn.execute(
+                """
+                UPDATE queue_jobs SET state = ?, updated_at = ?, finished_at = ?
+                WHERE state = ? AND lease_expires < ? AND cancel_requested = 1
+                """,
+                (STATE_CANCELLED, now, now, STATE_LEASED, now)
+            )
+            ready = """
+                cancel_requested = 0 AND (
+                    (state = ? AND visible_at <= ?) OR
+                    (state = ? AND lease_expires < ?)
+                )
+            """
+            ready_args = (STATE_QUEUED, now, STATE_LEASED, now)
+            top = conn.execute(f"SELECT MIN(priority) FROM queue_jobs WHERE {ready}", ready_args).fetchone()[0]
+            if top is None:
+                return None
+
+            candidates = [
+                dict(row) for row in conn.execute(
+                    f"SELECT id, tenant, expected_cost, created_at FROM queue_jobs "
+                    f"WHERE {ready} AND priority = ?",
+                    (*ready_args, top)
+                ).fetchall()
+            ]
+            tenants = {
+                row['tenant']: row for row in conn.execute(
+                    f"SELECT tenant, weight, vtime FROM queue_tenants "
+                    f"WHERE tenant IN ({_placeholders(candidates)})",
+                    [candidate['tenant'] for candidate in candidates]
+                ).fetchall()
+            }
+            chosen = pick_next_job(
+                candidates, {name: row['vtime'] for name, row in tenants.items()}, now
+            )
+            row = conn.execute("SELECT * FROM queue_jobs WHERE id = ?", (chosen['id'],)).fetchone()
+
+            # Charge the tenant for the work it is about to receive
+            weight = tenants[row['tenant']]['weight'] if row['tenant'] in tenants else 1.0
+            conn.execute(
+                "INSERT OR IGNORE INTO queue_tenants (tenant) VALUES (?)", (row['tenant'],)
+            )
+            conn.execute(
+                "UPDATE queue_tenants SET vtime = vtime + ? WHERE tenant = ?",
+                ((row['expected_cost'] or DEFAULT_JOB_SECONDS) / weight, row['tenant'])
+            )
+            conn.execute(
+                """
+                UPDATE queue_jobs SET state = ?, lease_owner = ?, lease_expires = ?,
+                    attempts = attempts + 1, updated_at = ?, leased_at = ?,
+                    first_leased_at = COALESCE(first_leased_at, ?)
+                WHERE id = ?
+                """,
+                (STATE_LEASED, worker_id, now + lease_seconds, now, now, now, row['id'])
+            )
+
+        return {
+            'id': row['id'],
+            'key': row['key'],
+            'tenant': row['tenant'],
+            'payload': json.loads(row['payload']),
+            'expected_cost': row['expected_cost'],
+            'attempts': row['attempts'] + 1,
+        }
+
+    def heartbeat(self, job_id, worker_id, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """
+        Extend a lease held by this worker.
+
+        Raises:
+            LeaseLost: If another worker took over the job
+        """
+        now = time.time()
+        with self._connect(immediate=True) as conn:
+            updated = conn.execute(
+                "UPDATE queue_jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND state = ? AND lease_owner = ?",
+                (now + lease_seconds, now, job_id, STATE_LEASED, worker_id)
+            ).rowcount
+        if not updated:
+            raise LeaseLost(f"Lease on job {job_id} was lost")
+
+    def complete(self, job_id, worker_id):
+        """Mark a leased job as done."""
+        self._finish(job_id, worker_id, STATE_DONE)
+
+    def fail(self, job_id, worker_id, error, retry_delay=DEFAULT_RETRY_DELAY):
+        """
+        Record a failed attempt, re-queueing the job while attempts remain.
+
+        Args:
+            job_id (int): Job ID
+            worker_id (str): Worker that held the lease
+            error (str): Error description
+            retry_delay (float): Seconds before the job becomes visible again
+        """
+        now = time.time()
+        with self._connect(immediate=True) as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM queue_jobs WHERE id = ? AND lease_owner = ? AND state = ?",
+                (job_id, worker_id, STATE_LEASED)
+            ).fetchone()
+            if row is None:
+                return
+            if row['attempts'] < row['max_attempts']:
+                conn.execute(
+                    "UPDATE queue_jobs SET state = ?, lease_owner = NULL, lease_expires = NULL, "
+                    "visible_at = ?, error = ?, updated_at = ? WHERE id = ?",
+                    (STATE_QUEUED, now + retry_delay, error, now, job_id)
+                )
+            else:
+                conn.execute(
+                    "UPDATE queue_jobs SET state = ?, error = ?, updated_at = ?, finished_at = ? WHERE id = ?",
+                    (STATE_FAILED, error, now, now, job_id)
+                )
+
+    def cancelled(self, job_id, worker_id):
+        """Mark a leased job as cancelled after the worker stopped it."""
+        self._finish(job_id, worker_id, STATE_CANCELLED)
+
+    def _finish(self, job_id, worker_id, state):
+        now = time.time()
+        with self._connect(immediate=True) as conn:
+            conn.execute(
+                "UPDATE queue_jobs SET state = ?, lease_owner = NULL, lease_expires = NULL, "
+                "updated_at = ?, finished_at = ? WHERE id = ? AND lease_owner = ?",
+                (state, now, now, job_id, worker_id)
+            )
+
+    def attach(self, job_id, waiter_id):
+        """Register a session waiting on a job."""
+        with self._connect(immediate=True) as conn:
+            self._attach_waiter(conn, job_id, waiter_id)
+
+    def detach(self, job_id, waiter_id):
+        """Stop waiting on a job without cancelling it."""
+        with self._connect(immediate=True) as conn:
+            conn.execute(
+                "DELETE FROM queue_job_waiters WHERE job_id = ? AND waiter_id = ?",
+                (job_id, waiter_id)
+            )
+
+    def cancel(self, job_id, waiter_id):
+        """
+        Cancel on behalf of one waiter; the job stops only when no waiter remains.
+
+        Returns:
+            bool: True if the job as a whole was cancelled
+        """
+        now = time.time()
+        with self._connect(immediate=True) as conn:
+            conn.execute(
+                "DELETE FROM queue_job_waiters WHERE job_id = ? AND waiter_id = ?",
+                (job_id, waiter_id)
+            )
+            remaining = conn.execute(
+                "SELECT COUNT(*) FROM queue_job_waiters WHERE job_id = ?", (job_id,)
+            ).fetchone()[0]
+            if remaining:
+                return False
+            # Queued jobs are cancelled outright; leased jobs stop at the next stage
+            conn.execute(
+                "UPDATE queue_jobs SET state = ?, updated_at = ?, finished_at = ? WHERE id = ? AND state = ?",
+                (STATE_CANCELLED, now, now, job_id, STATE_QUEUED)
+            )
+            conn.execute(
+                "UPDATE queue_jobs SET cancel_requested = 1, updated_at = ? WHERE id = ? AND state = ?",
+                (now, job_id, STATE_LEASED)
+            )
+            return True
+
+    def is_cancel_requested(self, job_id):
+        """Checked by workers between pipeline stages."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT cancel_requested FROM queue_jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row['cancel_requested'])
+
+    def waiter_count(self, job_id):
+        """Number of sessions waiting on a job."""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM queue_job_waiters WHERE job_id = ?", (job_id,)
+            ).fetchone()[0]
+
+    def append_event(self, job_id, event):
+        """Record a progress event for waiters to replay."""
+        with self._connect(immediate=True) as conn:
+            conn.execute(
+                "INSERT INTO queue_job_events (job_id, event) VALUES (?, ?)",
+                (job_id, json.dumps(event))
+            )
+
+    def get_events(self, job_id, after_event_id=0):
+        """
+        Get progress events recorded after a given event ID.
+
+        Returns:
+            list: (event_id, event) tuples
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, event FROM queue_job_events WHERE job_id = ? AND id > ? ORDER BY id",
+                (job_id, after_event_id)
+            ).fetchall()
+        return [(row['id'], json.loads(row['event'])) for row in rows]
+
+    def get_job(self, job_id):
+        """Get a job's current row as a dict, or None."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM queue_jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get_latest_job(self, key):
+        """Get the most recent job for a key as a dict, or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM queue_jobs WHERE key = ? ORDER BY id DESC LIMIT 1", (key,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_stats(self):
+        """
+        Get queue depth by state.
+
+        Returns:
+            dict: state -> job count
+        """
+        with self._connect() as conn:
+            rows = conn.execute("SELECT state, COUNT(*) AS count FROM queue_jobs GROUP BY state").fetchall()
+        return {row['state']: row['count'] for row in rows}
+
+    def get_metrics(self, window_seconds=3600):
+        """
+        Get scheduling metrics for admins.
+
+        Args:
+            window_seconds (float): How far back to look for wait and run times
+
+        Returns:
+            dict: Queue depth by state and tenant, the oldest waiting job's age,
+                wait/run time percentiles, and per-tenant fair-share state
+        """
+        now = time.time()
+        since = now - window_seconds
+        with self._connect() as conn:
+            depth = {
+                row['state']: row['count'] for row in conn.execute(
+                    "SELECT state, COUNT(*) AS count FROM queue_jobs GROUP BY state"
+                ).fetchall()
+            }
+            tenants = {
+                row['tenant']: {'weight': row['weight'], 'vtime': row['vtime'], 'queued': 0, 'leased': 0}
+                for row in conn.execute("SELECT * FROM queue_tenants").fetchall()
+            }
+            for row in conn.execute(
+                f"SELECT tenant, state, COUNT(*) AS count FROM queue_jobs "
+                f"WHERE state IN ({_placeholders(ACTIVE_STATES)}) GROUP BY tenant, state",
+                ACTIVE_STATES
+            ).fetchall():
+                tenants.setdefault(row['tenant'], {'weight': 1.0, 'vtime': 0.0, 'queued': 0, 'leased': 0})
+                tenants[row['tenant']][row['state']] = row['count']
+            oldest = conn.execute(
+                "SELECT MIN(created_at) FROM queue_jobs WHERE state = ?", (STATE_QUEUED,)
+            ).fetchone()[0]
+            waits = [row[0] for row in conn.execute(
+                "SELECT first_leased_at - created_at FROM queue_jobs WHERE first_leased_at >= ?", (since,)
+            ).fetchall()]
+            runtimes = [row[0] for row in conn.execute(
+                "SELECT finished_at - leased_at FROM queue_jobs WHERE state = ? AND finished_at >= ?",
+                (STATE_DONE, since)
+            ).fetchall()]
+
+        return {
+            'depth': depth,
+            'tenants': tenants,
+            'oldest_queued_age': (now - oldest) if oldest else 0.0,
+            'wait_seconds': _percentiles(waits),
+            'run_seconds': _percentiles(runtimes),
+            'window_seconds': window_seconds,
+        }
+
+    def purge_finished(self, older_than_seconds=7 * 24 * 3600):
+        """Delete finished jobs and their events older than the given age."""
+        cutoff = time.time() - older_than_seconds
+        with self._connect(immediate=True) as conn:
+            finished = FINISHED_STATES
+            conn.execute(
+                f"DELETE FROM queue_job_events WHERE job_id IN (SELECT id FROM queue_jobs "
+                f"WHERE state IN ({_placeholders(finished)}) AND updated_at < ?)",
+                (*finished, cutoff)
+            )
+            conn.execute(
+                f"DELETE FROM queue_job_waiters WHERE job_id IN (SELECT id FROM queue_jobs "
+                f"WHERE state IN ({_placeholders(finished)}) AND updated_at < ?)",
+                (*finished, cutoff)
+            )
+            conn.execute(
+                f"DELETE FROM queue_jobs WHERE state IN ({_placeholders(finished)}) AND updated_at < ?",
+                (*finished, cutoff)
+            )
+
+
+class QueueReporter:
+    """Pipeline progress reporter that records events in the job queue."""
+
+    def __init__(self, queue, job_id):
+        self.queue = queue
+        self.job_id = job_id
+
+    def status(self, step, total_steps, message):
+        """Record a pipeline step transition."""
+        self.queue.append_event(self.job_id, ['status', step, total_steps, message])
+
+    def notify(self, level, message):
+        """Record a status message."""
+        self.queue.append_event(self.job_id, ['notify', level, message])
+
+
+class QueuedJob:
+    """
+    Session-side view of a queued job with the same interface as
+    ProcessingJob, so the UI can follow either the same way.
+    """
+
+    _STATE_MAP = {
+        STATE_QUEUED: JOB_RUNNING,
+        STATE_LEASED: JOB_RUNNING,
+        STATE_DONE: JOB_SUCCEEDED,
+        STATE_FAILED: JOB_FAILED,
+        STATE_CANCELLED: JOB_CANCELLED,
+    }
+
+    def __init__(self, queue, job_id, key, result_loader=None):
+        """
+        Args:
+            queue (JobQueue): Queue holding the job
+            job_id (int): Queue job ID
+            key (str): Normalized YouTube video ID
+            result_loader (callable, optional): Loads the finished video data
+        """
+        self.queue = queue
+        self.queue_job_id = job_id
+        self.job_id = f"queue-{job_id}"
+        self.key = key
+        self._result_loader = result_loader
+        self._result = None
+        self.state = JOB_RUNNING
+        self.error = None
+        self._last_event_id = 0
+        self._refresh()
+
+    def _refresh(self):
+        row = self.queue.get_job(self.queue_job_id)
+        if row is None:
+            self.state, self.error = JOB_FAILED, "Job no longer exists"
+            return
+        self.state = self._STATE_MAP.get(row['state'], JOB_RUNNING)
+        self.error = row['error']
+
+    @property
+    def done(self):
+        return self.state != JOB_RUNNING
+
+    @property
+    def result(self):
+        if self._result is None and self.state == JOB_SUCCEEDED and self._result_loader:
+            self._result = self._result_loader(self.key)
+        return self._result
+
+    @property
+    def waiter_count(self):
+        return self.queue.waiter_count(self.queue_job_id)
+
+    def attach(self, waiter_id):
+        self.queue.attach(self.queue_job_id, waiter_id)
+
+    def detach(self, waiter_id):
+        self.queue.detach(self.queue_job_id, waiter_id)
+
+    def cancel(self, waiter_id):
+        return self.queue.cancel(self.queue_job_id, waiter_id)
+
+    def wait_for_events(self, cursor, timeout=None):
+        """
+        Poll for new progress events (same contract as ProcessingJob).
+
+        Returns:
+            tuple: (new_events, new_cursor, done)
+        """
+        events = self.queue.get_events(self.queue_job_id, self._last_event_id)
+        if not events:
+            self._refresh()
+            if not self.done and timeout:
+                time.sleep(timeout)
+                events = self.queue.get_events(self.queue_job_id, self._last_event_id)
+        if events:
+            self._last_event_id = events[-1][0]
+        self._refresh()
+        return [event for _event_id, event in events], cursor + len(events), self.done
+
+
+def _placeholders(values):
+    """SQL placeholder list for an IN clause."""
+    return ", ".join("?" for _ in values)
+
+
+def _percentiles(values):
+    """Count, p50, p95 and max of a list of durations in seconds."""
+    if not values:
+        return {'count': 0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+    ordered = sorted(values)
+
+    def at(fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return {'count': len(ordered), 'p50': at(0.5), 'p95': at(0.95), 'max': ordered[-1]}
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """
+    Get the shared job queue for this process.
+
+    Returns:
+        JobQueue: Shared queue instance
+    """
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
+
+
+def use_worker_queue():
+    """
+    Whether processing is handed to worker processes instead of run in the UI process.
+
+    Enabled with KLIPIFY_PROCESSING_MODE=queue.
+
+    Returns:
+        bool: True when jobs should go through the durable queue
+    """
+    return os.getenv("KLIPIFY_PROCESSING_MODE", "inline").lower() == "queue"
+
+
+def main(argv=None):
+    """Command-line entry point for queue administration."""
+    import argparse
+
+    from .scheduler import ResourcePools
+
+    parser = argparse.ArgumentParser(description="Inspect the Klipify processing queue.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    stats_parser = subparsers.add_parser("stats", help="Show queue depth, wait times and pool usage")
+    stats_parser.add_argument("--window", type=float, default=3600, help="Seconds of history to include")
+    weight_parser = subparsers.add_parser("weight", help="Set a tenant's fair-share weight")
+    weight_parser.add_argument("tenant")
+    weight_parser.add_argument("weight", type=float)
+    subparsers.add_parser("purge", help="Delete finished jobs older than a week")
+    args = parser.parse_args(argv)
+
+    queue = get_job_queue()
+    if args.command == "weight":
+        queue.set_tenant_weight(args.tenant, args.weight)
+        print(f"Tenant {args.tenant} weight set to {args.weight}")
+    elif args.command == "purge":
+        queue.purge_finished()
+        print("Finished jobs purged")
+    else:
+        print(json.dumps({
+            'queue': queue.get_metrics(args.window),
+            'pools': ResourcePools(queue.db_path).get_stats(),
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
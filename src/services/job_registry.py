@@ -0,0 +1,305 @@
+"""
+Processing Job Registry for Klipify
+Single-flight coalescing of concurrent processing requests for the same video.
+
+The first submitter for a YouTube ID starts a background job; later
+submitters attach to it, replay its progress events and open the same
+result instead of re-running uploads and Gemini calls. Finished jobs keep
+only their key; results are opened through a loader (normally the shared
+artifact cache), so the registry never holds a second copy of a video.
+"""
+
+import threading
+import time
+import uuid
+
+from .tracing import propagate
+
+
+# Job states
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+# How long finished jobs stay joinable by late submitters (seconds)
+DEFAULT_COMPLETED_TTL = 600
+
+
+class ProcessingCancelled(Exception):
+    """Raised inside a job when every waiter has cancelled it."""
+
+
+class ProcessingJob:
+    """
+    One in-flight processing run that any number of sessions can follow.
+
+    The job doubles as the pipeline's progress reporter: status() and
+    notify() record events that waiters replay in their own pages.
+    """
+
+    def __init__(self, key, result_loader=None):
+        """
+        Args:
+            key (str): Normalized YouTube video ID
+            result_loader (callable, optional): Opens the finished result by key
+        """
+        self.key = key
+        self.job_id = uuid.uuid4().hex
+        self.state = JOB_RUNNING
+        self.error = None
+        self._result_loader = result_loader
+        self.events = []
+        self.created_at = time.time()
+        self.finished_at = None
+        self._waiters = set()
+        self._cancel_requested = False
+        # Set once the pipeline has seen the cancel request and is stopping
+        self._cancel_observed = False
+        self._condition = threading.Condition()
+
+    # Progress reporting (called from the job's worker thread)
+
+    def status(self, step, total_steps, message):
+        """Record a pipeline step transition."""
+        self._publish(('status', step, total_steps, message))
+
+    def notify(self, level, message):
+        """Record a status message ('info', 'success', 'warning', 'error')."""
+        self._publish(('notify', level, message))
+
+    def _publish(self, event):
+        with self._condition:
+            self.events.append(event)
+            self._condition.notify_all()
+
+    # Waiter side (called from session threads)
+
+    @property
+    def done(self):
+        """True once the job succeeded, failed or was cancelled."""
+        return self.state != JOB_RUNNING
+
+    @property
+    def result(self):
+        """
+        Open the finished result for the caller.
+
+        Each access opens it anew (e.g. a fresh artifact cache handle owned
+        by the caller); None until the job has succeeded.
+        """
+        if self.state != JOB_SUCCEEDED or not self._result_loader:
+            return None
+        return self._result_loader(self.key)
+
+    def attach(self, waiter_id):
+        """
+        Register a waiter following this job.
+
+        A pending cancel request is withdrawn, since the job has a waiter
+        again. A job that has already started stopping cannot be revived.
+
+        Args:
+            waiter_id (str): Identifier of the following session
+
+        Returns:
+            bool: False if the job is already stopping and was not joined
+        """
+        with self._condition:
+            if self._cancel_observed:
+                return False
+            self._waiters.add(waiter_id)
+            self._cancel_requested = False
+            return True
+
+    def detach(self, waiter_id):
+        """
+        Stop following the job without cancelling it; the result is still
+        persisted for everyone else.
+
+        Args:
+            waiter_id (str): Identifier of the following session
+        """
+        with self._condition:
+            self._waiters.discard(waiter_id)
+
+    def cancel(self, waiter_id):
+        """
+        Cancel on behalf of one waiter.
+
+        The job itself is only cancelled once no other waiter is attached,
+        so one learner cancelling never aborts another learner's run.
+
+        Args:
+            waiter_id (str): Identifier of the cancelling session
+
+        Returns:
+            bool: True if the job as a whole was asked to stop
+        """
+        with self._condition:
+            self._waiters.discard(waiter_id)
+            if not self._waiters and not self.done:
+                self._cancel_requested = True
+            return self._cancel_requested
+
+    def is_cancel_requested(self):
+        """Checked by the pipeline between stages; a True answer is final."""
+        with self._condition:
+            if self._cancel_requested:
+                self._cancel_observed = True
+            return self._cancel_requested
+
+    @property
+    def waiter_count(self):
+        """Number of sessions currently following the job."""
+        with self._condition:
+            return len(self._waiters)
+
+    def wait_for_events(self, cursor, timeout=None):
+        """
+        Block until new events arrive or the job finishes.
+
+        Args:
+            cursor (int): Number of events already consumed
+            timeout (float, optional): Maximum seconds to wait
+
+        Returns:
+            tuple: (new_events, new_cursor, done)
+        """
+        with self._condition:
+            if cursor >= len(self.events) and not self.done:
+                self._condition.wait(timeout)
+            new_events = self.events[cursor:]
+            return new_events, cursor + len(new_events), self.done
+
+    def wait(self, timeout=None):
+        """
+        Block until the job finishes.
+
+        Returns:
+            bool: True if the job finished within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while not self.done:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def _finish(self, state, error=None):
+        with self._condition:
+            self.state = state
+            self.error = error
+            self.finished_at = time.time()
+            self._condition.notify_all()
+
+
+class JobRegistry:
+    """In-flight job registry keyed by normalized YouTube ID."""
+
+    def __init__(self, completed_ttl=DEFAULT_COMPLETED_TTL):
+        """
+        Args:
+            completed_ttl (float): Seconds finished jobs remain joinable
+        """
+        self.completed_ttl = completed_ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, run, waiter_id, result_loader=None):
+        """
+        Start a job for key or attach to the one already running.
+
+        Args:
+            key (str): Normalized YouTube video ID
+            run (callable): run(job); executed on a background thread only
+                when no joinable job exists. Its return value is discarded;
+                it must leave the result where result_loader finds it
+            waiter_id (str): Identifier of the submitting session
+            result_loader (callable, optional): result_loader(key) opens the
+                finished result for each waiter
+
+        Returns:
+            tuple: (job, started) where started is True if this call started it
+        """
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(key)
+            # A job that is already stopping for a cancel is replaced, not joined
+            if job is not None and job.state in (JOB_RUNNING, JOB_SUCCEEDED) and job.attach(waiter_id):
+                return job, False
+
+            job = ProcessingJob(key, result_loader)
+            job.attach(waiter_id)
+            self._jobs[key] = job
+
+        # The job runs in the submitter's trace context, if it is being traced
+        thread = threading.Thread(
+            target=propagate(self._execute), args=(job, run),
+            name=f"klipify-job-{key}", daemon=True
+        )
+        thread.start()
+        return job, True
+
+    def get(self, key):
+        """
+        Get the current or recently finished job for a key.
+
+        Args:
+            key (str): Normalized YouTube video ID
+
+        Returns:
+            ProcessingJob or None
+        """
+        with self._lock:
+            self._prune()
+            return self._jobs.get(key)
+
+    def _execute(self, job, run):
+        """Run a job and record its outcome; failed jobs are not reused."""
+        try:
+            run(job)
+        except ProcessingCancelled:
+            job._finish(JOB_CANCELLED, error="Processing was cancelled")
+            self._forget(job)
+        except Exception as e:
+            job._finish(JOB_FAILED, error=str(e))
+            self._forget(job)
+        else:
+            job._finish(JOB_SUCCEEDED)
+
+    def _forget(self, job):
+        """Remove a job so the next submitter starts fresh."""
+        with self._lock:
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+
+    def _prune(self):
+        """Drop finished jobs older than the completed TTL (lock held)."""
+        now = time.time()
+        expired = [
+            key for key, job in self._jobs.items()
+            if job.done and job.finished_at is not None and now - job.finished_at > self.completed_ttl
+        ]
+        for key in expired:
+            del self._jobs[key]
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_job_registry():
+    """
+    Get the process-wide job registry.
+
+    Returns:
+        JobRegistry: Shared registry instance
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = JobRegistry()
+        return _registry
@@ -0,0 +1,385 @@
+"""
+Library Search Index for Klipify
+Persistent SQLite FTS5 index over transcripts, notes and concepts of every processed video.
+
+Usage:
+    python -m src.services.library_index rebuild
+    python -m src.services.library_index search "gradient descent"
+"""
+
+import html
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from ..utils.helpers import create_youtube_link, get_data_dir
+from ..utils.transcript import as_compact_transcript
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS library_videos (
+    youtube_id TEXT PRIMARY KEY,
+    videodb_id TEXT,
+    title TEXT,
+    indexed_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS library_entries (
+    id INTEGER PRIMARY KEY,
+    youtube_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    start REAL NOT NULL DEFAULT 0,
+    label TEXT,
+    content TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_library_entries_video ON library_entries(youtube_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS library_fts USING fts5(
+    content,
+    content='library_entries',
+    content_rowid='id',
+    tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS library_entries_ai AFTER INSERT ON library_entries BEGIN
+    INSERT INTO library_fts(rowid, content) VALUES (new.id, new.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_entries_ad AFTER DELETE ON library_entries BEGIN
+    INSERT INTO library_fts(library_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+"""
+
+# Entry kinds stored in the index
+KIND_TRANSCRIPT = 'transcript'
+KIND_NOTES = 'notes'
+KIND_CONCEPT = 'concept'
+
+# Transcript segments are merged into windows of roughly this many seconds so
+# hits carry enough context and the index stays compact
+_TRANSCRIPT_WINDOW_SECONDS = 30
+
+_NOTES_LINK_TIME = re.compile(r'[?&]t=(\d+)s')
+# [MM:SS] or [H:MM:SS], optionally prefixed with the link emoji
+_NOTES_TIMESTAMP = re.compile(r'\[(?:🔗\s*)?(?:(\d{1,2}):)?(\d{1,3}):(\d{2})\]')
+_NOTES_LINK = re.compile(r'\[[^\]]*\]\([^)]*\)')
+_QUERY_TOKEN = re.compile(r'\w+\*?', re.UNICODE)
+
+
+class LibraryIndex:
+    """Cross-video full-text search backed by SQLite FTS5."""
+
+    _init_lock = threading.Lock()
+    _initialized_paths = set()
+
+    def __init__(self, db_path=None):
+        """
+        Initialize the library index.
+
+        Args:
+            db_path (str, optional): SQLite database path (defaults to the data directory)
+        """
+        self.db_path = db_path or os.path.join(get_data_dir(), "library.db")
+        self._ensure_schema()
+
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection; SQLite handles cross-session locking."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.row_factory = sqlite3.Row
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _ensure_schema(self):
+        """Create tables on first use of a database file."""
+        with self._init_lock:
+            if self.db_path in self._initialized_paths:
+                return
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+            self._initialized_paths.add(self.db_path)
+
+    def index_video(self, video_data, title=None):
+        """
+        Add or replace a processed video's transcript, notes and concepts.
+
+        Args:
+            video_data (dict): Processed video data from the pipeline
+            title (str, optional): Display title for the video
+
+        Returns:
+            int: Number of entries indexed
+        """
+        youtube_id = video_data.get('youtube_id')
+        if not youtube_id:
+            raise ValueError("Cannot index a video without a YouTube ID")
+
+        entries = list(_transcript_entries(video_data.get('transcript_segments')))
+        entries.extend(_notes_entries(video_data.get('notes', '')))
+        entries.extend(_concept_entries(video_data.get('concepts', []), video_data.get('clips', [])))
+
+        with self._connect() as conn:
+            conn.execute("DELETE FROM library_entries WHERE youtube_id = ?", (youtube_id,))
+            conn.executemany(
+                "INSERT INTO library_entries (youtube_id, kind, start, label, content) VALUES (?, ?, ?, ?, ?)",
+                [(youtube_id, kind, start, label, content) for kind, start, label, content in entries]
+            )
+            conn.execute(
+                """
+                INSERT INTO library_videos (youtube_id, videodb_id, title, indexed_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(youtube_id) DO UPDATE SET
+                    videodb_id = COALESCE(excluded.videodb_id, videodb_id),
+                    title = COALESCE(excluded.title, title),
+                    indexed_at = excluded.indexed_at
+                """,
+                (
+                    youtube_id,
+                    video_data.get('videodb_id'),
+                    title or video_data.get('title'),
+                    datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                )
+            )
+
+        return len(entries)
+
+    def remove_video(self, youtube_id):
+        """
+        Remove all entries for a video.
+
+        Args:
+            youtube_id (str): YouTube video ID
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM library_entries WHERE youtube_id = ?", (youtube_id,))
+            conn.execute("DELETE FROM library_videos WHERE youtube_id = ?", (youtube_id,))
+
+    def search(self, query, limit=20, offset=0, kinds=None):
+        """
+        Ranked full-text search across all indexed videos.
+
+        Args:
+            query (str): User search text (``word*`` for prefixes)
+            limit (int): Maximum results to return
+            offset (int): Results to skip (for pagination)
+            kinds (list, optional): Restrict to entry kinds (transcript/notes/concept)
+
+        Returns:
+            list: Result dicts with youtube_id, title, kind, start, label, snippet
+                (HTML-escaped, hits wrapped in <mark>), score and link
+        """
+        match_query = build_match_query(query)
+        if not match_query:
+            return []
+
+        sql = """
+            SELECT e.youtube_id, v.title, e.kind, e.start, e.label,
+                   snippet(library_fts, 0, char(2), char(3), '…', 16) AS snippet,
+                   bm25(library_fts) AS score
+            FROM library_fts
+            JOIN library_entries e ON e.id = library_fts.rowid
+            LEFT JOIN library_videos v ON v.youtube_id = e.youtube_id
+            WHERE library_fts MATCH ?
+        """
+        params = [match_query]
+        if kinds:
+            sql += f" AND e.kind IN ({', '.join('?' for _ in kinds)})"
+            params.extend(kinds)
+        sql += " ORDER BY score LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        return [
+            {
+                'youtube_id': row['youtube_id'],
+                'title': row['title'] or row['youtube_id'],
+                'kind': row['kind'],
+                'start': row['start'],
+                'label': row['label'],
+                'snippet': _snippet_html(row['snippet']),
+                'score': -row['score'],
+                'link': create_youtube_link(row['youtube_id'], row['start']),
+            }
+            for row in rows
+        ]
+
+    def get_stats(self):
+        """
+        Get index size statistics.
+
+        Returns:
+            dict: Video and entry counts plus database size in bytes
+        """
+        with self._connect() as conn:
+            videos = conn.execute("SELECT COUNT(*) FROM library_videos").fetchone()[0]
+            entries = conn.execute("SELECT COUNT(*) FROM library_entries").fetchone()[0]
+
+        size = sum(
+            os.path.getsize(path) for path in (self.db_path, f"{self.db_path}-wal")
+            if os.path.exists(path)
+        )
+        return {'videos': videos, 'entries': entries, 'size_bytes': size}
+
+    def rebuild(self):
+        """Rebuild the FTS index from the entries table, then compact it."""
+        with self._connect() as conn:
+            conn.execute("INSERT INTO library_fts(library_fts) VALUES ('rebuild')")
+        self.optimize()
+
+    def optimize(self):
+        """Merge FTS segments and vacuum the database file."""
+        with self._connect() as conn:
+            conn.execute("INSERT INTO library_fts(library_fts) VALUES ('optimize')")
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+
+
+def build_match_query(query):
+    """
+    Convert free text into a safe FTS5 MATCH expression.
+
+    Each word is quoted so FTS5 operators in user input are treated as text;
+    a trailing ``*`` is kept as a prefix query.
+
+    Args:
+        query (str): User search text
+
+    Returns:
+        str: FTS5 query, or empty string if there is nothing to search
+    """
+    terms = []
+    for token in _QUERY_TOKEN.findall(query or ""):
+        if token.endswith('*'):
+            terms.append(f'"{token[:-1]}"*')
+        else:
+            terms.append(f'"{token}"')
+    return " ".join(terms)
+
+
+def _snippet_html(snippet):
+    """Escape an FTS5 snippet for HTML, turning hit markers into <mark> tags."""
+    escaped = html.escape(snippet or "")
+    return escaped.replace('\x02', '<mark>').replace('\x03', '</mark>')
+
+
+def _transcript_entries(transcript_segments):
+    """Yield transcript windows as (kind, start, label, content)."""
+    transcript = as_compact_transcript(transcript_segments)
+    window_start = None
+    window_text = []
+
+    for start, end, text in transcript.iter_rows():
+        if window_start is None:
+            window_start = start
+        window_text.append(text)
+        if end - window_start >= _TRANSCRIPT_WINDOW_SECONDS:
+            yield KIND_TRANSCRIPT, window_start, None, " ".join(window_text)
+            window_start = None
+            window_text = []
+
+    if window_text:
+        yield KIND_TRANSCRIPT, window_start, None, " ".join(window_text)
+
+
+def _notes_entries(notes):
+    """Yield markdown notes sections as (kind, start, label, content)."""
+    if not notes:
+        return
+
+    sections = re.split(r'\n(?=#{1,6}\s)', notes)
+    last_start = 0
+    for section in sections:
+        section = section.strip()
+        if not section:
+            continue
+
+        heading = _NOTES_LINK.sub('', section.splitlines()[0]).lstrip('#').strip()
+        start = _find_notes_timestamp(section)
+        if start is None:
+            start = last_start
+        last_start = start
+        yield KIND_NOTES, start, heading[:120], section
+
+
+def _find_notes_timestamp(section):
+    """Return the first timestamp (seconds) referenced in a notes section."""
+    link_match = _NOTES_LINK_TIME.search(section)
+    if link_match:
+        return float(link_match.group(1))
+
+    timestamp_match = _NOTES_TIMESTAMP.search(section)
+    if timestamp_match:
+        hours, minutes, seconds = timestamp_match.groups()
+        return float(int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds))
+
+    return None
+
+
+def _concept_entries(concepts, clips):
+    """Yield concepts as (kind, start, label, content), using clip start times."""
+    clip_starts = {clip.get('concept'): clip.get('start_time', 0) for clip in clips or []}
+    for concept in concepts or []:
+        yield KIND_CONCEPT, float(clip_starts.get(concept, 0) or 0), concept, concept
+
+
+def get_library_index():
+    """
+    Get the shared library index, or None if it cannot be opened.
+
+    Returns:
+        LibraryIndex or None
+    """
+    try:
+        return LibraryIndex()
+    except sqlite3.Error:
+        return None
+
+
+def main(argv=None):
+    """Command-line entry point for index maintenance."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Klipify library search index maintenance")
+    parser.add_argument("--db", help="SQLite database path (defaults to the data directory)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("rebuild", help="Rebuild the FTS index and compact the database")
+    subparsers.add_parser("optimize", help="Merge FTS segments and vacuum the database")
+    subparsers.add_parser("stats", help="Show index statistics")
+    search_parser = subparsers.add_parser("search", help="Run a search query")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--limit", type=int, default=10)
+
+    args = parser.parse_args(argv)
+    index = LibraryIndex(args.db)
+
+    if args.command == "rebuild":
+        index.rebuild()
+        print(f"Rebuilt library index: {index.get_stats()}")
+    elif args.command == "optimize":
+        index.optimize()
+        print(f"Optimized library index: {index.get_stats()}")
+    elif args.command == "stats":
+        print(index.get_stats())
+    elif args.command == "search":
+        for result in index.search(args.query, limit=args.limit):
+            print(f"{result['score']:.2f}  {result['title']}  [{result['kind']}]  {result['link']}")
+            print(f"      {result['snippet']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+"""
+Local Summarizer for Klipify
+Extractive summaries, notes and key concepts computed without Gemini.
+
+Used when Gemini is over quota or misses a stage deadline. The summary and
+notes rank transcript sentences with TextRank over TF-IDF sentence vectors; the
+concepts are RAKE candidate phrases re-scored by TF-IDF across one-minute
+transcript windows, so they are phrases actually spoken in the video and
+work as clip search queries. Both are vectorized with NumPy and take well
+under a second on multi-hour transcripts.
+"""
+
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+from ..utils.helpers import format_timestamp
+from ..utils.transcript import as_compact_transcript
+
+
+# Transcript windows treated as documents for IDF
+WINDOW_SECONDS = 60.0
+
+# Transcripts without punctuation are cut into sentences of at most this many words
+MAX_SENTENCE_WORDS = 40
+MIN_SENTENCE_WORDS = 5
+
+# Longer transcripts are ranked as passages of adjacent sentences, keeping
+# the similarity matrix small
+MAX_RANKED_UNITS = 1500
+MAX_VOCABULARY = 4000
+
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_ITERATIONS = 50
+TEXTRANK_TOLERANCE = 1e-6
+# Sentences this similar to one already in the summary are left out
+REDUNDANT_SIMILARITY = 0.8
+
+MAX_PHRASE_WORDS = 4
+# A phrase is left to the longer phrase that accounts for this share of its uses
+NESTED_SHARE = 0.5
+DEFAULT_CONCEPT_COUNT = 8
+
+# English stopwords plus classroom filler that never makes a useful concept
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are aren't as at be because been
+before being below between both but by can can't cannot could couldn't did didn't do does
+doesn't doing don't down during each either else even ever every few for from further get
+gets getting go goes going gonna got had hadn't has hasn't have haven't having he he'd he'll
+he's her here here's hers herself him himself his how how's however i i'd i'll i'm i've if in
+into is isn't it it's its itself just kind know let let's like lot lots made make makes many
+may maybe me might more most much must mustn't my myself need needs next no nor not now of
+off okay on once one only or other ought our ours ourselves out over own pretty quite rather
+really right said same say says see seen shall shan't she she'd she'll she's should shouldn't
+so some something such sure take than that that's the their theirs them themselves then there
+there's these they they'd they'll they're they've thing things think this those though
+through thus to today too two under until up upon us use used using very want wanna was
+wasn't way we we'd we'll we're we've well were weren't what what's when when's where where's
+whether which while who who's whom why why's will with within without won't would wouldn't
+yeah yes yet you you'd you'll you're you've your yours yourself yourselves
+actually basically behind confuse discuss example explain idea key look matters mean means
+mistake moving notice remember review sense start starts summarize talk together
+""".split())
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9'+-]*")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+# Phrase boundaries for RAKE: punctuation other than in-word apostrophes and hyphens
+_PHRASE_BREAK = re.compile(r"[^\w\s'+-]+")
+
+
+def tokenize(text):
+    """
+    Lowercase word tokens of a text.
+
+    Args:
+        text (str): Any text
+
+    Returns:
+        list: Word tokens
+    """
+    return _WORD.findall((text or "").lower())
+
+
+def split_sentences(transcript_segments):
+    """
+    Join transcript segments into timestamped sentences.
+
+    Sentences end at . ! or ?; unpunctuated transcripts are cut every
+    MAX_SENTENCE_WORDS words.
+
+    Args:
+        transcript_segments: Transcript segments (list of dicts or CompactTranscript)
+
+    Returns:
+        list: (start_seconds, sentence_text) tuples in time order
+    """
+    sentences = []
+    words = []
+    started_at = None
+
+    def flush():
+        if words:
+            sentences.append((started_at, " ".join(words)))
+            words.clear()
+
+    for segment in as_compact_transcript(transcript_segments):
+        for piece_index, piece in enumerate(_SENTENCE_END.split(segment['text'] or "")):
+            if piece_index:
+                flush()
+            for word in piece.split():
+                if not words:
+                    started_at = segment['start']
+                words.append(word)
+                if len(words) >= MAX_SENTENCE_WORDS:
+                    flush()
+            # A segment may end exactly at a sentence boundary
+            if words and words[-1][-1] in ".!?":
+                flush()
+    flush()
+    return sentences
+
+
+def _tfidf_matrix(documents):
+    """
+    L2-normalized TF-IDF rows for tokenized documents.
+
+    Args:
+        documents (list): Token lists
+
+    Returns:
+        numpy.ndarray: (documents, vocabulary) matrix; the vocabulary is the
+            MAX_VOCABULARY content words found in the most documents
+    """
+    document_frequency = Counter()
+    for tokens in documents:
+        document_frequency.update({token for token in tokens if token not in STOPWORDS and len(token) > 2})
+    vocabulary = {
+        term: column for column, (term, _) in enumerate(document_frequency.most_common(MAX_VOCABULARY))
+    }
+
+    counts = np.zeros((len(documents), max(len(vocabulary), 1)), dtype=np.float32)
+    for row, tokens in enumerate(documents):
+        for token in tokens:
+            column = vocabulary.get(token)
+            if column is not None:
+                counts[row, column] += 1.0
+
+    frequency = (counts > 0).sum(axis=0)
+    idf = np.log((1.0 + len(documents)) / (1.0 + frequency)) + 1.0
+    weights = np.log1p(counts) * idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    return weights / np.maximum(norms, 1e-12)
+
+
+def textrank(vectors):
+    """
+    Rank documents by centrality in their cosine-similarity graph.
+
+    Args:
+        vectors (numpy.ndarray): L2-normalized document rows (see _tfidf_matrix)
+
+    Returns:
+        numpy.ndarray: One score per document (sums to 1)
+    """
+    count = len(vectors)
+    if count == 0:
+        return np.zeros(0)
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+
+    # Row-stochastic transitions; documents with no neighbours jump anywhere
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    transitions = np.where(out_weight > 0, similarity / np.maximum(out_weight, 1e-12), 1.0 / count)
+
+    scores = np.full(count, 1.0 / count)
+    for _ in range(TEXTRANK_ITERATIONS):
+        updated = (1.0 - TEXTRANK_DAMPING) / count + TEXTRANK_DAMPING * (transitions.T @ scores)
+        converged = np.abs(updated - scores).sum() < TEXTRANK_TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def _ranked_units(sentences):
+    """Group sentences into at most MAX_RANKED_UNITS passages of adjacent sentences."""
+    group = max(1, math.ceil(len(sentences) / MAX_RANKED_UNITS))
+    if group == 1:
+        return sentences
+    return [
+        (sentences[i][0], " ".join(text for _, text in sentences[i:i + group]))
+        for i in range(0, len(sentences), group)
+    ]
+
+
+def _shorten(text, max_words=MAX_SENTENCE_WORDS):
+    """Trim text to a number of words."""
+    words = text.split()
+    if len(words) <= max_words:
+        return text
+    return " ".join(words[:max_words]) + "…"
+
+
+def _long_sentences(transcript_segments):
+    """Timestamped sentences long enough to stand on their own."""
+    return [
+        (start, text) for start, text in split_sentences(transcript_segments)
+        if len(text.split()) >= MIN_SENTENCE_WORDS
+    ]
+
+
+def _central_units(sentences, count):
+    """
+    Rank sentences by TextRank and pick the most central ones.
+
+    Returns:
+        tuple: (units, chosen) where chosen indexes units, best first,
+            skipping near-repeats of units already chosen
+    """
+    units = _ranked_units(sentences)
+    vectors = _tfidf_matrix([tokenize(text) for _, text in units])
+    scores = textrank(vectors)
+
+    chosen = []
+    for index in np.argsort(-scores, kind="stable"):
+        if len(chosen) >= count:
+            break
+        if chosen and float((vectors[chosen] @ vectors[index]).max()) > REDUNDANT_SIMILARITY:
+            continue
+        chosen.append(int(index))
+    return units, chosen
+
+
+def extractive_summary(transcript_segments, max_points=None, concepts=None):
+    """
+    Build a Markdown summary from the most central transcript sentences.
+
+    Args:
+        transcript_segments: Transcript segments (list of dicts or CompactTranscript)
+        max_points (int, optional): Key moments to list after the overview;
+            defaults to one per five minutes of video, between 5 and 10
+        concepts (list, optional): Key concepts to list as main topics
+
+    Returns:
+        str: Markdown summary with timestamped key points
+    """
+    sentences = _long_sentences(transcript_segments)
+    if not sentences:
+        return "No summary available: the transcript is too short."
+
+    if max_points is None:
+        duration = sentences[-1][0] or 0
+        max_points = min(10, max(5, int(duration // 300)))
+    units, chosen = _central_units(sentences, max_points + 2)
+
+    # The two most central open the summary; the rest follow in spoken order
+    overview = [_shorten(units[i][1]) for i in chosen[:2]]
+    key_points = [units[i] for i in sorted(chosen[2:])]
+
+    lines = ["**Overview**", "", " ".join(overview)]
+    if key_points:
+        lines += ["", "**Key moments**", ""]
+        lines += [f"- **[{format_timestamp(start)}]** {_shorten(text)}" for start, text in key_points]
+    if concepts:
+        lines += ["", "**Main topics**", ""]
+        lines += [f"- {concept}" for concept in concepts]
+    return "\n".join(lines)
+
+
+def extractive_notes(transcript_segments, max_points=None):
+    """
+    Build Markdown study notes from the most central transcript sentences.
+
+    Args:
+        transcript_segments: Transcript segments (list of dicts or CompactTranscript)
+        max_points (int, optional): Points to list; defaults to one per two
+            minutes of transcript, between 3 and 8
+
+    Returns:
+        str: Markdown bullet points led by [MM:SS] timestamps, in spoken order
+    """
+    sentences = _long_sentences(transcript_segments)
+    if not sentences:
+        return "- No notes available: this part of the transcript is too short."
+
+    if max_points is None:
+        span = sentences[-1][0] - sentences[0][0]
+        max_points = min(8, max(3, int(span // 120)))
+    units, chosen = _central_units(sentences, max_points)
+    return "\n".join(f"- [{format_timestamp(units[i][0])}] {_shorten(units[i][1])}" for i in sorted(chosen))
+
+
+def _candidate_phrases(text):
+    """Split text into RAKE candidate phrases at stopwords and punctuation."""
+    phrases = []
+    for chunk in _PHRASE_BREAK.split((text or "").lower()):
+        phrase = []
+        for token in _WORD.findall(chunk):
+            if token in STOPWORDS or len(token) < 3 or token.isdigit():
+                if phrase:
+                    phrases.append(tuple(phrase))
+                phrase = []
+            else:
+                phrase.append(token)
+        if phrase:
+            phrases.append(tuple(phrase))
+    return phrases
+
+
+def _transcript_windows(transcript_segments):
+    """Concatenate segment text into WINDOW_SECONDS windows."""
+    windows = {}
+    for segment in as_compact_transcript(transcript_segments):
+        windows.setdefault(int(segment['start'] // WINDOW_SECONDS), []).append(segment['text'] or "")
+    return [" ".join(texts) for _, texts in sorted(windows.items())]
+
+
+def extract_keyphrases(transcript_segments, limit=DEFAULT_CONCEPT_COUNT):
+    """
+    Pick key concepts as the best RAKE phrases, weighted by TF-IDF.
+
+    RAKE scores words by how much of their use is inside multi-word
+    phrases; TF-IDF across transcript windows favours phrases that recur
+    but are concentrated in part of the video rather than spread evenly
+    like filler. A phrase mostly spoken as part of a longer one gives way
+    to the longer one.
+
+    Args:
+        transcript_segments: Transcript segments (list of dicts or CompactTranscript)
+        limit (int): Maximum number of concepts
+
+    Returns:
+        list: Title-cased concept phrases, best first
+    """
+    windows = [_candidate_phrases(text) for text in _transcript_windows(transcript_segments)]
+
+    # RAKE word scores: degree (co-occurring words, itself included) over frequency
+    word_frequency = Counter()
+    word_degree = Counter()
+    for window in windows:
+        for phrase in window:
+            for word in phrase:
+                word_frequency[word] += 1
+                word_degree[word] += len(phrase)
+    word_score = {word: word_degree[word] / count for word, count in word_frequency.items()}
+
+    # Every sub-phrase of a candidate, up to MAX_PHRASE_WORDS words, is counted
+    # too, so a concept scores wherever it is spoken, not only where it
+    # stands alone between stopwords
+    windows = [
+        [
+            phrase[i:j] for phrase in window for i in range(len(phrase))
+            for j in range(i + 1, min(len(phrase), i + MAX_PHRASE_WORDS) + 1)
+        ]
+        for window in windows
+    ]
+    phrase_ids = {}
+    for window in windows:
+        for phrase in window:
+            phrase_ids.setdefault(phrase, len(phrase_ids))
+    if not phrase_ids:
+        return []
+    phrases = list(phrase_ids)
+
+    # Occurrences and windows containing each phrase, as flat index arrays
+    occurrences = np.fromiter(
+        (phrase_ids[phrase] for window in windows for phrase in window), dtype=np.int64
+    )
+    distinct = np.fromiter(
+        (phrase_ids[phrase] for window in windows for phrase in set(window)), dtype=np.int64
+    )
+    term_frequency = np.bincount(occurrences, minlength=len(phrases)).astype(np.float64)
+    document_frequency = np.bincount(distinct, minlength=len(phrases))
+
+    # Mean rather than summed word score, so long phrases are not favoured
+    # just for their length; a mild length bonus keeps multi-word concepts ahead
+    lengths = np.fromiter((len(phrase) for phrase in phrases), dtype=np.float64, count=len(phrases))
+    rake = np.fromiter(
+        (sum(word_score[word] for word in phrase) for phrase in phrases), dtype=np.float64, count=len(phrases)
+    )
+    rake = rake / np.sqrt(lengths)
+
+    idf = np.log((1.0 + len(windows)) / (1.0 + document_frequency)) + 1.0
+    scores = rake * term_frequency * idf
+
+    # Drop phrases mostly spoken as part of a longer one ("descent" in "gradient descent")
+    children = []
+    parents = []
+    for parent, phrase in enumerate(phrases):
+        for i in range(len(phrase)):
+            for j in range(i + 1, len(phrase) + 1):
+                if j - i < len(phrase):
+                    children.append(phrase_ids[phrase[i:j]])
+                    parents.append(parent)
+    if children:
+        longest_use = np.zeros(len(phrases))
+        np.maximum.at(longest_use, np.asarray(children), term_frequency[np.asarray(parents)])
+        scores = np.where(longest_use >= NESTED_SHARE * term_frequency, 0.0, scores)
+
+    # Prefer phrases spoken more than once when there are enough of them
+    if (term_frequency > 1).sum() >= limit:
+        scores = np.where(term_frequency > 1, scores, 0.0)
+
+    concepts = []
+    chosen_words = []
+    for column in np.argsort(-scores, kind="stable"):
+        if len(concepts) >= limit or scores[column] <= 0:
+            break
+        words = set(phrases[column])
+        # Skip phrases that mostly repeat a concept already chosen
+        if any(len(words & other) * 2 > min(len(words), len(other)) for other in chosen_words):
+            continue
+        chosen_words.append(words)
+        concepts.append(" ".join(word.capitalize() for word in phrases[column]))
+    return concepts
@@ -0,0 +1,385 @@
+"""
+Metrics for Klipify
+Per-call instrumentation of outbound VideoDB and Gemini calls, exposed in
+Prometheus text format from a small local HTTP endpoint.
+
+Start the endpoint with KLIPIFY_METRICS_PORT=<port>; it serves /metrics next
+to the Streamlit app (or worker) in the same process.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from .tracing import span
+
+
+# Latency buckets in seconds, from fast searches to long uploads
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Pipeline stage attached to calls made while it runs
+_current_stage = contextvars.ContextVar('klipify_metrics_stage', default=None)
+
+
+class _Metric:
+    """One metric family with a fixed set of label names."""
+
+    def __init__(self, name, help_text, metric_type, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.metric_type = metric_type
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+
+class Counter(_Metric):
+    def __init__(self, name, help_text, label_names=()):
+        super().__init__(name, help_text, 'counter', label_names)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    def __init__(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, 'histogram', label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, (bucket_counts, total, count) in self._values.items():
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    samples.append((f"{self.name}_bucket", key + (_format_value(bound),), bucket_count))
+                samples.append((f"{self.name}_bucket", key + ('+Inf',), count))
+                samples.append((f"{self.name}_sum", key, total))
+                samples.append((f"{self.name}_count", key, count))
+        return samples
+
+
+class MetricsRegistry:
+    """Holds metric families and scrape-time collectors."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def counter(self, name, help_text, label_names=()):
+        """Get or create a counter."""
+        return self._register(name, lambda: Counter(name, help_text, label_names))
+
+    def histogram(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        """Get or create a histogram."""
+        return self._register(name, lambda: Histogram(name, help_text, label_names, buckets))
+
+    def _register(self, name, factory):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = factory()
+            return self._metrics[name]
+
+    def add_collector(self, collector):
+        """
+        Register a callable returning current values at scrape time.
+
+        Args:
+            collector (callable): Returns a list of (name, help, labels_dict, value)
+                gauge samples; a fifth element 'counter' marks a monotonic
+                total kept elsewhere (e.g. cache hits)
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self):
+        """
+        Render every metric in Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text
+        """
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            label_names = metric.label_names + (('le',) if metric.metric_type == 'histogram' else ())
+            for sample_name, key, value in metric.samples():
+                names = label_names if sample_name.endswith('_bucket') else metric.label_names
+                lines.append(f"{sample_name}{_format_labels(names, key)} {_format_value(value)}")
+
+        seen = set()
+        for collector in collectors:
+            try:
+                gauges = collector()
+            except Exception:
+                continue
+            for sample in gauges:
+                name, help_text, labels, value = sample[:4]
+                if name not in seen:
+                    lines.append(f"# HELP {name} {help_text}")
+                    lines.append(f"# TYPE {name} {sample[4] if len(sample) > 4 else 'gauge'}")
+                    seen.add(name)
+                lines.append(f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value):
+    """Escape a label value for the text format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return repr(value) if value != int(value) else str(int(value)) + ".0"
+    return str(value)
+
+
+registry = MetricsRegistry()
+
+_CALL_LABELS = ('backend', 'service', 'operation', 'stage')
+
+CALL_DURATION = registry.histogram(
+    "klipify_api_call_duration_seconds", "Latency of outbound API calls.", _CALL_LABELS
+)
+CALLS = registry.counter(
+    "klipify_api_calls_total", "Outbound API calls by outcome.", _CALL_LABELS + ('outcome',)
+)
+CALL_ERRORS = registry.counter(
+    "klipify_api_errors_total", "Failed outbound API calls by error type.", _CALL_LABELS + ('error_type',)
+)
+PROMPT_TOKENS = registry.counter(
+    "klipify_gemini_prompt_tokens_total", "Prompt tokens sent to Gemini.", _CALL_LABELS
+)
+RESPONSE_TOKENS = registry.counter(
+    "klipify_gemini_response_tokens_total", "Response tokens received from Gemini.", _CALL_LABELS
+)
+PAYLOAD_CHARS = registry.counter(
+    "klipify_api_payload_chars_total", "Characters of text sent and received by outbound calls.",
+    _CALL_LABELS + ('direction',)
+)
+LOCAL_FALLBACKS = registry.counter(
+    "klipify_local_fallbacks_total", "Stages answered by the local summarizer instead of Gemini.",
+    ('stage', 'reason')
+)
+
+
+class _CallRecord:
+    """Lets an instrumented block report sizes of what it sent and received."""
+
+    def __init__(self, labels, call_span):
+        self.labels = labels
+        self.span = call_span
+
+    def tokens(self, prompt_tokens, response_tokens):
+        """Record Gemini token usage."""
+        PROMPT_TOKENS.inc(prompt_tokens or 0, **self.labels)
+        RESPONSE_TOKENS.inc(response_tokens or 0, **self.labels)
+        self.span.set_attribute('prompt_tokens', prompt_tokens or 0)
+        self.span.set_attribute('response_tokens', response_tokens or 0)
+
+    def payload(self, sent=0, received=0):
+        """Record text sizes in characters."""
+        if sent:
+            PAYLOAD_CHARS.inc(sent, direction='sent', **self.labels)
+            self.span.set_attribute('sent_chars', sent)
+        if received:
+            PAYLOAD_CHARS.inc(received, direction='received', **self.labels)
+            self.span.set_attribute('received_chars', received)
+
+
+@contextmanager
+def track_call(service, operation, default_stage='none'):
+    """
+    Time one outbound call and count its outcome.
+
+    The call is also recorded as a '<service>.<operation>' span when the
+    job is being traced.
+
+    Args:
+        service (str): 'videodb' or 'gemini'
+        operation (str): SDK operation (e.g. 'upload', 'generate_content')
+        default_stage (str): Stage label when no pipeline stage is active
+
+    Yields:
+        _CallRecord: Accepts token and payload sizes for the call
+    """
+    from .backends import get_backend_name
+
+    labels = {
+        'backend': get_backend_name(),
+        'service': service,
+        'operation': operation,
+        'stage': _current_stage.get() or default_stage,
+    }
+    started = time.perf_counter()
+    try:
+        with span(f"{service}.{operation}", stage=labels['stage']) as call_span:
+            yield _CallRecord(labels, call_span)
+    except Exception as e:
+        CALL_DURATION.observe(time.perf_counter() - started, **labels)
+        CALLS.inc(outcome='error', **labels)
+        CALL_ERRORS.inc(error_type=type(e).__name__, **labels)
+        raise
+    CALL_DURATION.observe(time.perf_counter() - started, **labels)
+    CALLS.inc(outcome='success', **labels)
+
+
+@contextmanager
+def stage_context(stage):
+    """
+    Label calls made inside the block with a pipeline stage.
+
+    Args:
+        stage (str): Stage name (e.g. 'summary')
+    """
+    token = _current_stage.set(stage)
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+
+
+def record_usage(call, response, prompt):
+    """
+    Record Gemini token counts from a response, estimating when absent.
+
+    Args:
+        call (_CallRecord): Record from track_call()
+        response: GenAI response
+        prompt (str): Prompt that was sent
+    """
+    text = getattr(response, 'text', None) or ""
+    usage = getattr(response, 'usage_metadata', None)
+    prompt_tokens = getattr(usage, 'prompt_token_count', None)
+    response_tokens = getattr(usage, 'candidates_token_count', None)
+    call.tokens(
+        prompt_tokens if prompt_tokens is not None else len(prompt) // 4,
+        response_tokens if response_tokens is not None else len(text) // 4,
+    )
+    call.payload(sent=len(prompt), received=len(text))
+
+
+def _cache_gauges():
+    """Artifact cache hit/miss counters and size gauges."""
+    from .artifact_cache import get_artifact_cache
+
+    stats = get_artifact_cache().get_stats()
+    return [
+        ("klipify_artifact_cache_hits_total", "Artifact cache hits.", {}, stats['hits'], 'counter'),
+        ("klipify_artifact_cache_misses_total", "Artifact cache misses.", {}, stats['misses'], 'counter'),
+        ("klipify_artifact_cache_entries", "Videos held in the artifact cache.", {}, stats['entries']),
+        ("klipify_artifact_cache_bytes", "Estimated bytes held in the artifact cache.", {}, stats['size_bytes']),
+    ]
+
+
+def _queue_gauges():
+    """Job queue depth by state, when processing runs in workers."""
+    from .job_queue import get_job_queue, use_worker_queue
+
+    if not use_worker_queue():
+        return []
+    return [
+        ("klipify_queue_jobs", "Jobs in the processing queue by state.", {'state': state}, count)
+        for state, count in get_job_queue().get_stats().items()
+    ]
+
+
+registry.add_collector(_cache_gauges)
+registry.add_collector(_queue_gauges)
+
+
+def _make_handler():
+    """Build the /metrics request handler (http.server is only imported when serving)."""
+    from http.server import BaseHTTPRequestHandler
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Scrapes every few seconds would otherwise flood the app's console
+            pass
+
+    return _MetricsHandler
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=None, host=None):
+    """
+    Serve /metrics on a background thread, once per process.
+
+    Args:
+        port (int, optional): Port (defaults to KLIPIFY_METRICS_PORT; disabled if unset)
+        host (str, optional): Bind address (defaults to KLIPIFY_METRICS_HOST or 127.0.0.1)
+
+    Returns:
+        int: Bound port, or None if the endpoint is disabled or the port is taken
+    """
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server.server_address[1]
+
+        port = port if port is not None else os.getenv("KLIPIFY_METRICS_PORT")
+        if port in (None, ""):
+            return None
+
+        from http.server import ThreadingHTTPServer
+
+        try:
+            _server = ThreadingHTTPServer(
+                (host or os.getenv("KLIPIFY_METRICS_HOST", "127.0.0.1"), int(port)), _make_handler()
+            )
+        except (OSError, ValueError):
+            return None
+
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="klipify-metrics", daemon=True).start()
+        return _server.server_address[1]
@@ -0,0 +1,430 @@
+"""
+Processing Scheduler for Klipify
+Fair, priority-aware job selection and fleet-wide concurrency pools.
+
+Jobs are picked by per-tenant weighted fair queuing (the tenant that has
+received the least weighted service goes next) and, within a tenant,
+shortest-expected-job-first with aging so long jobs are never starved.
+VideoDB-bound and Gemini-bound stages draw from separate concurrency pools
+shared by every worker using the same queue database.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from .job_registry import ProcessingCancelled
+from .tracing import span
+
+
+DEFAULT_TENANT = 'default'
+
+# Fallback estimate when nothing is known about a video (seconds)
+DEFAULT_JOB_SECONDS = 180.0
+
+# Seconds of expected cost forgiven per second of waiting
+AGING_RATE = 1.0
+
+# Resource pools
+POOL_VIDEODB = 'videodb'
+POOL_GEMINI = 'gemini'
+
+DEFAULT_POOL_LIMITS = {
+    POOL_VIDEODB: 2,
+    POOL_GEMINI: 4,
+}
+
+# Held slots are renewed every third of this; a slot that is not renewed
+# for this long is assumed to belong to a crashed worker
+DEFAULT_SLOT_TTL = 120
+
+# Waiters that stop polling for this long are dropped from the line
+_WAITER_STALE_SECONDS = 15
+
+_POOL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pool_slots (
+    pool TEXT NOT NULL,
+    holder TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (pool, holder)
+);
+
+CREATE TABLE IF NOT EXISTS pool_waiters (
+    pool TEXT NOT NULL,
+    holder TEXT NOT NULL,
+    cost REAL NOT NULL,
+    since REAL NOT NULL,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (pool, holder)
+);
+
+CREATE TABLE IF NOT EXISTS pool_metrics (
+    pool TEXT PRIMARY KEY,
+    grants INTEGER NOT NULL DEFAULT 0,
+    total_wait REAL NOT NULL DEFAULT 0,
+    max_wait REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+def estimate_processing_seconds(duration=None, transcript_chars=None):
+    """
+    Estimate how long a video takes to process.
+
+    VideoDB upload and indexing scale with video length; the Gemini stages
+    scale with transcript size. A missing transcript size is derived from
+    the duration at a typical speaking rate.
+
+    Args:
+        duration (float, optional): Video length in seconds
+        transcript_chars (int, optional): Transcript length in characters
+
+    Returns:
+        float: Expected processing seconds, or None if nothing is known
+    """
+    if not duration and not transcript_chars:
+        return None
+
+    if not transcript_chars:
+        # ~150 words per minute at ~6 characters per word
+        transcript_chars = duration * 15
+    if not duration:
+        duration = transcript_chars / 15
+
+    videodb_seconds = 30 + 0.5 * duration
+    gemini_seconds = 20 + 2.0 * transcript_chars / 1000
+    return videodb_seconds + gemini_seconds
+
+
+def job_score(expected_cost, waited_seconds):
+    """
+    Shortest-expected-job-first score with aging; lower runs first.
+
+    Args:
+        expected_cost (float): Expected processing seconds
+        waited_seconds (float): Time the job has been waiting
+
+    Returns:
+        float: Scheduling score
+    """
+    return (expected_cost or DEFAULT_JOB_SECONDS) - AGING_RATE * max(waited_seconds, 0)
+
+
+def pick_next_job(candidates, tenant_vtimes, now=None):
+    """
+    Choose the next job by weighted fair queuing across tenants, then
+    shortest-expected-job-first within the chosen tenant.
+
+    Args:
+        candidates (list): Ready jobs as dicts with id, tenant, expected_cost
+            and created_at
+        tenant_vtimes (dict): tenant -> weighted service received so far
+        now (float, optional): Current time
+
+    Returns:
+        dict: Chosen candidate, or None if there are none
+    """
+    if not candidates:
+        return None
+    now = now or time.time()
+
+    tenant = min(
+        {candidate['tenant'] for candidate in candidates},
+        key=lambda name: (tenant_vtimes.get(name, 0.0), name)
+    )
+    return min(
+        (candidate for candidate in candidates if candidate['tenant'] == tenant),
+        key=lambda candidate: (
+            job_score(candidate['expected_cost'], now - candidate['created_at']),
+            candidate['id']
+        )
+    )
+
+
+def get_pool_limit(pool):
+    """
+    Get a pool's concurrency limit.
+
+    Configured with KLIPIFY_VIDEODB_CONCURRENCY and KLIPIFY_GEMINI_CONCURRENCY.
+
+    Args:
+        pool (str): Pool name
+
+    Returns:
+        int: Maximum concurrent holders across all workers
+    """
+    value = os.getenv(f"KLIPIFY_{pool.upper()}_CONCURRENCY")
+    try:
+        return max(1, int(value)) if value else DEFAULT_POOL_LIMITS.get(pool, 1)
+    except ValueError:
+        return DEFAULT_POOL_LIMITS.get(pool, 1)
+
+
+def pools_enabled():
+    """
+    Whether API-bound stages should draw from the shared concurrency pools.
+
+    Pools coordinate the worker fleet, so they are on in queue mode. Inline
+    processing in the UI process runs unlimited unless a limit is set with
+    KLIPIFY_VIDEODB_CONCURRENCY or KLIPIFY_GEMINI_CONCURRENCY.
+
+    Returns:
+        bool: True when stages should acquire pool slots
+    """
+    from .job_queue import use_worker_queue
+
+    if use_worker_queue():
+        return True
+    return any(os.getenv(f"KLIPIFY_{pool.upper()}_CONCURRENCY") for pool in DEFAULT_POOL_LIMITS)
+
+
+class ResourcePools:
+    """
+    Counting semaphores stored in SQLite so limits hold across processes.
+
+    Waiting holders are granted slots in order of expected cost (with
+    aging), not arrival, so short jobs slip past long ones. Slots held by
+    this process are renewed in the background until they are released.
+    """
+
+    _init_lock = threading.Lock()
+    _initialized_paths = set()
+
+    def __init__(self, db_path, slot_ttl=DEFAULT_SLOT_TTL, poll_interval=0.25):
+        """
+        Args:
+            db_path (str): SQLite database path (normally the job queue's)
+            slot_ttl (float): Seconds before an unreleased slot is reclaimed
+            poll_interval (float): Seconds between attempts while waiting
+        """
+        self.db_path = db_path
+        self.slot_ttl = slot_ttl
+        self.poll_interval = poll_interval
+        self._held = set()
+        self._held_lock = threading.Lock()
+        self._renewer = None
+        self._ensure_schema()
+
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection holding the write lock."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _ensure_schema(self):
+        """Create tables on first use of a database file."""
+        with self._init_lock:
+            if self.db_path in self._initialized_paths:
+                return
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_POOL_SCHEMA)
+                conn.commit()
+            finally:
+                conn.close()
+            self._initialized_paths.add(self.db_path)
+
+    def try_acquire(self, pool, holder, cost=None):
+        """
+        Take a slot if one is free and this holder is next in line.
+
+        Args:
+            pool (str): Pool name
+            holder (str): Unique holder ID (one per pipeline stage call)
+            cost (float, optional): Expected cost used to order waiters
+
+        Returns:
+            float: Seconds waited if the slot was granted, otherwise None
+        """
+        now = time.time()
+        limit = get_pool_limit(pool)
+        with self._connect() as conn:
+            conn.execute("DELETE FROM pool_slots WHERE expires_at < ?", (now,))
+            conn.execute("DELETE FROM pool_waiters WHERE seen_at < ?", (now - _WAITER_STALE_SECONDS,))
+            conn.execute(
+                """
+                INSERT INTO pool_waiters (pool, holder, cost, since, seen_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(pool, holder) DO UPDATE SET seen_at = excluded.seen_at
+                """,
+                (pool, holder, cost or DEFAULT_JOB_SECONDS, now, now)
+            )
+
+            free = limit - conn.execute(
+                "SELECT COUNT(*) FROM pool_slots WHERE pool = ?", (pool,)
+            ).fetchone()[0]
+            if free <= 0:
+                return None
+
+            waiters = conn.execute(
+                "SELECT holder, cost, since FROM pool_waiters WHERE pool = ?", (pool,)
+            ).fetchall()
+            first_in_line = sorted(
+                waiters, key=lambda row: (job_score(row['cost'], now - row['since']), row['since'])
+            )[:free]
+            mine = next((row for row in first_in_line if row['holder'] == holder), None)
+            if mine is None:
+                return None
+
+            waited = now - mine['since']
+            conn.execute("DELETE FROM pool_waiters WHERE pool = ? AND holder = ?", (pool, holder))
+            conn.execute(
+                "INSERT OR REPLACE INTO pool_slots (pool, holder, expires_at) VALUES (?, ?, ?)",
+                (pool, holder, now + self.slot_ttl)
+            )
+            conn.execute(
+                """
+                INSERT INTO pool_metrics (pool, grants, total_wait, max_wait) VALUES (?, 1, ?, ?)
+                ON CONFLICT(pool) DO UPDATE SET grants = grants + 1,
+                    total_wait = total_wait + excluded.total_wait,
+                    max_wait = MAX(max_wait, excluded.max_wait)
+                """,
+                (pool, waited, waited)
+            )
+            return waited
+
+    def release(self, pool, holder):
+        """Return a slot and leave the waiting line."""
+        with self._held_lock:
+            self._held.discard((pool, holder))
+        with self._connect() as conn:
+            conn.execute("DELETE FROM pool_slots WHERE pool = ? AND holder = ?", (pool, holder))
+            conn.execute("DELETE FROM pool_waiters WHERE pool = ? AND holder = ?", (pool, holder))
+
+    def renew(self, slots):
+        """
+        Push back the expiry of slots that are still held.
+
+        Args:
+            slots (iterable): (pool, holder) pairs
+        """
+        expires_at = time.time() + self.slot_ttl
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE pool_slots SET expires_at = ? WHERE pool = ? AND holder = ?",
+                [(expires_at, pool, holder) for pool, holder in slots]
+            )
+
+    def _hold(self, pool, holder):
+        """Keep a granted slot renewed until it is released."""
+        with self._held_lock:
+            self._held.add((pool, holder))
+            if self._renewer is None:
+                self._renewer = threading.Thread(
+                    target=self._renew_held_slots, name="klipify-pool-renewer", daemon=True
+                )
+                self._renewer.start()
+
+    def _renew_held_slots(self):
+        """Renew this process's slots well before expiry; exits once none are held."""
+        while True:
+            time.sleep(self.slot_ttl / 3)
+            with self._held_lock:
+                held = list(self._held)
+                if not held:
+                    self._renewer = None
+                    return
+            try:
+                self.renew(held)
+            except sqlite3.Error as e:
+                print(f"⚠️ Could not renew pool slots: {str(e)}")
+
+    @contextmanager
+    def slot(self, pool, holder, cost=None, should_cancel=None, on_wait=None):
+        """
+        Hold a pool slot for the duration of a block.
+
+        Args:
+            pool (str): Pool name
+            holder (str): Unique holder ID
+            cost (float, optional): Expected cost used to order waiters
+            should_cancel (callable, optional): Returns True to stop waiting
+            on_wait (callable, optional): Called once if the slot is not free immediately
+
+        Raises:
+            ProcessingCancelled: If should_cancel() returned True while waiting
+        """
+        notified = False
+        try:
+            with span(f"{pool}.slot_wait", cost=cost or 0) as wait_span:
+                while self.try_acquire(pool, holder, cost) is None:
+                    if should_cancel and should_cancel():
+                        raise ProcessingCancelled("Processing was cancelled")
+                    if on_wait and not notified:
+                        on_wait()
+                        notified = True
+                    time.sleep(self.poll_interval)
+                wait_span.set_attribute('waited', notified)
+            self._hold(pool, holder)
+            yield
+        finally:
+            self.release(pool, holder)
+
+    def get_stats(self):
+        """
+        Get usage per pool.
+
+        Returns:
+            dict: pool -> limit, in_use, waiting, grants, avg_wait and max_wait
+        """
+        now = time.time()
+        with self._connect() as conn:
+            in_use = dict(conn.execute(
+                "SELECT pool, COUNT(*) FROM pool_slots WHERE expires_at >= ? GROUP BY pool", (now,)
+            ).fetchall())
+            waiting = dict(conn.execute(
+                "SELECT pool, COUNT(*) FROM pool_waiters WHERE seen_at >= ? GROUP BY pool",
+                (now - _WAITER_STALE_SECONDS,)
+            ).fetchall())
+            metrics = {row['pool']: row for row in conn.execute("SELECT * FROM pool_metrics").fetchall()}
+
+        stats = {}
+        for pool in sorted(set(DEFAULT_POOL_LIMITS) | set(in_use) | set(waiting) | set(metrics)):
+            row = metrics.get(pool)
+            grants = row['grants'] if row else 0
+            stats[pool] = {
+                'limit': get_pool_limit(pool),
+                'in_use': in_use.get(pool, 0),
+                'waiting': waiting.get(pool, 0),
+                'grants': grants,
+                'avg_wait': (row['total_wait'] / grants) if grants else 0.0,
+                'max_wait': row['max_wait'] if row else 0.0,
+            }
+        return stats
+
+
+_pools = None
+_pools_lock = threading.Lock()
+
+
+def get_resource_pools():
+    """
+    Get the shared resource pools, stored alongside the job queue.
+
+    Returns:
+        ResourcePools or None if pools are disabled (see pools_enabled())
+            or the queue database cannot be opened
+    """
+    global _pools
+    if not pools_enabled():
+        return None
+    with _pools_lock:
+        if _pools is None:
+            from .job_queue import get_job_queue
+
+            try:
+                _pools = ResourcePools(get_job_queue().db_path)
+            except (OSError, sqlite3.Error):
+                return None
+        return _pools
@@ -0,0 +1,194 @@
+"""
+Topic Segmentation for Klipify
+Splits a transcript into chapters at topic shifts, without Gemini.
+
+Uses TextTiling: the transcript is cut into fixed-length blocks of speech,
+the vocabulary of the blocks before and after every gap is compared, and
+chapters start at the gaps where the similarity dips deepest. Block
+comparisons use cumulative term counts, so every gap is scored in one
+vectorized NumPy pass. Chapter boundaries fall on transcript segments, so
+chapter start times are exact.
+"""
+
+import numpy as np
+
+from ..utils.transcript import as_compact_transcript
+from .local_summarizer import MAX_VOCABULARY, STOPWORDS, extract_keyphrases, tokenize
+
+
+# Seconds of speech per TextTiling block
+BLOCK_SECONDS = 20.0
+
+# Blocks compared on each side of a gap (two minutes of speech)
+COMPARE_BLOCKS = 6
+
+# Gaps averaged when smoothing the similarity curve
+SMOOTHING_WIDTH = 3
+
+MIN_CHAPTER_SECONDS = 120.0
+# Longer chapters are split at their deepest dip so each notes prompt stays small
+MAX_CHAPTER_SECONDS = 900.0
+MAX_CHAPTERS = 24
+
+
+def _block_term_counts(transcript):
+    """
+    Term counts per BLOCK_SECONDS block of the transcript.
+
+    Returns:
+        tuple: (counts matrix (blocks, vocabulary), first segment index of
+            each block)
+    """
+    starts = np.asarray(transcript.starts, dtype=np.float64)
+    block_of_segment = (starts // BLOCK_SECONDS).astype(np.int64)
+    # Renumber blocks densely so silent stretches do not leave empty blocks
+    block_ids, block_of_segment = np.unique(block_of_segment, return_inverse=True)
+    first_segment = np.searchsorted(block_of_segment, np.arange(len(block_ids)))
+
+    vocabulary = {}
+    rows = []
+    columns = []
+    for segment_index in range(len(transcript)):
+        for token in tokenize(transcript.text_at(segment_index)):
+            if token in STOPWORDS or len(token) < 3:
+                continue
+            column = vocabulary.get(token)
+            if column is None:
+                if len(vocabulary) >= MAX_VOCABULARY * 4:
+                    continue
+                column = vocabulary[token] = len(vocabulary)
+            rows.append(block_of_segment[segment_index])
+            columns.append(column)
+
+    counts = np.zeros((len(block_ids), max(len(vocabulary), 1)), dtype=np.float32)
+    if rows:
+        np.add.at(counts, (np.asarray(rows), np.asarray(columns)), 1.0)
+    return counts, first_segment
+
+
+def gap_depths(counts, compare_blocks=COMPARE_BLOCKS):
+    """
+    Score every gap between blocks by how sharply the topic changes there.
+
+    Args:
+        counts (numpy.ndarray): Term counts per block
+        compare_blocks (int): Blocks compared on each side of a gap
+
+    Returns:
+        numpy.ndarray: Depth score per gap (gap i lies after block i)
+    """
+    blocks = len(counts)
+    if blocks < 2:
+        return np.zeros(0)
+
+    # Term counts of the blocks left and right of each gap, from prefix sums
+    cumulative = np.vstack([np.zeros((1, counts.shape[1]), dtype=np.float64), np.cumsum(counts, axis=0)])
+    gaps = np.arange(1, blocks)
+    left = cumulative[gaps] - cumulative[np.maximum(gaps - compare_blocks, 0)]
+    right = cumulative[np.minimum(gaps + compare_blocks, blocks)] - cumulative[gaps]
+    norms = np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1)
+    similarity = (left * right).sum(axis=1) / np.maximum(norms, 1e-12)
+
+    if SMOOTHING_WIDTH > 1 and len(similarity) >= SMOOTHING_WIDTH:
+        padded = np.pad(similarity, SMOOTHING_WIDTH // 2, mode='edge')
+        similarity = np.convolve(padded, np.ones(SMOOTHING_WIDTH) / SMOOTHING_WIDTH, mode='valid')
+
+    # Depth: how far the curve rises again within compare_blocks gaps on each side
+    window = compare_blocks
+    padded = np.pad(similarity, window, mode='constant', constant_values=-np.inf)
+    peaks = np.lib.stride_tricks.sliding_window_view(padded, window + 1).max(axis=1)
+    left_peak = peaks[:len(similarity)]
+    right_peak = peaks[window:window + len(similarity)]
+    return (left_peak - similarity) + (right_peak - similarity)
+
+
+def _choose_boundaries(depths, block_starts, duration):
+    """Pick the deepest gaps as chapter starts, keeping chapters long enough."""
+    if len(depths) == 0:
+        return []
+    limit = min(MAX_CHAPTERS - 1, int(duration // MIN_CHAPTER_SECONDS))
+    # Gap i starts the chapter at block i + 1
+    gap_starts = block_starts[1:]
+
+    # Only valleys (local depth maxima) are candidates. Speech drifts more than
+    # written text, so the cutoff is stricter than TextTiling's mean - std / 2
+    padded = np.pad(depths, 1, mode='constant', constant_values=-np.inf)
+    valleys = (depths >= padded[:-2]) & (depths >= padded[2:]) & (depths > 0)
+    if not valleys.any():
+        return []
+    cutoff = depths[valleys].mean() + depths[valleys].std() / 2
+
+    def fits(start, chosen):
+        edges = [0.0, *chosen, duration]
+        return all(abs(start - edge) >= MIN_CHAPTER_SECONDS for edge in edges)
+
+    chosen = []
+    for gap in np.argsort(-np.where(valleys, depths, 0.0), kind="stable"):
+        if len(chosen) >= limit or not valleys[gap] or depths[gap] < cutoff:
+            break
+        if fits(gap_starts[gap], chosen):
+            chosen.append(float(gap_starts[gap]))
+
+    # Split chapters that are still too long at their deepest gap
+    for _ in range(MAX_CHAPTERS):
+        edges = [0.0, *sorted(chosen), duration]
+        long_chapters = [
+            (low, high) for low, high in zip(edges, edges[1:]) if high - low > MAX_CHAPTER_SECONDS
+        ]
+        if not long_chapters or len(chosen) >= MAX_CHAPTERS - 1:
+            break
+        split = False
+        for low, high in long_chapters:
+            inside = np.flatnonzero(
+                (gap_starts >= low + MIN_CHAPTER_SECONDS) & (gap_starts <= high - MIN_CHAPTER_SECONDS)
+            )
+            if len(inside):
+                chosen.append(float(gap_starts[inside[np.argmax(depths[inside])]]))
+                split = True
+        if not split:
+            break
+    return sorted(chosen)
+
+
+def segment_chapters(transcript_segments):
+    """
+    Split a transcript into topical chapters.
+
+    Args:
+        transcript_segments: Transcript segments (list of dicts or CompactTranscript)
+
+    Returns:
+        list: Chapter dicts in time order with 'title', 'start' and 'end'
+            (seconds) and 'first_segment' / 'stop_segment' (the chapter's
+            transcript segment index range); empty for an empty transcript
+    """
+    transcript = as_compact_transcript(transcript_segments)
+    if not len(transcript):
+        return []
+
+    duration = float(transcript.duration)
+    counts, first_segment = _block_term_counts(transcript)
+    block_starts = np.asarray(transcript.starts, dtype=np.float64)[first_segment]
+    boundaries = []
+    if duration >= 2 * MIN_CHAPTER_SECONDS:
+        boundaries = _choose_boundaries(gap_depths(counts), block_starts, duration)
+
+    # Chapter starts snap to the first segment at or after each boundary
+    starts = np.asarray(transcript.starts, dtype=np.float64)
+    first_segments = [0] + [int(np.searchsorted(starts, boundary)) for boundary in boundaries]
+    stop_segments = first_segments[1:] + [len(transcript)]
+
+    chapters = []
+    for number, (first, stop) in enumerate(zip(first_segments, stop_segments), start=1):
+        if first >= stop:
+            continue
+        chapter_transcript = transcript.take(range(first, stop))
+        title = " & ".join(extract_keyphrases(chapter_transcript, limit=2)) or f"Part {number}"
+        chapters.append({
+            'title': title,
+            'start': float(transcript.starts[first]),
+            'end': float(transcript.ends[stop - 1]),
+            'first_segment': first,
+            'stop_segment': stop,
+        })
+    return chapters
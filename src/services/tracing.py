@@ -0,0 +1,400 @@
+"""
+Tracing for Klipify
+Span tracing of processing jobs, written as Chrome trace-event JSON (open the
+files in https://ui.perfetto.dev or chrome://tracing) and optionally exported
+to an OpenTelemetry collector over OTLP/HTTP.
+
+Tracing is off by default. Set KLIPIFY_TRACE_SAMPLE_RATE to the fraction of
+jobs to trace (e.g. 0.1, or 1 for every job). Traces are written to
+data/traces/ (override with KLIPIFY_TRACE_DIR). Set KLIPIFY_OTLP_ENDPOINT
+(e.g. http://localhost:4318/v1/traces) to also send spans to a collector.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+
+# A runaway loop must not grow a trace without bound
+MAX_SPANS_PER_TRACE = 20000
+
+_current_trace = contextvars.ContextVar('klipify_trace', default=None)
+_current_span = contextvars.ContextVar('klipify_span', default=None)
+
+
+class _Trace:
+    """Spans collected for one traced job."""
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.trace_id = uuid.uuid4().hex
+        self.attributes = attributes
+        self.spans = []
+        self.dropped = 0
+        self.pid = os.getpid()
+        # Span times come from the monotonic clock, anchored to wall time once
+        self.epoch_ns = time.time_ns()
+        self.perf_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def now_ns(self):
+        """Wall-clock nanoseconds measured on the monotonic clock."""
+        return self.epoch_ns + time.perf_counter_ns() - self.perf_ns
+
+    def add(self, span):
+        with self._lock:
+            if len(self.spans) < MAX_SPANS_PER_TRACE:
+                self.spans.append(span)
+            else:
+                self.dropped += 1
+
+
+class _Span:
+    """One timed operation within a trace."""
+
+    __slots__ = ('name', 'span_id', 'parent_id', 'start_ns', 'end_ns', 'thread_id',
+                 'thread_name', 'attributes', 'error')
+
+    def __init__(self, name, parent_id, start_ns, attributes):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.start_ns = start_ns
+        self.end_ns = None
+        thread = threading.current_thread()
+        self.thread_id = thread.ident
+        self.thread_name = thread.name
+        self.attributes = attributes
+        self.error = None
+
+    def set_attribute(self, key, value):
+        """Attach a value to the span after it started."""
+        self.attributes[key] = value
+
+
+class _NoopSpan:
+    """Stands in for a span when the job is not sampled."""
+
+    def set_attribute(self, key, value):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def get_sample_rate():
+    """
+    Get the fraction of jobs to trace.
+
+    Returns:
+        float: Between 0 (disabled, the default) and 1
+    """
+    try:
+        rate = float(os.getenv("KLIPIFY_TRACE_SAMPLE_RATE", "0") or 0)
+    except ValueError:
+        return 0.0
+    return min(max(rate, 0.0), 1.0)
+
+
+def get_trace_dir():
+    """Get (and create) the directory Chrome trace files are written to."""
+    trace_dir = os.getenv("KLIPIFY_TRACE_DIR")
+    if trace_dir:
+        os.makedirs(trace_dir, exist_ok=True)
+        return trace_dir
+
+    from ..utils.helpers import get_data_dir
+
+    return get_data_dir("traces")
+
+
+def is_tracing():
+    """Whether the current context belongs to a sampled trace."""
+    return _current_trace.get() is not None
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Time a block as a span of the current trace.
+
+    Costs one context variable lookup when the job is not being traced.
+
+    Args:
+        name (str): Span name (e.g. 'videodb.search')
+        **attributes: Values shown with the span
+
+    Yields:
+        Span accepting set_attribute(key, value)
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield _NOOP_SPAN
+        return
+
+    parent = _current_span.get()
+    current = _Span(name, parent.span_id if parent else None, trace.now_ns(), attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end_ns = trace.now_ns()
+        trace.add(current)
+
+
+def traced(name=None):
+    """
+    Decorator recording each call of a function as a span.
+
+    Args:
+        name (str, optional): Span name (defaults to the function's qualified name)
+    """
+    def decorator(function):
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return function(*args, **kwargs)
+            with span(span_name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def propagate(function):
+    """
+    Bind a callable to the current trace, so a thread running it adds its
+    spans to the caller's trace.
+
+    Args:
+        function (callable): Thread or executor target
+
+    Returns:
+        callable: Wrapped function
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        return context.run(function, *args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def trace_job(name, sample_rate=None, **attributes):
+    """
+    Trace one job from start to finish.
+
+    Inside an existing trace this only opens a span, so a job started from
+    traced code joins its caller's trace.
+
+    Args:
+        name (str): Root span name (e.g. 'process_video')
+        sample_rate (float, optional): Overrides KLIPIFY_TRACE_SAMPLE_RATE
+        **attributes: Values shown with the root span (e.g. youtube_id)
+
+    Yields:
+        Root span accepting set_attribute(key, value)
+    """
+    if _current_trace.get() is not None:
+        with span(name, **attributes) as root:
+            yield root
+        return
+
+    rate = get_sample_rate() if sample_rate is None else sample_rate
+    if rate <= 0 or random.random() >= rate:
+        yield _NOOP_SPAN
+        return
+
+    trace = _Trace(name, attributes)
+    token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        with span(name, **attributes) as root:
+            yield root
+    finally:
+        _current_span.reset(span_token)
+        _current_trace.reset(token)
+        _finish_trace(trace)
+
+
+def _finish_trace(trace):
+    """Write a finished trace to disk and hand it to the OTLP exporter."""
+    try:
+        write_chrome_trace(trace)
+    except Exception as e:
+        print(f"⚠️ Could not write trace {trace.trace_id}: {str(e)}")
+
+    endpoint = os.getenv("KLIPIFY_OTLP_ENDPOINT")
+    if endpoint:
+        # Export off the job's thread so a slow collector never delays processing
+        threading.Thread(
+            target=export_otlp, args=(trace, endpoint),
+            name="klipify-otlp-export", daemon=True
+        ).start()
+
+
+def to_chrome_trace(trace):
+    """
+    Convert a trace to the Chrome trace-event format.
+
+    Args:
+        trace (_Trace): Finished trace
+
+    Returns:
+        dict: JSON-serializable trace with one track per thread
+    """
+    events = []
+    threads = {}
+    for item in trace.spans:
+        threads.setdefault(item.thread_id, item.thread_name)
+        args = dict(item.attributes)
+        if item.error:
+            args['error'] = item.error
+        events.append({
+            'name': item.name,
+            'cat': item.name.split('.', 1)[0],
+            'ph': 'X',
+            'ts': item.start_ns / 1000,
+            'dur': (item.end_ns - item.start_ns) / 1000,
+            'pid': trace.pid,
+            'tid': item.thread_id,
+            'args': args,
+        })
+
+    events.sort(key=lambda event: event['ts'])
+    metadata = [
+        {'name': 'process_name', 'ph': 'M', 'pid': trace.pid, 'args': {'name': f"klipify {trace.name}"}}
+    ] + [
+        {'name': 'thread_name', 'ph': 'M', 'pid': trace.pid, 'tid': thread_id, 'args': {'name': thread_name}}
+        for thread_id, thread_name in threads.items()
+    ]
+
+    return {
+        'traceEvents': metadata + events,
+        'displayTimeUnit': 'ms',
+        'otherData': {
+            'trace_id': trace.trace_id,
+            'dropped_spans': trace.dropped,
+            **{key: str(value) for key, value in trace.attributes.items()},
+        },
+    }
+
+
+def write_chrome_trace(trace, path=None):
+    """
+    Save a trace as Chrome trace-event JSON.
+
+    Args:
+        trace (_Trace): Finished trace
+        path (str, optional): Output path (defaults to the trace directory)
+
+    Returns:
+        str: Path written
+    """
+    if path is None:
+        label = "-".join(str(value) for value in trace.attributes.values())[:60]
+        started = datetime.fromtimestamp(trace.epoch_ns / 1e9).strftime('%Y%m%d-%H%M%S')
+        filename = "-".join(part for part in (trace.name, label, started, trace.trace_id[:8]) if part)
+        path = os.path.join(get_trace_dir(), "".join(
+            char if char.isalnum() or char in "-_." else "_" for char in filename
+        ) + ".json")
+
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(to_chrome_trace(trace), handle)
+    return path
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _otlp_attributes(attributes):
+    return [{'key': key, 'value': _otlp_value(value)} for key, value in attributes.items()]
+
+
+def to_otlp(trace):
+    """
+    Convert a trace to an OTLP/HTTP JSON export request.
+
+    Args:
+        trace (_Trace): Finished trace
+
+    Returns:
+        dict: ExportTraceServiceRequest body
+    """
+    spans = []
+    for item in trace.spans:
+        attributes = dict(item.attributes, **{'thread.name': item.thread_name})
+        otlp_span = {
+            'traceId': trace.trace_id,
+            'spanId': item.span_id,
+            'name': item.name,
+            'kind': 1,
+            'startTimeUnixNano': str(item.start_ns),
+            'endTimeUnixNano': str(item.end_ns),
+            'attributes': _otlp_attributes(attributes),
+            'status': {'code': 2, 'message': item.error} if item.error else {'code': 1},
+        }
+        if item.parent_id:
+            otlp_span['parentSpanId'] = item.parent_id
+        spans.append(otlp_span)
+
+    return {
+        'resourceSpans': [{
+            'resource': {'attributes': _otlp_attributes({
+                'service.name': os.getenv("OTEL_SERVICE_NAME", "klipify"),
+                'process.pid': trace.pid,
+            })},
+            'scopeSpans': [{'scope': {'name': 'klipify'}, 'spans': spans}],
+        }]
+    }
+
+
+def export_otlp(trace, endpoint, timeout=5):
+    """
+    Send a trace to an OTLP/HTTP collector.
+
+    Args:
+        trace (_Trace): Finished trace
+        endpoint (str): Collector traces URL (e.g. http://localhost:4318/v1/traces)
+        timeout (float): Request timeout in seconds
+
+    Returns:
+        bool: True if the collector accepted the spans
+    """
+    import urllib.request
+
+    request = urllib.request.Request(
+        endpoint,
+        data=json.dumps(to_otlp(trace)).encode("utf-8"),
+        headers={'Content-Type': 'application/json'},
+        method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return 200 <= response.status < 300
+    except Exception as e:
+        print(f"⚠️ OTLP export of trace {trace.trace_id} failed: {str(e)}")
+        return False
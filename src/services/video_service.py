@@ -4,19 +4,29 @@ Handles all VideoDB operations including upload, indexing, and clip generation.
 """
 
 import streamlit as st
-import videodb
-from videodb import SearchType, IndexType
 from datetime import datetime
+from .backends import connect_videodb, get_search_types, get_timeline_classes, use_fake_backend
+from .metrics import track_call
+from .tracing import traced
 
 
 class VideoProcessor:
     """Handles video processing operations using VideoDB."""
     
-    def __init__(self, client):
-        """Initialize with VideoDB client."""
+    def __init__(self, client, notify=None):
+        """
+        Initialize with VideoDB client.
+        
+        Args:
+            client: VideoDB client
+            notify (callable, optional): notify(level, message) for status
+                messages; defaults to showing them in the Streamlit page
+        """
         self.client = client
         self.video = None
+        self.notify = notify or streamlit_notify
     
+    @traced()
     def upload_and_index_video(self, youtube_url):
         """
         Upload video to VideoDB and index for search.
@@ -29,26 +39,61 @@ class VideoProcessor:
         """
         try:
             # Upload video
-            st.info("📤 Uploading video to VideoDB...")
-            self.video = self.client.upload(url=youtube_url)
+            self.notify('info', "📤 Uploading video to VideoDB...")
+            with track_call('videodb', 'upload'):
+                self.video = self.client.upload(url=youtube_url)
             
-            # Index spoken words for semantic search
-            st.info("🔍 Indexing video content for search...")
-            self.video.index_spoken_words()
-            
-            # Get transcript
-            transcript_text = self.video.get_transcript_text()
-            transcript_segments = self.video.get_transcript()
+            transcript_text, transcript_segments = self._index_and_get_transcript()
+            return self.video, transcript_text, transcript_segments
             
-            # Validate transcript
-            if not transcript_text or len(transcript_text.strip()) < 50:
-                raise ValueError("Could not extract meaningful transcript")
+        except Exception as e:
+            raise Exception(f"Video processing failed: {str(e)}")
+    
+    @traced()
+    def attach_video(self, video, fetch_transcript=True):
+        """
+        Work on a video that is already in VideoDB instead of uploading one.
+        
+        Args:
+            video: VideoDB video object
+            fetch_transcript (bool): Index the video and fetch its transcript;
+                skip when the transcript is already stored locally
             
+        Returns:
+            tuple: (video_object, transcript_text, transcript_segments), with
+                None for the transcript when it was not fetched
+        """
+        self.video = video
+        if not fetch_transcript:
+            return self.video, None, None
+        
+        try:
+            transcript_text, transcript_segments = self._index_and_get_transcript()
             return self.video, transcript_text, transcript_segments
-            
         except Exception as e:
             raise Exception(f"Video processing failed: {str(e)}")
     
+    def _index_and_get_transcript(self):
+        """Index the current video's spoken words and fetch its transcript."""
+        # Index spoken words for semantic search
+        self.notify('info', "🔍 Indexing video content for search...")
+        with track_call('videodb', 'index_spoken_words'):
+            self.video.index_spoken_words()
+        
+        # Get transcript
+        with track_call('videodb', 'get_transcript_text') as call:
+            transcript_text = self.video.get_transcript_text()
+            call.payload(received=len(transcript_text or ""))
+        with track_call('videodb', 'get_transcript'):
+            transcript_segments = self.video.get_transcript()
+        
+        # Validate transcript
+        if not transcript_text or len(transcript_text.strip()) < 50:
+            raise ValueError("Could not extract meaningful transcript")
+        
+        return transcript_text, transcript_segments
+    
+    @traced()
     def find_concept_segments(self, concepts):
         """
         Find video segments for each concept using semantic search.
@@ -63,14 +108,16 @@ class VideoProcessor:
             raise ValueError("No video loaded. Upload a video first.")
         
         concepts_with_segments = []
+        SearchType, IndexType = get_search_types()
         
         for concept in concepts:
             try:
-                search_results = self.video.search(
-                    query=concept,
-                    search_type=SearchType.semantic,
-                    index_type=IndexType.spoken_word
-                )
+                with track_call('videodb', 'search'):
+                    search_results = self.video.search(
+                        query=concept,
+                        search_type=SearchType.semantic,
+                        index_type=IndexType.spoken_word
+                    )
                 
                 if search_results and len(search_results.get_shots()) > 0:
                     best_shot = search_results.get_shots()[0]
@@ -80,11 +127,12 @@ class VideoProcessor:
                         'end_time': best_shot.end,
                     })
             except Exception as e:
-                st.warning(f"Could not find segment for concept '{concept}': {str(e)}")
+                self.notify('warning', f"Could not find segment for concept '{concept}': {str(e)}")
                 continue
         
         return concepts_with_segments
     
+    @traced()
     def create_video_clips(self, concepts_with_segments):
         """
         Create short video clips for each concept using VideoDB Timeline approach.
@@ -102,10 +150,9 @@ class VideoProcessor:
         
         # Import Timeline and VideoAsset for proper clip creation
         try:
-            from videodb.timeline import Timeline
-            from videodb.asset import VideoAsset
+            Timeline, VideoAsset = get_timeline_classes()
         except ImportError:
-            st.error("❌ VideoDB Timeline feature not available. Please update VideoDB SDK.")
+            self.notify('error', "❌ VideoDB Timeline feature not available. Please update VideoDB SDK.")
             return clips
 
         for concept_data in concepts_with_segments:
@@ -147,35 +194,38 @@ class VideoProcessor:
                     timeline.add_inline(video_asset)
                     
                     # Generate stream from timeline (this creates a proper playable URL)
-                    timeline_stream_url = timeline.generate_stream()
+                    with track_call('videodb', 'timeline_generate_stream'):
+                        timeline_stream_url = timeline.generate_stream()
                     
                     clip_data['timeline_url'] = timeline_stream_url
                     clip_data['stream_url'] = timeline_stream_url  # Use timeline URL as primary
                     clip_data['playable'] = True
                     clip_data['format'] = 'Timeline-based stream'
                     
-                    st.success(f"✅ Timeline clip created for: {concept}")
+                    self.notify('success', f"✅ Timeline clip created for: {concept}")
                     
                 except Exception as timeline_e:
-                    st.warning(f"Timeline generation failed for {concept}: {timeline_e}")
+                    self.notify('warning', f"Timeline generation failed for {concept}: {timeline_e}")
                     
                     # Fallback to legacy generate_stream method
                     try:
-                        legacy_stream = self.video.generate_stream(timeline=[(start_time, clip_end)])
+                        with track_call('videodb', 'generate_stream'):
+                            legacy_stream = self.video.generate_stream(timeline=[(start_time, clip_end)])
                         clip_data['stream_url'] = legacy_stream
                         clip_data['format'] = 'Legacy HLS stream'
-                        st.info(f"⚠️ Using legacy stream for: {concept}")
+                        self.notify('info', f"⚠️ Using legacy stream for: {concept}")
                     except Exception as legacy_e:
-                        st.error(f"Both timeline and legacy stream failed for {concept}: {legacy_e}")
+                        self.notify('error', f"Both timeline and legacy stream failed for {concept}: {legacy_e}")
 
                 # Method 2: Try to create direct download URL if possible
                 try:
                     if hasattr(timeline, 'export'):
                         # Some versions support direct export
-                        download_url = timeline.export(format='mp4')
+                        with track_call('videodb', 'timeline_export'):
+                            download_url = timeline.export(format='mp4')
                         clip_data['download_url'] = download_url
                         clip_data['download_format'] = 'MP4'
-                        st.success(f"✅ MP4 download available for: {concept}")
+                        self.notify('success', f"✅ MP4 download available for: {concept}")
                 except Exception:
                     # Provide conversion instructions
                     clip_data['conversion_info'] = {
@@ -196,7 +246,8 @@ class VideoProcessor:
                                 end=clip_end
                             )
                             quality_timeline.add_inline(quality_asset)
-                            quality_url = quality_timeline.generate_stream(resolution=resolution)
+                            with track_call('videodb', 'timeline_generate_stream'):
+                                quality_url = quality_timeline.generate_stream(resolution=resolution)
                             clip_data[f'stream_{resolution}'] = quality_url
                             clip_data['available_qualities'] = clip_data.get('available_qualities', []) + [resolution]
                         except:
@@ -215,7 +266,7 @@ class VideoProcessor:
                 clips.append(clip_data)
                 
             except Exception as e:
-                st.error(f"❌ Could not create clip for {concept}: {str(e)}")
+                self.notify('error', f"❌ Could not create clip for {concept}: {str(e)}")
                 # Still add a basic entry with error info
                 clips.append({
                     'concept': concept,
@@ -254,6 +305,17 @@ class VideoProcessor:
         return f"{minutes:02d}:{seconds:02d}"
 
 
+def streamlit_notify(level, message):
+    """
+    Show a status message in the running Streamlit page.
+    
+    Args:
+        level (str): One of 'info', 'success', 'warning', 'error'
+        message (str): Message text
+    """
+    getattr(st, level)(message)
+
+
 def initialize_videodb_client():
     """
     Initialize VideoDB client from API keys.
@@ -262,6 +324,9 @@ def initialize_videodb_client():
         VideoDB client or None if initialization fails
     """
     try:
+        if use_fake_backend():
+            return connect_videodb()
+        
         videodb_api_key = st.secrets.get("VIDEODB_API_KEY") or st.secrets.get("videodb_api_key")
         
         if not videodb_api_key:
@@ -271,7 +336,7 @@ def initialize_videodb_client():
         if not videodb_api_key:
             return None
         
-        return videodb.connect(api_key=videodb_api_key)
+        return connect_videodb(api_key=videodb_api_key)
         
     except Exception as e:
         st.error(f"Failed to initialize VideoDB client: {str(e)}")
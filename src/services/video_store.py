@@ -0,0 +1,364 @@
+"""
+Processed Video Store for Klipify
+Durable local storage (SQLite metadata plus blob files) for pipeline results.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from ..utils.helpers import get_data_dir
+from ..utils.transcript import CompactTranscript, as_compact_transcript
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stored_videos (
+    youtube_id TEXT PRIMARY KEY,
+    videodb_id TEXT,
+    title TEXT,
+    youtube_url TEXT,
+    duration REAL DEFAULT 0,
+    clips_count INTEGER DEFAULT 0,
+    concepts_count INTEGER DEFAULT 0,
+    processed_at TEXT,
+    blob_dir TEXT NOT NULL,
+    size_bytes INTEGER DEFAULT 0,
+    last_accessed REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_stored_videos_videodb ON stored_videos(videodb_id);
+CREATE INDEX IF NOT EXISTS idx_stored_videos_accessed ON stored_videos(last_accessed);
+"""
+
+# Artifacts kept in artifacts.json; the transcript is stored separately in
+# the compact binary format
+_ARTIFACT_KEYS = ('summary', 'concepts', 'clips', 'notes', 'processed_at', 'duration', 'degraded',
+                  'chapters')
+
+_TRANSCRIPT_FILE = "transcript.klpt"
+_TRANSCRIPT_TEXT_FILE = "transcript.txt"
+_ARTIFACTS_FILE = "artifacts.json"
+
+DEFAULT_MAX_STORE_MB = 2048
+
+
+class VideoStore:
+    """Stores processed video artifacts keyed by YouTube ID and VideoDB ID."""
+
+    _init_lock = threading.Lock()
+    _initialized_paths = set()
+
+    def __init__(self, root_dir=None, max_bytes=None):
+        """
+        Initialize the store.
+
+        Args:
+            root_dir (str, optional): Store directory (defaults to data/store)
+            max_bytes (int, optional): Size budget before LRU eviction
+                (defaults to KLIPIFY_STORE_MAX_MB or 2 GB)
+        """
+        self.root_dir = root_dir or get_data_dir("store")
+        self.blob_root = os.path.join(self.root_dir, "blobs")
+        os.makedirs(self.blob_root, exist_ok=True)
+        self.db_path = os.path.join(self.root_dir, "store.db")
+
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("KLIPIFY_STORE_MAX_MB", DEFAULT_MAX_STORE_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+
+        self._ensure_schema()
+
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection; SQLite handles cross-session locking."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.row_factory = sqlite3.Row
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _ensure_schema(self):
+        """Create tables on first use of a database file."""
+        with self._init_lock:
+            if self.db_path in self._initialized_paths:
+                return
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+            self._initialized_paths.add(self.db_path)
+
+    def save_video(self, video_data):
+        """
+        Persist a processed video's artifacts.
+
+        Args:
+            video_data (dict): Processed video data from the pipeline
+
+        Returns:
+            int: Bytes used by the stored artifacts
+        """
+        youtube_id = video_data.get('youtube_id')
+        if not youtube_id:
+            raise ValueError("Cannot store a video without a YouTube ID")
+
+        # Write into a fresh directory so readers never see partial files
+        blob_dir = f"{youtube_id}-{uuid.uuid4().hex[:8]}"
+        blob_path = os.path.join(self.blob_root, blob_dir)
+        os.makedirs(blob_path)
+
+        transcript = as_compact_transcript(video_data.get('transcript_segments'))
+        transcript.save(os.path.join(blob_path, _TRANSCRIPT_FILE))
+        with open(os.path.join(blob_path, _TRANSCRIPT_TEXT_FILE), "w", encoding="utf-8") as handle:
+            handle.write(video_data.get('transcript_text') or "")
+
+        artifacts = {key: video_data.get(key) for key in _ARTIFACT_KEYS}
+        with open(os.path.join(blob_path, _ARTIFACTS_FILE), "w", encoding="utf-8") as handle:
+            json.dump(artifacts, handle, default=str)
+
+        size_bytes = _directory_size(blob_path)
+
+        with self._connect() as conn:
+            previous = conn.execute(
+                "SELECT blob_dir FROM stored_videos WHERE youtube_id = ?", (youtube_id,)
+            ).fetchone()
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO stored_videos (
+                    youtube_id, videodb_id, title, youtube_url, duration, clips_count,
+                    concepts_count, processed_at, blob_dir, size_bytes, last_accessed
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    youtube_id,
+                    video_data.get('videodb_id'),
+                    video_data.get('title') or youtube_id,
+                    video_data.get('youtube_url'),
+                    video_data.get('duration') or transcript.duration,
+                    len(video_data.get('clips') or []),
+                    len(video_data.get('concepts') or []),
+                    video_data.get('processed_at'),
+                    blob_dir,
+                    size_bytes,
+                    time.time(),
+                )
+            )
+
+        if previous and previous['blob_dir'] != blob_dir:
+            self._remove_blob_dir(previous['blob_dir'])
+
+        self.evict()
+        return size_bytes
+
+    def _find_row(self, conn, key):
+        """Look up a stored video by YouTube ID or VideoDB ID."""
+        return conn.execute(
+            "SELECT * FROM stored_videos WHERE youtube_id = ? OR videodb_id = ? LIMIT 1",
+            (key, key)
+        ).fetchone()
+
+    def has_video(self, key):
+        """
+        Check whether a video is stored.
+
+        Args:
+            key (str): YouTube ID or VideoDB ID
+
+        Returns:
+            bool: True if the video is in the store
+        """
+        with self._connect() as conn:
+            return self._find_row(conn, key) is not None
+
+    def load_video(self, key):
+        """
+        Load a stored video's artifacts and mark it as recently used.
+
+        Args:
+            key (str): YouTube ID or VideoDB ID
+
+        Returns:
+            dict: Video data in the pipeline's format, or None if not stored
+        """
+        # A concurrent save_video can replace the row and remove the blob
+        # directory between reading the row and opening its files, so a failed
+        # read is retried once against the current row
+        for attempt in range(2):
+            with self._connect() as conn:
+                row = self._find_row(conn, key)
+                if row is None:
+                    return None
+                conn.execute(
+                    "UPDATE stored_videos SET last_accessed = ? WHERE youtube_id = ?",
+                    (time.time(), row['youtube_id'])
+                )
+
+            try:
+                artifacts, transcript_text, transcript = self._read_blobs(row['blob_dir'])
+                break
+            except (OSError, ValueError):
+                if attempt == 0:
+                    continue
+                # Blob files went missing or are corrupt; drop only the record
+                # that was read, never a newer one written meanwhile
+                self._delete_entry(row['youtube_id'], row['blob_dir'])
+                return None
+
+        video_data = {
+            'youtube_id': row['youtube_id'],
+            'youtube_url': row['youtube_url'],
+            'videodb_id': row['videodb_id'],
+            'title': row['title'],
+            'transcript_text': transcript_text,
+            'transcript_segments': transcript,
+        }
+        video_data.update(artifacts)
+        if not video_data.get('duration'):
+            video_data['duration'] = row['duration']
+        return video_data
+
+    def _read_blobs(self, blob_dir):
+        """Read a stored video's artifacts, transcript text and compact transcript."""
+        blob_path = os.path.join(self.blob_root, blob_dir)
+        with open(os.path.join(blob_path, _ARTIFACTS_FILE), encoding="utf-8") as handle:
+            artifacts = json.load(handle)
+        with open(os.path.join(blob_path, _TRANSCRIPT_TEXT_FILE), encoding="utf-8") as handle:
+            transcript_text = handle.read()
+        # Memory-map where the OS allows replacing mapped files
+        transcript = CompactTranscript.load(
+            os.path.join(blob_path, _TRANSCRIPT_FILE),
+            use_mmap=os.name != 'nt'
+        )
+        return artifacts, transcript_text, transcript
+
+    def _delete_entry(self, youtube_id, blob_dir):
+        """Remove a stored video only if its row still points at blob_dir."""
+        with self._connect() as conn:
+            deleted = conn.execute(
+                "DELETE FROM stored_videos WHERE youtube_id = ? AND blob_dir = ?",
+                (youtube_id, blob_dir)
+            ).rowcount
+        if deleted:
+            self._remove_blob_dir(blob_dir)
+        return bool(deleted)
+
+    def list_videos(self):
+        """
+        List stored videos, most recently used first.
+
+        Returns:
+            list: Metadata dicts (no artifacts are loaded)
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT youtube_id, videodb_id, title, youtube_url, duration, clips_count,
+                       concepts_count, processed_at, size_bytes, last_accessed
+                FROM stored_videos ORDER BY last_accessed DESC
+                """
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def delete_video(self, key):
+        """
+        Remove a stored video and its blob files.
+
+        Args:
+            key (str): YouTube ID or VideoDB ID
+
+        Returns:
+            bool: True if a video was removed
+        """
+        with self._connect() as conn:
+            row = self._find_row(conn, key)
+            if row is None:
+                return False
+            conn.execute("DELETE FROM stored_videos WHERE youtube_id = ?", (row['youtube_id'],))
+
+        self._remove_blob_dir(row['blob_dir'])
+        return True
+
+    def get_stats(self):
+        """
+        Get size accounting for the store.
+
+        Returns:
+            dict: Video count, total bytes used and the configured budget
+        """
+        with self._connect() as conn:
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM stored_videos"
+            ).fetchone()
+        return {'videos': count, 'size_bytes': total, 'max_bytes': self.max_bytes}
+
+    def evict(self, max_bytes=None):
+        """
+        Evict least recently used videos until the store fits its budget.
+
+        Args:
+            max_bytes (int, optional): Budget override
+
+        Returns:
+            list: YouTube IDs that were evicted
+        """
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        evicted = []
+
+        with self._connect() as conn:
+            total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM stored_videos").fetchone()[0]
+            if total <= budget:
+                return evicted
+
+            rows = conn.execute(
+                "SELECT youtube_id, blob_dir, size_bytes FROM stored_videos ORDER BY last_accessed ASC"
+            ).fetchall()
+            for row in rows:
+                if total <= budget:
+                    break
+                conn.execute("DELETE FROM stored_videos WHERE youtube_id = ?", (row['youtube_id'],))
+                total -= row['size_bytes']
+                evicted.append((row['youtube_id'], row['blob_dir']))
+
+        for _youtube_id, blob_dir in evicted:
+            self._remove_blob_dir(blob_dir)
+
+        return [youtube_id for youtube_id, _blob_dir in evicted]
+
+    def _remove_blob_dir(self, blob_dir):
+        """Delete a blob directory, tolerating files still held open elsewhere."""
+        shutil.rmtree(os.path.join(self.blob_root, blob_dir), ignore_errors=True)
+
+
+def _directory_size(path):
+    """Total size in bytes of the files directly inside a directory."""
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_video_store():
+    """
+    Get the shared process-wide video store, or None if it cannot be opened.
+
+    Returns:
+        VideoStore or None
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = VideoStore()
+            except (OSError, sqlite3.Error):
+                return None
+        return _store
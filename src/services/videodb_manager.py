@@ -3,9 +3,12 @@ VideoDB Video Management Service
 Handles listing, managing, and deleting videos from VideoDB
 """
 
+import threading
 import streamlit as st
-from videodb import connect
-import requests
+from .backends import connect_videodb, use_fake_backend
+from .bulk_operations import run_bulk
+from .collection_mirror import DEFAULT_PAGE_SIZE, get_collection_mirror, video_info
+from .metrics import track_call
 
 
 class VideoDBManager:
@@ -13,14 +16,18 @@ class VideoDBManager:
     
     def __init__(self):
         self.conn = None
+        self._collection = None
         self._connect()
     
     def _connect(self):
         """Connect to VideoDB using stored credentials."""
         try:
+            if use_fake_backend():
+                self.conn = connect_videodb()
+                return True
             api_key = st.secrets.get("VIDEODB_API_KEY")
             if api_key:
-                self.conn = connect(api_key=api_key)
+                self.conn = connect_videodb(api_key=api_key)
                 return True
         except Exception as e:
             st.error(f"Failed to connect to VideoDB: {e}")
@@ -33,50 +40,171 @@ class VideoDBManager:
         
         try:
             # Get collection (assuming default collection)
-            collection = self.conn.get_collection()
-            videos = collection.get_videos()
-            
-            video_list = []
-            for video in videos:
-                video_info = {
-                    'id': video.id,
-                    'name': video.name or 'Untitled',
-                    'description': getattr(video, 'description', '') or '',
-                    'length': getattr(video, 'length', 0),
-                    'upload_date': getattr(video, 'created_at', 'Unknown'),
-                    'status': getattr(video, 'status', 'Unknown'),
-                    'thumbnail': getattr(video, 'thumbnail_url', ''),
-                    'stream_url': getattr(video, 'stream_url', ''),
-                }
-                video_list.append(video_info)
+            with track_call('videodb', 'get_videos'):
+                collection = self.conn.get_collection()
+                videos = collection.get_videos()
             
-            return video_list
+            return [video_info(video) for video in videos]
         except Exception as e:
             st.error(f"Error listing videos: {e}")
             return []
     
+    def sync_videos(self, force=False):
+        """
+        Update the local mirror of the collection listing.
+        
+        Args:
+            force (bool): Sync even if the mirror was synced recently
+            
+        Returns:
+            dict: Sync counts from CollectionMirror.sync, or None if unavailable
+        """
+        mirror = get_collection_mirror()
+        if not self.conn or not mirror:
+            return None
+        
+        try:
+            return mirror.sync(self._get_collection(), force=force)
+        except Exception as e:
+            st.error(f"Error syncing videos: {e}")
+            return None
+    
+    def query_videos(self, search_term=None, page=0, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Filter and page the mirrored collection, syncing it first if stale.
+        
+        Args:
+            search_term (str, optional): Match on name or description
+            page (int): Zero-based page number
+            page_size (int): Videos per page
+            
+        Returns:
+            dict: Page of videos and totals from CollectionMirror.query, or None
+        """
+        mirror = get_collection_mirror()
+        if not self.conn or not mirror:
+            return None
+        
+        self.sync_videos()
+        return mirror.query(self._collection_id(), search_term, page, page_size)
+    
+    def mirror_state(self):
+        """Get the last sync time and video count of the mirrored collection."""
+        mirror = get_collection_mirror()
+        if not self.conn or not mirror:
+            return None
+        return mirror.get_state(self._collection_id())
+    
+    def _get_collection(self):
+        """Get the default collection, fetched once per manager."""
+        if self._collection is None:
+            with track_call('videodb', 'get_collection'):
+                self._collection = self.conn.get_collection()
+        return self._collection
+    
+    def _collection_id(self):
+        """ID of the default collection, used to key the mirror."""
+        return getattr(self._get_collection(), 'id', None) or "default"
+    
     def delete_video(self, video_id):
         """Delete a video from VideoDB."""
         if not self.conn:
             return False
         
         try:
-            collection = self.conn.get_collection()
-            video = collection.get_video(video_id)
-            video.delete()
+            with track_call('videodb', 'get_video'):
+                collection = self.conn.get_collection()
+                video = collection.get_video(video_id)
+            with track_call('videodb', 'delete'):
+                video.delete()
+            
+            mirror = get_collection_mirror()
+            if mirror:
+                mirror.remove_video(self._collection_id(), video_id)
             return True
         except Exception as e:
             st.error(f"Error deleting video: {e}")
             return False
     
+    def delete_videos(self, video_ids, on_progress=None, max_workers=None):
+        """
+        Delete many videos concurrently.
+        
+        The collection is fetched once for the whole batch, and each delete
+        is retried before it is reported as failed.
+        
+        Args:
+            video_ids (list): VideoDB video IDs
+            on_progress (callable, optional): See bulk_operations.run_bulk
+            max_workers (int, optional): Concurrent deletes
+            
+        Returns:
+            BulkResult: Deleted IDs and per-video errors
+        """
+        if not self.conn:
+            raise Exception("Not connected to VideoDB")
+        
+        collection = self._get_collection()
+        collection_id = getattr(collection, 'id', None) or "default"
+        mirror = get_collection_mirror()
+        
+        def delete(video_id):
+            delete_by_id = getattr(collection, 'delete_video', None)
+            if delete_by_id:
+                with track_call('videodb', 'delete'):
+                    delete_by_id(video_id)
+            else:
+                with track_call('videodb', 'get_video'):
+                    video = collection.get_video(video_id)
+                with track_call('videodb', 'delete'):
+                    video.delete()
+            if mirror:
+                mirror.remove_video(collection_id, video_id)
+            return True
+        
+        return run_bulk('delete', video_ids, delete, max_workers=max_workers, on_progress=on_progress)
+    
+    def generate_clips_for_videos(self, video_ids, on_progress=None, max_workers=None):
+        """
+        Generate clips for many existing videos concurrently.
+        
+        Failed videos are not retried here: rerunning the pipeline would
+        repeat every paid Gemini call that had already succeeded. They stay
+        selected in My Videos for a manual retry.
+        
+        Args:
+            video_ids (list): VideoDB video IDs
+            on_progress (callable, optional): See bulk_operations.run_bulk
+            max_workers (int, optional): Videos processed at once
+            
+        Returns:
+            BulkResult: Generated results per video ID and per-video errors
+        """
+        if not self.conn:
+            raise Exception("Not connected to VideoDB")
+        
+        collection = self._get_collection()
+        
+        def generate(video_id):
+            with track_call('videodb', 'get_video'):
+                video = collection.get_video(video_id)
+            result = self._generate_clips(video)
+            if not result.get('success'):
+                raise Exception((result or {}).get('error') or "No clips were generated")
+            return result
+        
+        return run_bulk('generate_clips', video_ids, generate, max_workers=max_workers, retries=0,
+                        on_progress=on_progress)
+    
     def get_video_details(self, video_id):
         """Get detailed information about a specific video."""
         if not self.conn:
             return None
         
         try:
-            collection = self.conn.get_collection()
-            video = collection.get_video(video_id)
+            with track_call('videodb', 'get_video'):
+                collection = self.conn.get_collection()
+                video = collection.get_video(video_id)
             
             # Get video details including clips if any
             details = {
@@ -97,28 +225,70 @@ class VideoDBManager:
             st.error(f"Error getting video details: {e}")
             return None
     
-    def generate_clips_from_existing(self, video_id, concepts=None):
-        """Generate clips from an existing VideoDB video."""
+    def generate_clips_from_existing(self, video_id, concepts=None, reporter=None):
+        """
+        Generate clips from an existing VideoDB video.
+        
+        Args:
+            video_id (str): VideoDB video ID
+            concepts (list, optional): Concepts to clip instead of the stored
+                or extracted ones
+            reporter (optional): Progress reporter for the pipeline (see
+                processing.StreamlitReporter); defaults to silent
+            
+        Returns:
+            dict: {'success': True, 'video_data': dict} or
+                {'success': False, 'error': str}; None if not connected
+        """
         if not self.conn:
             return None
         
         try:
-            from ..services.video_service import VideoService
-            
             # Get the video
-            collection = self.conn.get_collection()
-            video = collection.get_video(video_id)
+            with track_call('videodb', 'get_video'):
+                video = self._get_collection().get_video(video_id)
             
-            # Create VideoService instance and generate clips
-            video_service = VideoService()
+            return self._generate_clips(video, concepts, reporter)
+        except Exception as e:
+            st.error(f"Error generating clips from existing video: {e}")
+            return {'success': False, 'error': str(e)}
+    
+    def _generate_clips(self, video, concepts=None, reporter=None):
+        """
+        Run the processing pipeline on a fetched video.
+        
+        Reuses the transcript, summary, concepts and notes stored for the
+        video, so only missing stages call VideoDB or Gemini.
+        
+        Returns:
+            dict: {'success': True, 'video_data': dict} or
+                {'success': False, 'error': str}
+        """
+        # Imported here so My Videos loads without the processing pipeline
+        from ..processing import SilentReporter, VideoProcessingPipeline
+        from .ai_service import initialize_genai_client
+        from .video_store import get_video_store
+        
+        try:
+            ai_client = initialize_genai_client()
+            if not ai_client:
+                raise Exception("Gemini is not configured")
             
-            # Generate clips using the same logic as new uploads
-            clips_data = video_service.generate_clips_from_video(video, concepts)
+            video_store = get_video_store()
+            stored = (video_store.load_video(video.id) if video_store else None) or {}
+            if concepts:
+                # Explicit concepts replace the stored ones
+                degraded = {
+                    stage: reason for stage, reason in (stored.get('degraded') or {}).items()
+                    if stage != 'concepts'
+                }
+                stored = dict(stored, concepts=list(concepts), degraded=degraded)
             
-            return clips_data
+            pipeline = VideoProcessingPipeline(self.conn, ai_client, reporter=reporter or SilentReporter())
+            video_data = pipeline.regenerate(video, stored=stored)
+            return {'success': True, 'video_data': video_data}
         except Exception as e:
-            st.error(f"Error generating clips from existing video: {e}")
-            return None
+            return {'success': False, 'error': str(e)}
     
     def format_duration(self, seconds):
         """Format duration in seconds to human readable format."""
@@ -148,5 +318,22 @@ class VideoDBManager:
         return f"{bytes_size:.1f} PB"
 
 
-# Global instance
-video_db_manager = VideoDBManager()
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_video_db_manager():
+    """
+    Get the shared VideoDB manager, connecting on first use.
+
+    A manager that failed to connect is replaced on the next call, so a
+    key added after startup is picked up without a restart.
+
+    Returns:
+        VideoDBManager: Shared manager instance
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None or _manager.conn is None:
+            _manager = VideoDBManager()
+        return _manager
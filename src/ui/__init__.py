@@ -1,38 +1,44 @@
 """
 UI Components Package
 Contains all user interface elements and styling.
+
+Components are imported on first access (see ui_components), so importing
+this package does not load every page module.
 """
 
-# Import from the old components.py file directly (avoiding circular imports)
-from .components import load_css, create_header, create_feature_showcase
-from .displays import display_content_tabs, display_sidebar_input
-
-# Also re-export the new modular components
-from .ui_components import (
-    load_modern_css, 
-    create_landing_page, 
-    create_sidebar_navigation,
-    show_clips_page,
-    show_summary_page, 
-    show_notes_page,
-    show_chat_page,
-    show_my_videos_page
-)
-
-__all__ = [
+import importlib
+
+# Component name -> module that defines it
+_COMPONENTS = {
     # Legacy components (for klipify_main.py)
-    'load_css',
-    'create_header', 
-    'create_feature_showcase',
-    'display_content_tabs',
-    'display_sidebar_input',
+    'load_css': '.components',
+    'create_header': '.components',
+    'create_feature_showcase': '.components',
+    'display_content_tabs': '.displays',
+    'display_sidebar_input': '.displays',
     # New modular components (for klipify_new_ui.py)
-    'load_modern_css',
-    'create_landing_page',
-    'create_sidebar_navigation',
-    'show_clips_page',
-    'show_summary_page',
-    'show_notes_page',
-    'show_chat_page',
-    'show_my_videos_page'
-]
+    'load_modern_css': '.ui_components',
+    'create_landing_page': '.ui_components',
+    'create_sidebar_navigation': '.ui_components',
+    'show_clips_page': '.ui_components',
+    'show_summary_page': '.ui_components',
+    'show_notes_page': '.ui_components',
+    'show_chat_page': '.ui_components',
+    'show_my_videos_page': '.ui_components'
+}
+
+__all__ = list(_COMPONENTS)
+
+
+def __getattr__(name):
+    """Import a component's module the first time the component is used."""
+    module_name = _COMPONENTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
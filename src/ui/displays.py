@@ -107,12 +107,10 @@ def display_notes_tab(video_data):
     
     # Raw transcript with timestamps (collapsible)
     with st.expander("📄 Full Transcript with Timestamps"):
-        transcript_segments = video_data['transcript_segments']
+        # Imported here so the notes page module still loads on first use
+        from .ui_components.notes_page import render_virtual_transcript
         
-        for segment in transcript_segments:
-            start_time = _format_timestamp(segment.get('start', 0))
-            text = segment.get('text', '')
-            st.write(f"**[{start_time}]** {text}")
+        render_virtual_transcript(video_data['transcript_segments'], video_data.get('youtube_id', ''))
 
 
 def display_chat_tab(video_data):
@@ -149,9 +147,14 @@ def display_chat_tab(video_data):
                     ai_service = AIService(genai_client)
                     
                     try:
+                        # Ground the answer in the transcript without keeping a copy in session state
+                        chat_context = dict(
+                            st.session_state.video_context,
+                            transcript=video_data.get('transcript_text', '')
+                        )
                         ai_response = ai_service.chat_with_assistant(
                             user_input, 
-                            st.session_state.video_context,
+                            chat_context,
                             st.session_state.chat_history
                         )
                         st.write(ai_response)
@@ -229,10 +232,3 @@ def display_error_state():
         "Setup Instructions",
         create_setup_instructions()
     )
-
-
-def _format_timestamp(seconds):
-    """Convert seconds to MM:SS format."""
-    minutes = int(seconds // 60)
-    seconds = int(seconds % 60)
-    return f"{minutes:02d}:{seconds:02d}"
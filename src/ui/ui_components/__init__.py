@@ -1,32 +1,43 @@
 """
 Main components module for Klipify UI.
 Re-exports all components for easy importing.
+
+Component modules are imported on first access, so a cold start only
+loads the pages it actually renders.
 """
 
-# Import styles
-from ..styles.main_styles import load_modern_css
+import importlib
 
-# Import components from the new modular structure
-from .landing_page import create_landing_page, show_quick_start_guide
-from .navigation import create_sidebar_navigation, show_sidebar_metrics
-from .clips_page import show_clips_page
-from .summary_page import show_summary_page
-from .notes_page import show_notes_page
-from .chat_page import show_chat_page, handle_chat_message, add_quick_question
-from .video_management import show_my_videos_page
+# Component name -> module that defines it
+_COMPONENTS = {
+    'load_modern_css': '..styles.main_styles',
+    'create_landing_page': '.landing_page',
+    'show_quick_start_guide': '.landing_page',
+    'create_sidebar_navigation': '.navigation',
+    'show_sidebar_metrics': '.navigation',
+    'show_clips_page': '.clips_page',
+    'show_summary_page': '.summary_page',
+    'show_notes_page': '.notes_page',
+    'show_chat_page': '.chat_page',
+    'handle_chat_message': '.chat_page',
+    'add_quick_question': '.chat_page',
+    'show_my_videos_page': '.video_management',
+    'show_profiler_panel': '.profiler_panel'
+}
 
 # Re-export everything for backward compatibility
-__all__ = [
-    'load_modern_css',
-    'create_landing_page',
-    'show_quick_start_guide', 
-    'create_sidebar_navigation',
-    'show_sidebar_metrics',
-    'show_clips_page',
-    'show_summary_page', 
-    'show_notes_page',
-    'show_chat_page',
-    'handle_chat_message',
-    'add_quick_question',
-    'show_my_videos_page'
-]
+__all__ = list(_COMPONENTS)
+
+
+def __getattr__(name):
+    """Import a component's module the first time the component is used."""
+    module_name = _COMPONENTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
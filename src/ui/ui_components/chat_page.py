@@ -4,6 +4,7 @@ Chat page component for AI assistant functionality.
 
 import streamlit as st
 import time
+from ...utils.helpers import rerun_fragment
 
 def show_chat_page(video_data):
     """Display the professional AI chat interface."""
@@ -22,6 +23,12 @@ def show_chat_page(video_data):
     if not st.session_state.get('video_context'):
         _set_video_context(video_data)
     
+    _show_chat_panel()
+
+
+@st.fragment
+def _show_chat_panel():
+    """Display quick actions, history and input; reruns on its own per message."""
     # Professional quick actions
     st.markdown("""
     <div class="section-header">
@@ -155,7 +162,8 @@ def handle_chat_message(user_input):
             'timestamp': timestamp
         })
     
-    st.rerun()
+    # Redraw just the chat panel with the new messages
+    rerun_fragment()
 
 
 def _get_ai_response(user_input):
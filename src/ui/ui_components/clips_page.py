@@ -4,6 +4,7 @@ Clips page component for displaying video clips.
 
 import streamlit as st
 from ...utils.helpers import create_youtube_link
+from ...utils.video_utils import display_clip_player
 
 def show_clips_page(video_data):
     """Display the clips page with professional design."""
@@ -47,6 +48,12 @@ def show_clips_page(video_data):
     
     st.markdown("---")
     
+    _show_clip_list(clips, youtube_id)
+
+
+@st.fragment
+def _show_clip_list(clips, youtube_id):
+    """Display the filterable clip list; filtering only reruns this fragment."""
     # Filter and search
     col1, col2 = st.columns([3, 1])
     with col1:
@@ -55,21 +62,17 @@ def show_clips_page(video_data):
         show_only_playable = st.checkbox("Show only playable", value=False)
     
     # Filter clips
-    filtered_clips = clips
-    if search_term:
-        search_lower = search_term.lower()
-        filtered_clips = [
-            clip for clip in clips
-            if search_lower in clip.get('concept', '').lower()
-        ]
-    
-    if show_only_playable:
-        filtered_clips = [clip for clip in filtered_clips if clip.get('playable', False)]
+    filtered_clips = _filter_clips(clips, search_term, show_only_playable)
     
     if not filtered_clips:
         st.info(f"No clips found matching your filters.")
         return
     
+    # One player for every clip in the list, so hls.js loads once per page
+    if st.toggle("🎥 Watch clips here", key="clip_player_open",
+                 help="Play the listed clips in one in-page player"):
+        display_clip_player([clip for clip in filtered_clips if clip.get('playable', False)])
+    
     # Display clips professionally
     for i, clip in enumerate(filtered_clips):
         # Skip clips with errors
@@ -126,6 +129,22 @@ def show_clips_page(video_data):
     """, unsafe_allow_html=True)
 
 
+def _filter_clips(clips, search_term, only_playable=False):
+    """Filter clips by concept text and playability."""
+    filtered_clips = clips
+    if search_term:
+        search_lower = search_term.lower()
+        filtered_clips = [
+            clip for clip in clips
+            if search_lower in clip.get('concept', '').lower()
+        ]
+    
+    if only_playable:
+        filtered_clips = [clip for clip in filtered_clips if clip.get('playable', False)]
+    
+    return filtered_clips
+
+
 def _format_timestamp(seconds):
     """Convert seconds to MM:SS format."""
     if not seconds:
@@ -69,6 +69,7 @@ def create_sidebar_navigation():
             # Modern quick actions
             if st.button("🔄 Process New Video", use_container_width=True, type="secondary"):
                 st.session_state.clear()
+                st.query_params.clear()
                 st.rerun()
                 
         else:
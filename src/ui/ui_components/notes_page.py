@@ -2,8 +2,30 @@
 Notes page component for displaying interactive notes and transcript.
 """
 
+import html
+import json
+import os
+import threading
+from collections import OrderedDict
 import streamlit as st
-from ...utils.helpers import create_youtube_link
+from ...utils.helpers import create_youtube_link, rerun_fragment
+from ...utils.transcript import as_compact_transcript
+from ...utils.transcript_index import build_transcript_index
+
+
+# "Segments per page" choice that switches to the virtualized scroll view
+SCROLL_ALL = "All (scroll)"
+
+# Row height of the virtualized transcript in pixels (two lines of text)
+VIRTUAL_ROW_HEIGHT = 64
+
+# Rendered transcript pages and scroll views, shared across sessions and reruns.
+# Scroll views embed the whole transcript, so the cache is bounded by size.
+DEFAULT_HTML_CACHE_MB = 32
+_HTML_CACHE_MAX_BYTES = int(float(os.getenv("KLIPIFY_HTML_CACHE_MAX_MB", DEFAULT_HTML_CACHE_MB)) * 1024 * 1024)
+_html_cache = OrderedDict()
+_html_cache_bytes = 0
+_html_cache_lock = threading.Lock()
 
 def show_notes_page(video_data):
     """Display the notes page with professional design."""
@@ -16,10 +38,10 @@ def show_notes_page(video_data):
     
     # Professional metrics
     col1, col2, col3 = st.columns(3)
-    transcript_segments = video_data.get('transcript_segments', [])
+    transcript_segments = as_compact_transcript(video_data.get('transcript_segments'))
     
     with col1:
-        word_count = sum(len(segment.get('text', '').split()) for segment in transcript_segments)
+        word_count = transcript_segments.total_words
         st.metric("Word Count", f"{word_count:,}")
     
     with col2:
@@ -36,6 +58,24 @@ def show_notes_page(video_data):
     
     st.markdown("---")
     
+    youtube_id = video_data.get('youtube_id', '')
+    
+    # Videos processed before chapters existed get them segmented once here
+    chapters = video_data.get('chapters')
+    if chapters is None and transcript_segments:
+        from ...services.topic_segmentation import segment_chapters
+        chapters = segment_chapters(transcript_segments)
+        video_data['chapters'] = chapters
+    
+    if chapters and len(chapters) > 1:
+        st.markdown("""
+        <div class="section-header">
+            <h3>🧭 Chapters</h3>
+        </div>
+        """, unsafe_allow_html=True)
+        st.markdown(_chapters_html(chapters, youtube_id, transcript_segments), unsafe_allow_html=True)
+        st.markdown("---")
+    
     # Study notes section
     notes = video_data.get('notes', '')
     if notes and notes != 'No notes available.':
@@ -46,7 +86,6 @@ def show_notes_page(video_data):
         """, unsafe_allow_html=True)
         
         # Clean and escape the notes content to prevent HTML rendering issues
-        import html
         clean_notes = html.escape(notes) if notes else ""
         clean_notes = clean_notes.replace('\\n', '<br>')
         
@@ -65,10 +104,13 @@ def show_notes_page(video_data):
     </div>
     """, unsafe_allow_html=True)
     
-    youtube_id = video_data.get('youtube_id', '')
-    
     if transcript_segments:
-        _show_transcript_section(transcript_segments, youtube_id)
+        # Videos processed before indexing existed get their index built once here
+        transcript_index = video_data.get('transcript_index')
+        if transcript_index is None:
+            transcript_index = build_transcript_index(transcript_segments)
+            video_data['transcript_index'] = transcript_index
+        _show_transcript_section(transcript_segments, youtube_id, transcript_index, chapters or [])
     else:
         st.markdown("""
         <div class="empty-state">
@@ -78,8 +120,14 @@ def show_notes_page(video_data):
         """, unsafe_allow_html=True)
 
 
-def _show_transcript_section(transcript_segments, youtube_id):
-    """Display the interactive transcript with search functionality."""
+@st.fragment
+def _show_transcript_section(transcript_segments, youtube_id, transcript_index, chapters):
+    """
+    Display the interactive transcript with search functionality.
+    
+    Runs as a fragment, so searching, paging and picking a chapter only
+    rerun this section.
+    """
     # Enhanced search functionality with better UX
     st.markdown("""
     <div class="section-header">
@@ -92,31 +140,51 @@ def _show_transcript_section(transcript_segments, youtube_id):
         search_term = st.text_input(
             "🔍 Search transcript...", 
             placeholder="Find specific content in the video",
-            help="Search through all transcript segments to find specific topics or keywords"
+            help='Search words in the transcript. Use word* for prefixes and "quotes" for exact phrases'
         )
     with col2:
         segments_per_page = st.selectbox(
             "Segments per page", 
-            [10, 25, 50, 100], 
+            [10, 25, 50, 100, SCROLL_ALL], 
             index=1,
-            help="Number of transcript segments to display per page"
+            help="Number of transcript segments to display per page, or scroll through all of them"
         )
     with col3:
         if st.button("🗑️ Clear", help="Clear search and show all segments"):
-            st.rerun()
+            rerun_fragment()
+    
+    # Limit the transcript to one chapter
+    first_segment, stop_segment = 0, len(transcript_segments)
+    chapter_number = None
+    if len(chapters) > 1:
+        chapter_number = st.selectbox(
+            "🧭 Chapter",
+            [None] + list(range(len(chapters))),
+            format_func=lambda number: "All chapters" if number is None else (
+                f"{_format_timestamp(chapters[number]['start'])} · {chapters[number]['title']}"
+            ),
+            help="Show only the transcript of one chapter"
+        )
+        if chapter_number is not None:
+            first_segment = chapters[chapter_number]['first_segment']
+            stop_segment = chapters[chapter_number]['stop_segment']
     
-    # Filter segments based on search
+    # Start from the first page whenever the query or chapter changes
+    if st.session_state.get('transcript_search_query') != (search_term, chapter_number):
+        st.session_state.transcript_search_query = (search_term, chapter_number)
+        st.session_state.transcript_page = 0
+    
+    # Look up matching segments in the inverted index
+    search_result = None
     if search_term:
-        search_lower = search_term.lower()
-        filtered_segments = [
-            segment for segment in transcript_segments
-            if search_lower in segment.get('text', '').lower()
-        ]
+        search_result = transcript_index.search(search_term)
+        if chapter_number is not None:
+            search_result = search_result.within(first_segment, stop_segment)
         
-        if filtered_segments:
+        if search_result:
             st.markdown(f"""
             <div class="search-results-info">
-                Found {len(filtered_segments)} segments containing "{search_term}"
+                Found {len(search_result)} segments containing "{html.escape(search_term)}"
             </div>
             """, unsafe_allow_html=True)
         else:
@@ -126,21 +194,40 @@ def _show_transcript_section(transcript_segments, youtube_id):
             </div>
             """, unsafe_allow_html=True)
             return
+        
+        result_count = len(search_result)
     else:
-        filtered_segments = transcript_segments
+        result_count = stop_segment - first_segment
+    
+    # One scrollable list that only keeps the visible rows in the page
+    if segments_per_page == SCROLL_ALL:
+        if search_result:
+            segment_indices = search_result.segment_indices
+        elif chapter_number is not None:
+            segment_indices = range(first_segment, stop_segment)
+        else:
+            segment_indices = None
+        render_virtual_transcript(
+            transcript_segments, youtube_id,
+            segment_indices=segment_indices,
+            search_result=search_result,
+            view_key=chapter_number
+        )
+        return
     
     # Pagination
     if 'transcript_page' not in st.session_state:
         st.session_state.transcript_page = 0
     
-    total_pages = (len(filtered_segments) - 1) // segments_per_page + 1
+    total_pages = (result_count - 1) // segments_per_page + 1
+    st.session_state.transcript_page = min(st.session_state.transcript_page, total_pages - 1)
     
     if total_pages > 1:
         col1, col2, col3 = st.columns([1, 2, 1])
         with col1:
             if st.button("← Previous Page", disabled=st.session_state.transcript_page == 0):
                 st.session_state.transcript_page = max(0, st.session_state.transcript_page - 1)
-                st.rerun()
+                rerun_fragment()
         
         with col2:
             st.markdown(f"<div style='text-align: center; color: var(--text-secondary);'>Page {st.session_state.transcript_page + 1} of {total_pages}</div>", unsafe_allow_html=True)
@@ -148,45 +235,279 @@ def _show_transcript_section(transcript_segments, youtube_id):
         with col3:
             if st.button("Next Page →", disabled=st.session_state.transcript_page >= total_pages - 1):
                 st.session_state.transcript_page = min(total_pages - 1, st.session_state.transcript_page + 1)
-                st.rerun()
+                rerun_fragment()
     
     # Display segments
-    start_idx = st.session_state.transcript_page * segments_per_page
-    end_idx = start_idx + segments_per_page
-    current_segments = filtered_segments[start_idx:end_idx]
+    if search_result:
+        page_indices = search_result.page(st.session_state.transcript_page, segments_per_page)
+    else:
+        start_idx = first_segment + st.session_state.transcript_page * segments_per_page
+        page_indices = range(start_idx, min(start_idx + segments_per_page, stop_segment))
     
-    for i, segment in enumerate(current_segments):
-        start_time = segment.get('start', 0)
-        text = segment.get('text', '')
-        
-        # Clean and escape text content to prevent HTML issues
-        import html
-        clean_text = html.escape(text) if text else ""
-        
-        # Create YouTube link with timestamp
-        youtube_url = create_youtube_link(youtube_id, start_time) if youtube_id else None
-        
-        st.markdown(f"""
-        <div class="transcript-segment">
-            <div class="segment-header">
-                <span class="segment-time">{_format_timestamp(start_time)}</span>
-                {f'<a href="{youtube_url}" target="_blank" class="time-link">🔗 Jump to time</a>' if youtube_url else ''}
-            </div>
-            <div class="segment-text">{clean_text}</div>
-        </div>
-        """, unsafe_allow_html=True)
+    # The whole page goes out as one block instead of one element per segment
+    page_key = (search_term, chapter_number, st.session_state.transcript_page, segments_per_page)
+    st.markdown(
+        _transcript_page_html(transcript_segments, youtube_id, page_indices, search_result, page_key),
+        unsafe_allow_html=True
+    )
     
     # Show results summary
     if total_pages > 1 or search_term:
         st.markdown(f"""
         <div class="search-results-info">
-            📊 Showing {len(current_segments)} of {len(filtered_segments)} segments
-            {f' | 🔍 Filtered by: "{search_term}"' if search_term else ''}
+            📊 Showing {len(page_indices)} of {result_count} segments
+            {f' | 🔍 Filtered by: "{html.escape(search_term)}"' if search_term else ''}
             {f' | 📄 Page {st.session_state.transcript_page + 1} of {total_pages}' if total_pages > 1 else ''}
         </div>
         """, unsafe_allow_html=True)
 
 
+def _cached_html(key, build):
+    """Return cached HTML for key, building and caching it on a miss."""
+    global _html_cache_bytes
+    with _html_cache_lock:
+        if key in _html_cache:
+            _html_cache.move_to_end(key)
+            return _html_cache[key]
+    
+    markup = build()
+    if len(markup) > _HTML_CACHE_MAX_BYTES:
+        return markup
+    with _html_cache_lock:
+        if key not in _html_cache:
+            _html_cache[key] = markup
+            _html_cache_bytes += len(markup)
+        while _html_cache_bytes > _HTML_CACHE_MAX_BYTES:
+            _, evicted = _html_cache.popitem(last=False)
+            _html_cache_bytes -= len(evicted)
+    return markup
+
+
+def _transcript_key(transcript_segments, youtube_id):
+    """Identify a video's transcript for the HTML cache."""
+    return (youtube_id, len(transcript_segments), transcript_segments.total_words)
+
+
+def _transcript_page_html(transcript_segments, youtube_id, page_indices, search_result, page_key):
+    """
+    Build one transcript page as a single HTML block, cached per video,
+    query and page.
+    
+    Args:
+        transcript_segments (CompactTranscript): Video transcript
+        youtube_id (str): YouTube video ID for timestamp links
+        page_indices (iterable): Segment indices on the page
+        search_result (SearchResult): Active search, used for highlighting
+        page_key (tuple): (query, chapter, page number, page size)
+        
+    Returns:
+        str: Page HTML
+    """
+    def build():
+        cards = []
+        for segment_index in page_indices:
+            spans = search_result.spans(segment_index) if search_result else []
+            cards.append(_segment_html(transcript_segments[segment_index], youtube_id, spans))
+        return f'<div class="transcript-page">{"".join(cards)}</div>'
+    
+    return _cached_html(('page', _transcript_key(transcript_segments, youtube_id)) + page_key, build)
+
+
+def _chapters_html(chapters, youtube_id, transcript_segments):
+    """
+    Build the chapter index as one cached HTML block.
+    
+    Args:
+        chapters (list): Chapters from topic_segmentation.segment_chapters()
+        youtube_id (str): YouTube video ID for timestamp links
+        transcript_segments (CompactTranscript): Video transcript
+        
+    Returns:
+        str: Chapter list HTML
+    """
+    def build():
+        rows = []
+        for chapter in chapters:
+            start_time = chapter['start']
+            time_label = _format_timestamp(start_time)
+            if youtube_id:
+                time_label = (
+                    f'<a href="{create_youtube_link(youtube_id, start_time)}" target="_blank" '
+                    f'class="time-link">🔗 {time_label}</a>'
+                )
+            minutes = max(1, round((chapter['end'] - start_time) / 60))
+            rows.append(
+                f'<li><span class="segment-time">{time_label}</span> '
+                f'<strong>{html.escape(chapter["title"])}</strong> '
+                f'<span style="color: var(--text-secondary);">· {minutes} min</span></li>'
+            )
+        return f'<ol class="chapter-list">{"".join(rows)}</ol>'
+    
+    chapter_key = tuple((chapter['start'], chapter['title']) for chapter in chapters)
+    return _cached_html(('chapters', _transcript_key(transcript_segments, youtube_id), chapter_key), build)
+
+
+def _segment_html(segment, youtube_id, spans):
+    """Build the HTML card for one transcript segment."""
+    start_time = segment.get('start', 0)
+    
+    # Escape text content and mark search hits; kept on one line so a page of
+    # cards stays a single HTML block when rendered as markdown
+    clean_text = _highlight_text(segment.get('text', ''), spans).replace("\n", " ")
+    
+    # Create YouTube link with timestamp
+    youtube_url = create_youtube_link(youtube_id, start_time) if youtube_id else None
+    link = f'<a href="{youtube_url}" target="_blank" class="time-link">🔗 Jump to time</a>' if youtube_url else ''
+    
+    return (
+        f'<div class="transcript-segment"><div class="segment-header">'
+        f'<span class="segment-time">{_format_timestamp(start_time)}</span>{link}</div>'
+        f'<div class="segment-text">{clean_text}</div></div>'
+    )
+
+
+def render_virtual_transcript(transcript_segments, youtube_id, segment_indices=None,
+                              search_result=None, height=520, view_key=None):
+    """
+    Show transcript segments in a virtualized scroll view.
+    
+    Only the rows in view (plus a small overscan) exist in the page at any
+    time, so scrolling through thousands of segments stays smooth and the
+    rerun sends a single component.
+    
+    Args:
+        transcript_segments: Video transcript (CompactTranscript or list of dicts)
+        youtube_id (str): YouTube video ID for timestamp links
+        segment_indices (list, optional): Segments to show (defaults to all)
+        search_result (SearchResult, optional): Search whose hits are highlighted
+        height (int): Height of the scroll view in pixels
+        view_key (optional): Tells apart cached views of different segment
+            subsets with the same query (e.g. the selected chapter)
+    """
+    import streamlit.components.v1 as components
+    
+    transcript_segments = as_compact_transcript(transcript_segments)
+    query = search_result.query if search_result else None
+    key = ('scroll', _transcript_key(transcript_segments, youtube_id), query, view_key, height)
+    
+    def build():
+        indices = range(len(transcript_segments)) if segment_indices is None else segment_indices
+        rows = []
+        for segment_index in indices:
+            row = [round(transcript_segments.starts[segment_index], 2), transcript_segments.text_at(segment_index)]
+            if search_result:
+                row.append(search_result.spans(segment_index))
+            rows.append(row)
+        return _virtual_transcript_html(rows, youtube_id, height)
+    
+    components.html(_cached_html(key, build), height=height + 40)
+
+
+def _virtual_transcript_html(rows, youtube_id, height):
+    """Build the self-contained scroll view for [start, text, spans?] rows."""
+    # Escape "</" so transcript text can never close the script element
+    data = json.dumps({'rows': rows, 'youtubeId': youtube_id or ''}).replace("</", "<\\/")
+    
+    return f"""
+<style>
+  body {{ margin: 0; font-family: "Source Sans Pro", sans-serif; color: #1f2937; }}
+  .meta {{ font-size: 0.8rem; color: #6b7280; margin-bottom: 6px; }}
+  .viewport {{ height: {height}px; overflow-y: auto; border: 1px solid #e5e7eb; border-radius: 8px; }}
+  .spacer {{ position: relative; }}
+  .row {{ position: absolute; left: 0; right: 0; height: {VIRTUAL_ROW_HEIGHT}px; box-sizing: border-box;
+          padding: 6px 12px; border-bottom: 1px solid #f3f4f6; }}
+  .time {{ font-family: "SF Mono", Monaco, monospace; font-size: 0.8rem; color: #2563eb; text-decoration: none; }}
+  .text {{ font-size: 0.9rem; line-height: 1.35; overflow: hidden; display: -webkit-box;
+           -webkit-line-clamp: 2; -webkit-box-orient: vertical; }}
+  mark {{ background: #dbeafe; color: inherit; padding: 0 1px; border-radius: 2px; }}
+</style>
+<div class="meta" id="meta"></div>
+<div class="viewport" id="viewport"><div class="spacer" id="spacer"></div></div>
+<script>
+  const data = {data};
+  const rows = data.rows, ROW = {VIRTUAL_ROW_HEIGHT}, OVERSCAN = 8;
+  const viewport = document.getElementById("viewport"), spacer = document.getElementById("spacer");
+  spacer.style.height = (rows.length * ROW) + "px";
+  document.getElementById("meta").textContent = rows.length + " segments";
+
+  function stamp(seconds) {{
+    const m = Math.floor(seconds / 60), s = Math.floor(seconds % 60);
+    return String(m).padStart(2, "0") + ":" + String(s).padStart(2, "0");
+  }}
+
+  function textWithMarks(text, spans) {{
+    const el = document.createElement("div");
+    el.className = "text";
+    let position = 0;
+    for (const [start, end] of (spans || [])) {{
+      if (start < position) continue;
+      el.append(text.slice(position, start));
+      const mark = document.createElement("mark");
+      mark.textContent = text.slice(start, end);
+      el.append(mark);
+      position = end;
+    }}
+    el.append(text.slice(position));
+    el.title = text;
+    return el;
+  }}
+
+  function buildRow(i) {{
+    const [start, text, spans] = rows[i];
+    const row = document.createElement("div");
+    row.className = "row";
+    row.style.top = (i * ROW) + "px";
+    const time = document.createElement(data.youtubeId ? "a" : "span");
+    time.className = "time";
+    time.textContent = stamp(start) + (data.youtubeId ? " 🔗" : "");
+    if (data.youtubeId) {{
+      time.href = "https://www.youtube.com/watch?v=" + encodeURIComponent(data.youtubeId) +
+        (start ? "&t=" + Math.floor(start) + "s" : "");
+      time.target = "_blank";
+    }}
+    row.append(time, textWithMarks(text, spans));
+    return row;
+  }}
+
+  let shown = [-1, -1];
+  function render() {{
+    const first = Math.max(0, Math.floor(viewport.scrollTop / ROW) - OVERSCAN);
+    const last = Math.min(rows.length, Math.ceil((viewport.scrollTop + viewport.clientHeight) / ROW) + OVERSCAN);
+    if (first === shown[0] && last === shown[1]) return;
+    shown = [first, last];
+    const fragment = document.createDocumentFragment();
+    for (let i = first; i < last; i++) fragment.append(buildRow(i));
+    spacer.replaceChildren(fragment);
+  }}
+
+  let pending = false;
+  viewport.addEventListener("scroll", () => {{
+    if (pending) return;
+    pending = true;
+    requestAnimationFrame(() => {{ pending = false; render(); }});
+  }});
+  render();
+</script>
+"""
+
+
+def _highlight_text(text, spans):
+    """Escape segment text for HTML, wrapping search hit spans in <mark>."""
+    if not text:
+        return ""
+    
+    parts = []
+    position = 0
+    for start, end in spans:
+        if start < position:
+            continue  # overlapping hit already highlighted
+        parts.append(html.escape(text[position:start]))
+        parts.append(f"<mark>{html.escape(text[start:end])}</mark>")
+        position = end
+    parts.append(html.escape(text[position:]))
+    return "".join(parts)
+
+
 def _format_timestamp(seconds):
     """Convert seconds to MM:SS format."""
     if not seconds:
@@ -0,0 +1,53 @@
+"""
+Profiler panel component for Klipify.
+Sidebar report of rerun hot spots, shown only while profiling is enabled.
+"""
+
+import streamlit as st
+from ...utils.profiling import get_profile_aggregator, get_profile_mode
+
+
+def show_profiler_panel():
+    """Display per-page rerun costs and the top hot spots in the sidebar."""
+    mode = get_profile_mode()
+    if mode is None:
+        return
+
+    aggregator = get_profile_aggregator()
+
+    with st.sidebar:
+        with st.expander(f"🔬 Rerun Profiler ({mode})", expanded=False):
+            pages = aggregator.pages()
+            if not pages:
+                st.caption("No profiled reruns yet - interact with the app to collect some.")
+                return
+
+            page = st.selectbox("Page", ["All pages"] + pages, key="profiler_page")
+            sort_by = st.radio(
+                "Sort by", ["cumulative", "own"], horizontal=True, key="profiler_sort"
+            )
+            top = st.slider("Hot spots", 5, 50, 15, key="profiler_top")
+
+            report = aggregator.report(None if page == "All pages" else page, top=top, sort_by=sort_by)
+
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Reruns", report['reruns'])
+            col2.metric("Mean", f"{report['mean_ms']:.0f} ms")
+            col3.metric("Max", f"{report['max_ms']:.0f} ms")
+
+            if report['sections_ms']:
+                st.markdown("**⏱️ Sections (mean per rerun)**")
+                for name, ms in report['sections_ms'].items():
+                    st.caption(f"{name}: {ms:.1f} ms")
+
+            st.markdown("**🔥 Hot spots (per rerun)**")
+            st.dataframe(report['hot_spots'], use_container_width=True, hide_index=True)
+
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("💾 Save report", key="profiler_save", use_container_width=True):
+                    st.success(f"✅ Saved to {aggregator.dump()}")
+            with col2:
+                if st.button("🗑️ Reset", key="profiler_reset", use_container_width=True):
+                    aggregator.reset()
+                    st.rerun()
@@ -3,6 +3,7 @@ Summary page component for displaying video summary and concepts.
 """
 
 import streamlit as st
+from ...utils.helpers import rerun_fragment
 
 def show_summary_page(video_data):
     """Display the summary page with professional design."""
@@ -45,6 +46,13 @@ def show_summary_page(video_data):
     </div>
     """, unsafe_allow_html=True)
     
+    degraded = video_data.get('degraded') or {}
+    if degraded:
+        st.info(
+            f"⚡ Quick {' and '.join(sorted(degraded))} generated locally while Gemini was unavailable. "
+            "Use \"Generate Clips\" in My Videos to upgrade them."
+        )
+    
     summary = video_data.get('summary', 'No summary available.')
     st.markdown(f"""
     <div class="summary-content">
@@ -74,8 +82,9 @@ def show_summary_page(video_data):
         """, unsafe_allow_html=True)
 
 
+@st.fragment
 def _show_concepts_section(concepts):
-    """Display concepts with pagination for performance."""
+    """Display concepts with pagination for performance; reruns as a fragment."""
     # Search functionality
     col1, col2 = st.columns([3, 1])
     with col1:
@@ -122,7 +131,7 @@ def _show_concepts_section(concepts):
             with col1:
                 if st.button("← Previous", disabled=st.session_state.concept_page == 0):
                     st.session_state.concept_page = max(0, st.session_state.concept_page - 1)
-                    st.rerun()
+                    rerun_fragment()
             
             with col2:
                 st.markdown(f"<div style='text-align: center; color: var(--text-secondary);'>Page {st.session_state.concept_page + 1} of {max_page + 1}</div>", unsafe_allow_html=True)
@@ -130,7 +139,7 @@ def _show_concepts_section(concepts):
             with col3:
                 if st.button("Next →", disabled=st.session_state.concept_page >= max_page):
                     st.session_state.concept_page = min(max_page, st.session_state.concept_page + 1)
-                    st.rerun()
+                    rerun_fragment()
         
         start_idx = st.session_state.concept_page * pagination_limit
         end_idx = start_idx + pagination_limit
@@ -2,7 +2,15 @@
 Video management page component for VideoDB integration.
 """
 
+import html
+import time
 import streamlit as st
+from ...services.ai_service import has_genai_credentials
+from ...utils.helpers import format_timestamp, rerun_fragment
+
+
+# VideoDB collection videos shown per page
+VIDEOS_PER_PAGE = 20
 
 def show_my_videos_page():
     """Display the video management page."""
@@ -13,78 +21,124 @@ def show_my_videos_page():
     </div>
     """, unsafe_allow_html=True)
     
+    # Show upload status if available
+    if 'last_upload_status' in st.session_state:
+        status = st.session_state['last_upload_status']
+        if status['success']:
+            st.success(f"✅ Video '{status['title']}' uploaded successfully!")
+        else:
+            st.error(f"❌ Upload failed: {status['error']}")
+        # Clear the status after showing
+        del st.session_state['last_upload_status']
+    
+    # Full-text search across every processed lecture
+    _show_library_search()
+    
+    # Previously processed videos come from the local store, not VideoDB
+    _show_processed_videos()
+    
+    # Worker fleet health, only meaningful when processing runs in workers
+    _show_processing_queue()
+    
+    st.markdown("---")
+    st.markdown("""
+    <div class="section-header">
+        <h3>☁️ VideoDB Collection</h3>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    _show_videodb_collection()
+
+
+@st.fragment
+def _show_videodb_collection():
+    """Display the VideoDB collection; searching and managing videos only rerun this fragment."""
+    if not st.toggle("Load VideoDB collection", key="show_videodb_collection",
+                     help="Browse uploaded videos from your VideoDB account"):
+        st.caption("Turn on to browse, delete or regenerate clips for videos in your VideoDB account.")
+        return
+    
     # Import the video manager
     try:
-        from ...services.videodb_manager import VideoDBManager
+        from ...services.videodb_manager import get_video_db_manager
         
-        # Initialize video manager
-        video_manager = VideoDBManager()
-        
-        # Show upload status if available
-        if 'last_upload_status' in st.session_state:
-            status = st.session_state['last_upload_status']
-            if status['success']:
-                st.success(f"✅ Video '{status['title']}' uploaded successfully!")
-            else:
-                st.error(f"❌ Upload failed: {status['error']}")
-            # Clear the status after showing
-            del st.session_state['last_upload_status']
+        # Shared video manager, connected on first use
+        video_manager = get_video_db_manager()
         
         # Search and filter options
         col1, col2 = st.columns([3, 1])
         with col1:
-            search_term = st.text_input("🔍 Search videos...", placeholder="Search by name or description")
+            search_term = st.text_input("🔍 Search videos...", placeholder="Search by name or description",
+                                        help="Results are ranked by similarity, so small typos still match",
+                                        key="videodb_search_term")
         with col2:
-            refresh_clicked = st.button("🔄 Refresh", use_container_width=True)
+            refresh_clicked = st.button("🔄 Refresh", use_container_width=True,
+                                        help="Fetch new and deleted videos from VideoDB now")
         
-        # Get videos list
-        with st.spinner("Loading your videos..."):
-            try:
-                videos = video_manager.list_videos()
-                
-                if not videos:
-                    st.markdown("""
-                    <div class="empty-state">
-                        <h3>No videos found</h3>
-                        <p>You haven't uploaded any videos to VideoDB yet. Upload a video from the main page to get started!</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    return
-                
-                # Filter videos based on search
-                if search_term:
-                    search_lower = search_term.lower()
-                    filtered_videos = [
-                        video for video in videos
-                        if (search_lower in video.get('name', '').lower() or 
-                            search_lower in video.get('description', '').lower())
-                    ]
-                else:
-                    filtered_videos = videos
-                
-                if not filtered_videos:
-                    st.info(f"No videos found matching '{search_term}'")
-                    return
-                
-                # Display metrics
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Total Videos", len(videos))
-                with col2:
-                    st.metric("Filtered Results", len(filtered_videos))
-                with col3:
-                    total_duration = sum(video.get('length', 0) for video in filtered_videos)
-                    st.metric("Total Duration", f"{total_duration/60:.1f} min")
-                
-                st.markdown("---")
-                
-                # Display videos
-                for video in filtered_videos:
-                    _display_video_card(video, video_manager)
-                
-            except Exception as e:
-                st.error(f"Error loading videos: {str(e)}")
-                st.info("Make sure your VideoDB credentials are configured correctly.")
+        # Start from the first page whenever the search changes
+        if st.session_state.get('videodb_last_search') != search_term:
+            st.session_state.videodb_last_search = search_term
+            st.session_state.videodb_page = 0
+        
+        try:
+            # The listing comes from the local mirror; VideoDB is only asked for changes
+            if refresh_clicked:
+                with st.spinner("Syncing your videos..."):
+                    sync = video_manager.sync_videos(force=True)
+                if sync and (sync['added'] or sync['updated'] or sync['removed']):
+                    st.success(
+                        f"✅ Synced: {sync['added']} new, {sync['updated']} updated, {sync['removed']} removed"
+                    )
+            
+            with st.spinner("Loading your videos..."):
+                listing = video_manager.query_videos(
+                    search_term, st.session_state.get('videodb_page', 0), VIDEOS_PER_PAGE
+                )
+            
+            if listing is None:
+                st.error("Could not load your VideoDB collection.")
+                return
+            
+            if not listing['collection_total']:
+                st.markdown("""
+                <div class="empty-state">
+                    <h3>No videos found</h3>
+                    <p>You haven't uploaded any videos to VideoDB yet. Upload a video from the main page to get started!</p>
+                </div>
+                """, unsafe_allow_html=True)
+                return
+            
+            if not listing['total']:
+                st.info(f"No videos found matching '{search_term}'")
+                return
+            
+            # Display metrics
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Total Videos", listing['collection_total'])
+            with col2:
+                st.metric("Filtered Results", listing['total'])
+            with col3:
+                st.metric("Total Duration", f"{listing['total_length']/60:.1f} min")
+            
+            state = video_manager.mirror_state()
+            if state and state.get('synced_at'):
+                st.caption(f"🕒 Synced {_format_age(time.time() - state['synced_at'])} ago")
+            
+            # Act on several videos at once
+            _show_bulk_actions(video_manager, listing['videos'])
+            
+            st.markdown("---")
+            
+            # Display videos
+            for video in listing['videos']:
+                _display_video_card(video, video_manager, search_term)
+            
+            _show_collection_pager(listing)
+            
+        except Exception as e:
+            st.error(f"Error loading videos: {str(e)}")
+            st.info("Make sure your VideoDB credentials are configured correctly.")
     
     except ImportError:
         st.error("VideoDB manager not available. Please check your installation.")
@@ -92,8 +146,342 @@ def show_my_videos_page():
         st.error(f"Error initializing video manager: {str(e)}")
 
 
-def _display_video_card(video, video_manager):
-    """Display a single video card with management options."""
+def _selected_videos():
+    """VideoDB IDs selected for bulk actions, kept across pages and searches."""
+    return st.session_state.setdefault('videodb_selected', set())
+
+
+def _toggle_selection(video_id):
+    """Keep the selection set in sync with a card's checkbox."""
+    if st.session_state.get(f"select_{video_id}"):
+        _selected_videos().add(video_id)
+    else:
+        _selected_videos().discard(video_id)
+
+
+def _set_selection(video_ids, selected):
+    """Select or clear several videos, updating their checkboxes."""
+    for video_id in video_ids:
+        if selected:
+            _selected_videos().add(video_id)
+        else:
+            _selected_videos().discard(video_id)
+        st.session_state[f"select_{video_id}"] = selected
+
+
+def _show_bulk_actions(video_manager, page_videos):
+    """Display multi-select controls, bulk delete and bulk clip generation."""
+    selected = _selected_videos()
+    page_ids = [video.get('id', '') for video in page_videos]
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.button("☑️ Select page", key="videodb_select_page", use_container_width=True,
+                  on_click=_set_selection, args=(page_ids, True))
+    with col2:
+        st.button("✖️ Clear selection", key="videodb_clear_selection", use_container_width=True,
+                  disabled=not selected, on_click=_set_selection, args=(list(selected), False))
+    with col3:
+        # Clip generation reruns the Gemini stages, so it needs a configured key
+        gemini_ready = has_genai_credentials()
+        if st.button(f"🎬 Generate Clips ({len(selected)})", key="videodb_bulk_clips",
+                     use_container_width=True, disabled=not selected or not gemini_ready,
+                     help=None if gemini_ready else "Configure GEMINI_API_KEY to generate clips"):
+            _run_bulk_action(video_manager, 'generate_clips', sorted(selected))
+    with col4:
+        if st.button(f"🗑️ Delete ({len(selected)})", key="videodb_bulk_delete",
+                     use_container_width=True, disabled=not selected, type="secondary"):
+            st.session_state.videodb_confirm_bulk_delete = True
+    
+    if st.session_state.get('videodb_confirm_bulk_delete') and selected:
+        st.warning(f"⚠️ Delete {len(selected)} videos from VideoDB? This cannot be undone.")
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button(f"✅ Yes, Delete {len(selected)} Videos", key="videodb_bulk_delete_confirm", type="primary"):
+                st.session_state.videodb_confirm_bulk_delete = False
+                _run_bulk_action(video_manager, 'delete', sorted(selected))
+        with col2:
+            if st.button("❌ Cancel", key="videodb_bulk_delete_cancel"):
+                st.session_state.videodb_confirm_bulk_delete = False
+                rerun_fragment()
+    
+    _show_bulk_result(video_manager)
+
+
+def _run_bulk_action(video_manager, action, video_ids):
+    """Run a bulk action with a progress bar and keep its outcome for display."""
+    label = "Deleting" if action == 'delete' else "Generating clips for"
+    progress = st.progress(0.0, text=f"{label} {len(video_ids)} videos...")
+    failures = []
+    
+    def on_progress(done, total, video_id, error):
+        if error:
+            failures.append(video_id)
+        progress.progress(
+            done / total,
+            text=f"{label} videos: {done}/{total} done" + (f" • {len(failures)} failed" if failures else "")
+        )
+    
+    try:
+        if action == 'delete':
+            result = video_manager.delete_videos(video_ids, on_progress=on_progress)
+        else:
+            result = video_manager.generate_clips_for_videos(video_ids, on_progress=on_progress)
+    except Exception as e:
+        st.error(f"❌ Bulk action failed: {str(e)}")
+        return
+    
+    # Finished videos leave the selection; failed ones stay selected for a retry
+    _set_selection(result.succeeded, False)
+    st.session_state.videodb_bulk_result = result.to_dict()
+    rerun_fragment()
+
+
+def _show_bulk_result(video_manager):
+    """Display the last bulk action's outcome, with a retry for failed videos."""
+    outcome = st.session_state.get('videodb_bulk_result')
+    if not outcome:
+        return
+    
+    action = "Deleted" if outcome['action'] == 'delete' else "Generated clips for"
+    succeeded, failed = outcome['succeeded'], outcome['failed']
+    
+    if succeeded:
+        st.success(f"✅ {action} {len(succeeded)} videos in {outcome['seconds']:.1f}s")
+    if not failed:
+        del st.session_state['videodb_bulk_result']
+        return
+    
+    st.error(f"❌ {len(failed)} videos failed")
+    with st.expander("Failed videos"):
+        for video_id in failed:
+            st.markdown(f"- `{video_id}`: {html.escape(outcome['errors'].get(video_id, 'Unknown error'))}")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button(f"🔁 Retry {len(failed)} Failed", key="videodb_bulk_retry", use_container_width=True):
+            _run_bulk_action(video_manager, outcome['action'], failed)
+    with col2:
+        if st.button("Dismiss", key="videodb_bulk_dismiss", use_container_width=True):
+            del st.session_state['videodb_bulk_result']
+            rerun_fragment()
+
+
+def _show_collection_pager(listing):
+    """Display previous/next controls for the VideoDB collection listing."""
+    if listing['pages'] <= 1:
+        return
+    
+    page = listing['page']
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("← Previous", key="videodb_prev_page", disabled=page == 0):
+            st.session_state.videodb_page = page - 1
+            rerun_fragment()
+    with col2:
+        st.markdown(f"<div style='text-align: center; color: var(--text-secondary);'>Page {page + 1} of {listing['pages']}</div>", unsafe_allow_html=True)
+    with col3:
+        if st.button("Next →", key="videodb_next_page", disabled=page >= listing['pages'] - 1):
+            st.session_state.videodb_page = page + 1
+            rerun_fragment()
+
+
+def _format_age(seconds):
+    """Format an age in seconds as a short string."""
+    if seconds < 60:
+        return f"{int(seconds)}s"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+@st.fragment
+def _show_library_search():
+    """Display ranked full-text search across all processed videos."""
+    from ...services.library_index import get_library_index
+    
+    library_index = get_library_index()
+    if not library_index:
+        return
+    
+    with st.expander("🔎 Search Lecture Library", expanded=False):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            library_query = st.text_input(
+                "Search all lectures",
+                placeholder="Search transcripts, notes and concepts across every processed video",
+                help="Use word* to match prefixes",
+                key="library_search_query"
+            )
+        with col2:
+            kind_filter = st.selectbox(
+                "Search in",
+                ["Everything", "Transcripts", "Notes", "Concepts"],
+                key="library_search_kind"
+            )
+        
+        if not library_query:
+            stats = library_index.get_stats()
+            st.caption(f"{stats['videos']} videos • {stats['entries']:,} searchable passages")
+            return
+        
+        kinds = {
+            "Transcripts": ['transcript'],
+            "Notes": ['notes'],
+            "Concepts": ['concept']
+        }.get(kind_filter)
+        
+        try:
+            results = library_index.search(library_query, limit=25, kinds=kinds)
+        except Exception as e:
+            st.error(f"Library search failed: {str(e)}")
+            return
+        
+        if not results:
+            st.info(f"No lectures found matching '{library_query}'")
+            return
+        
+        for result in results:
+            title = html.escape(result['title'])
+            label = f" • {html.escape(result['label'])}" if result.get('label') and result['kind'] != 'concept' else ''
+            st.markdown(f"""
+            <div class="transcript-segment">
+                <div class="segment-header">
+                    <span class="segment-time">{format_timestamp(result['start'] or 0)}</span>
+                    <span style="color: var(--text-secondary);">{title} • {result['kind'].title()}{label}</span>
+                    <a href="{result['link']}" target="_blank" class="time-link">🔗 Jump to time</a>
+                </div>
+                <div class="segment-text">{result['snippet']}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+
+@st.fragment
+def _show_processed_videos():
+    """Display videos stored locally by previous pipeline runs."""
+    from ...services.video_store import get_video_store
+    
+    video_store = get_video_store()
+    if not video_store:
+        return
+    
+    stored_videos = video_store.list_videos()
+    
+    st.markdown("""
+    <div class="section-header">
+        <h3>💾 Processed Videos</h3>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    if not stored_videos:
+        st.caption("Videos you process will be saved here so you can reopen them without reprocessing.")
+        return
+    
+    stats = video_store.get_stats()
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Saved Videos", stats['videos'])
+    with col2:
+        st.metric("Storage Used", f"{stats['size_bytes'] / (1024 * 1024):.1f} MB")
+    
+    for stored in stored_videos:
+        youtube_id = stored['youtube_id']
+        title = html.escape(stored.get('title') or youtube_id)
+        duration = stored.get('duration') or 0
+        
+        st.markdown(f"""
+        <div class="video-card">
+            <div class="video-header">
+                <h4>{title}</h4>
+                <span class="video-status" style="background: var(--success-green); color: white;">Saved</span>
+            </div>
+            <div class="video-meta">
+                YouTube: {youtube_id} • Duration: {int(duration // 60)}:{int(duration % 60):02d} •
+                {stored.get('clips_count', 0)} clips • Processed {stored.get('processed_at') or 'Unknown'}
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("📂 Open", key=f"open_stored_{youtube_id}", use_container_width=True):
+                _open_stored_video(youtube_id)
+        with col2:
+            if st.button("🗑️ Remove", key=f"remove_stored_{youtube_id}", use_container_width=True):
+                video_store.delete_video(youtube_id)
+                _remove_from_library_index(youtube_id)
+                rerun_fragment()
+
+
+def _show_processing_queue():
+    """Display queue depth, wait times and pool usage for the worker fleet."""
+    from ...services.job_queue import get_job_queue, use_worker_queue
+    from ...services.scheduler import get_resource_pools
+    
+    if not use_worker_queue():
+        return
+    
+    with st.expander("⚙️ Processing Queue"):
+        metrics = get_job_queue().get_metrics()
+        depth = metrics['depth']
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Queued", depth.get('queued', 0))
+        with col2:
+            st.metric("Running", depth.get('leased', 0))
+        with col3:
+            st.metric("Wait p50 / p95", f"{metrics['wait_seconds']['p50']:.0f}s / {metrics['wait_seconds']['p95']:.0f}s")
+        with col4:
+            st.metric("Oldest Waiting", f"{metrics['oldest_queued_age']:.0f}s")
+        
+        pools = get_resource_pools()
+        if pools:
+            for pool, stats in pools.get_stats().items():
+                st.caption(
+                    f"**{pool}**: {stats['in_use']}/{stats['limit']} in use • {stats['waiting']} waiting • "
+                    f"avg wait {stats['avg_wait']:.1f}s • max wait {stats['max_wait']:.1f}s"
+                )
+        
+        active_tenants = {
+            tenant: stats for tenant, stats in metrics['tenants'].items()
+            if stats['queued'] or stats['leased']
+        }
+        if active_tenants:
+            st.markdown("**Active tenants**")
+            for tenant, stats in sorted(active_tenants.items()):
+                st.caption(
+                    f"{tenant}: {stats['queued']} queued • {stats['leased']} running • "
+                    f"weight {stats['weight']:g}"
+                )
+
+
+def _remove_from_library_index(youtube_id):
+    """Drop a removed video from library search results."""
+    from ...services.library_index import get_library_index
+    
+    library_index = get_library_index()
+    if library_index:
+        library_index.remove_video(youtube_id)
+
+
+def _open_stored_video(youtube_id):
+    """Load a stored video into the session and switch to its clips."""
+    from ...processing import load_stored_video
+    
+    if load_stored_video(youtube_id):
+        st.query_params["video"] = youtube_id
+        st.session_state.chat_history = []
+        st.success("✅ Video loaded! Navigate to the 'Clips' page to explore it.")
+        st.rerun()
+    else:
+        st.error("Saved results for this video are no longer available.")
+
+
+def _display_video_card(video, video_manager, search_term=None):
+    """Display a single video card with management options, marking search matches."""
+    from ...services.collection_mirror import highlight_matches
+    
     video_id = video.get('id', '')
     video_name = video.get('name', 'Untitled Video')
     description = video.get('description', 'No description')
@@ -108,16 +496,22 @@ def _display_video_card(video, video_manager):
         duration_str = "Unknown"
     
     with st.container():
+        # Checkbox state is seeded from the selection kept across pages
+        select_key = f"select_{video_id}"
+        if select_key not in st.session_state:
+            st.session_state[select_key] = video_id in _selected_videos()
+        st.checkbox("Select", key=select_key, on_change=_toggle_selection, args=(video_id,))
+        
         st.markdown(f"""
         <div class="video-card">
             <div class="video-header">
-                <h4>{video_name}</h4>
+                <h4>{highlight_matches(video_name, search_term)}</h4>
                 <span class="video-status" style="background: var(--success-green); color: white;">Ready</span>
             </div>
             <div class="video-meta">
                 ID: {video_id} • Duration: {duration_str}
             </div>
-            <p style="color: var(--text-secondary); margin: 0.5rem 0;">{description[:150]}{'...' if len(description) > 150 else ''}</p>
+            <p style="color: var(--text-secondary); margin: 0.5rem 0;">{highlight_matches(description[:150], search_term)}{'...' if len(description) > 150 else ''}</p>
         </div>
         """, unsafe_allow_html=True)
         
@@ -138,18 +532,23 @@ def _display_video_card(video, video_manager):
 
 
 def _generate_clips_from_video(video_id, video_name, video_manager):
-    """Generate clips from an existing video."""
+    """Generate clips from an existing video and open it in this session."""
+    # Imported here so My Videos loads without the processing pipeline
+    from ...processing import StreamlitReporter, load_video_into_session
+    
     with st.spinner(f"Generating clips from '{video_name}'..."):
         try:
-            result = video_manager.generate_clips_from_existing(video_id)
+            result = video_manager.generate_clips_from_existing(video_id, reporter=StreamlitReporter())
             
-            if result['success']:
-                # Store the result in session state
-                st.session_state['video_data'] = result['video_data']
-                st.success(f"✅ Generated {len(result['video_data'].get('clips', []))} clips from '{video_name}'!")
+            if result and result['success']:
+                video_data = result['video_data']
+                load_video_into_session(video_data)
+                st.success(f"✅ Generated {len(video_data.get('clips', []))} clips from '{video_name}'!")
+                if video_data.get('reused'):
+                    st.caption(f"♻️ Reused stored {', '.join(video_data['reused'])}")
                 st.info("Navigate to the 'Clips' page to view your generated clips.")
             else:
-                st.error(f"Failed to generate clips: {result['error']}")
+                st.error(f"Failed to generate clips: {(result or {}).get('error', 'VideoDB is not connected')}")
                 
         except Exception as e:
             st.error(f"Error generating clips: {str(e)}")
@@ -197,7 +596,7 @@ def _confirm_delete_video(video_id, video_name, video_manager):
                     success = video_manager.delete_video(video_id)
                     if success:
                         st.success(f"✅ Video '{video_name}' deleted successfully!")
-                        st.rerun()
+                        rerun_fragment()
                     else:
                         st.error("Failed to delete video")
                 except Exception as e:
@@ -206,4 +605,4 @@ def _confirm_delete_video(video_id, video_name, video_manager):
     with col2:
         if st.button(f"❌ Cancel", key=f"cancel_delete_{video_id}"):
             st.info("Delete cancelled")
-            st.rerun()
+            rerun_fragment()
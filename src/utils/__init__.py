@@ -11,13 +11,27 @@ from .helpers import (
     validate_api_keys,
     reset_session_state,
     create_youtube_link,
-    create_setup_instructions
+    create_setup_instructions,
+    get_data_dir
 )
 
 from .video_utils import (
     VideoFormatHandler,
     check_video_compatibility,
-    create_video_info_card
+    create_video_info_card,
+    display_clip_player,
+    build_chapter_map
+)
+
+from .transcript import (
+    CompactTranscript,
+    SegmentView,
+    as_compact_transcript
+)
+
+from .transcript_index import (
+    TranscriptIndex,
+    build_transcript_index
 )
 
 __all__ = [
@@ -30,9 +44,19 @@ __all__ = [
     'reset_session_state',
     'create_youtube_link',
     'create_setup_instructions',
+    'get_data_dir',
     
     # Video utilities
     'VideoFormatHandler',
     'check_video_compatibility',
-    'create_video_info_card'
+    'create_video_info_card',
+    'display_clip_player',
+    'build_chapter_map',
+    
+    # Transcript storage
+    'CompactTranscript',
+    'SegmentView',
+    'as_compact_transcript',
+    'TranscriptIndex',
+    'build_transcript_index'
 ]
@@ -5,6 +5,7 @@ Contains helper functions for URL parsing, session management, and common operat
 
 import re
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
 
 
 def get_youtube_id(url):
@@ -71,6 +72,24 @@ def reset_session_state():
     for key in keys_to_reset:
         if key in st.session_state:
             del st.session_state[key]
+    
+    # Stop the stored video from being restored on the next run
+    if "video" in st.query_params:
+        del st.query_params["video"]
+
+
+def rerun_fragment():
+    """
+    Rerun only the fragment this is called from.
+    
+    Widgets inside an st.fragment region use this instead of st.rerun() so an
+    interaction does not redraw the sidebar and the rest of the page. Outside
+    a fragment the whole app is rerun.
+    """
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
 
 
 def format_timestamp(seconds):
@@ -114,10 +133,16 @@ def validate_api_keys():
     """
     Check if required API keys are configured.
     
+    The fake backends (KLIPIFY_BACKEND=fake) need no keys.
+    
     Returns:
         tuple: (videodb_key_exists, genai_key_exists)
     """
     import os
+    from ..services.backends import use_fake_backend
+    
+    if use_fake_backend():
+        return True, True
     
     # Check VideoDB API key
     videodb_key = (
@@ -161,6 +186,30 @@ def create_setup_instructions():
     """
 
 
+def get_data_dir(*parts):
+    """
+    Get (and create) a directory for Klipify's local persistent data.
+    
+    The base directory defaults to ``data/`` in the project root and can be
+    overridden with the KLIPIFY_DATA_DIR environment variable.
+    
+    Args:
+        *parts (str): Optional subdirectory path components
+        
+    Returns:
+        str: Absolute directory path
+    """
+    import os
+    
+    base_dir = os.getenv("KLIPIFY_DATA_DIR") or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        "data"
+    )
+    path = os.path.join(base_dir, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
 def get_app_info():
     """
     Get application information and metadata.
@@ -0,0 +1,349 @@
+"""
+Rerun Profiling for Klipify
+Opt-in profiling of Streamlit reruns, aggregated per page across reruns.
+
+Enabled by the operator with KLIPIFY_PROFILE=1 (sampling profiler) or
+KLIPIFY_PROFILE=cprofile (deterministic). The aggregate is process-wide, so
+there is deliberately no per-visitor switch. Reports appear in a sidebar
+panel and can be saved to data/profiles/.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+MODE_SAMPLE = 'sample'
+MODE_CPROFILE = 'cprofile'
+
+# Seconds between stack samples in sampling mode
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+_OFF_VALUES = ('0', 'off', 'false', 'no')
+
+_repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The rerun being profiled on this script thread
+_local = threading.local()
+
+
+def _parse_mode(value):
+    value = (value or '').strip().lower()
+    if not value or value in _OFF_VALUES:
+        return None
+    return MODE_CPROFILE if value == MODE_CPROFILE else MODE_SAMPLE
+
+
+def get_profile_mode():
+    """
+    Get the profiling mode configured for this process.
+
+    Returns:
+        str: 'sample', 'cprofile', or None when profiling is off
+    """
+    return _parse_mode(os.getenv("KLIPIFY_PROFILE"))
+
+
+def _function_label(filename, line, name):
+    """Short 'function (file:line)' label, relative to the project when possible."""
+    if filename.startswith(_repo_root):
+        filename = os.path.relpath(filename, _repo_root)
+    elif os.sep + "site-packages" + os.sep in filename:
+        filename = filename.split(os.sep + "site-packages" + os.sep, 1)[1]
+    if filename == '~':
+        return name
+    return f"{name} ({filename}:{line})"
+
+
+class _StackSampler:
+    """Samples one thread's stack on a background thread."""
+
+    def __init__(self, thread_id, interval, root_frame=None):
+        self.thread_id = thread_id
+        self.interval = interval
+        # Frames above the profiled block (Streamlit's script runner) are skipped
+        self.root_frame = root_frame
+        self.samples = 0
+        self.own = {}
+        self.total = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="klipify-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            leaf = True
+            seen = set()
+            while frame is not None:
+                code = frame.f_code
+                key = (code.co_filename, code.co_firstlineno, code.co_name)
+                if leaf:
+                    self.own[key] = self.own.get(key, 0) + 1
+                    leaf = False
+                if key not in seen:
+                    seen.add(key)
+                    self.total[key] = self.total.get(key, 0) + 1
+                if frame is self.root_frame:
+                    break
+                frame = frame.f_back
+
+    def functions(self, seconds):
+        """
+        Args:
+            seconds (float): Wall time covered by the samples
+
+        Returns:
+            dict: (file, line, name) -> (calls, own_seconds, cumulative_seconds)
+        """
+        # Samples arrive less often than the interval while the GIL is busy,
+        # so each one stands for an equal share of the measured wall time
+        weight = seconds / self.samples if self.samples else self.interval
+        return {
+            key: (0, self.own.get(key, 0) * weight, count * weight)
+            for key, count in self.total.items()
+        }
+
+
+class _Rerun:
+    """One profiled rerun."""
+
+    def __init__(self, mode, interval, root_frame=None):
+        self.mode = mode
+        self.page = 'main'
+        self.sections = {}
+        self._profiler = None
+        self._sampler = None
+
+        if mode == MODE_CPROFILE:
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+            try:
+                self._profiler.enable()
+            except ValueError:
+                # Another session's rerun holds the profiler; sample this one instead
+                self._profiler = None
+                self.mode = MODE_SAMPLE
+        if self._profiler is None:
+            self._sampler = _StackSampler(threading.get_ident(), interval, root_frame)
+            self._sampler.start()
+        self.started = time.perf_counter()
+
+    def stop(self):
+        """
+        Returns:
+            dict: (file, line, name) -> (calls, own_seconds, cumulative_seconds)
+        """
+        self.seconds = time.perf_counter() - self.started
+        if self._profiler is not None:
+            import pstats
+
+            self._profiler.disable()
+            return {
+                key: (calls, own, cumulative)
+                for key, (_primitive, calls, own, cumulative, _callers)
+                in pstats.Stats(self._profiler).stats.items()
+            }
+        self._sampler.stop()
+        return self._sampler.functions(self.seconds)
+
+
+class ProfileAggregator:
+    """Accumulates rerun profiles per page for the whole process."""
+
+    def __init__(self):
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    def add(self, rerun, functions):
+        """
+        Fold one rerun into its page's totals.
+
+        Args:
+            rerun (_Rerun): Stopped rerun
+            functions (dict): Per-function (calls, own_seconds, cumulative_seconds)
+        """
+        with self._lock:
+            page = self._pages.setdefault(rerun.page, {
+                'reruns': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'sections': {}, 'functions': {}
+            })
+            page['reruns'] += 1
+            page['seconds'] += rerun.seconds
+            page['max_seconds'] = max(page['max_seconds'], rerun.seconds)
+            for name, seconds in rerun.sections.items():
+                page['sections'][name] = page['sections'].get(name, 0.0) + seconds
+            totals = page['functions']
+            for key, (calls, own, cumulative) in functions.items():
+                previous = totals.get(key, (0, 0.0, 0.0))
+                totals[key] = (previous[0] + calls, previous[1] + own, previous[2] + cumulative)
+
+    def pages(self):
+        """Names of pages with at least one profiled rerun."""
+        with self._lock:
+            return sorted(self._pages)
+
+    def report(self, page=None, top=25, sort_by='cumulative'):
+        """
+        Build a per-page summary and hot-spot table.
+
+        Args:
+            page (str, optional): Page to report (defaults to all pages combined)
+            top (int): Number of hot spots
+            sort_by (str): 'cumulative' or 'own' time
+
+        Returns:
+            dict: reruns, mean/max milliseconds, per-section mean milliseconds
+                and the top functions by time per rerun
+        """
+        with self._lock:
+            selected = [self._pages[page]] if page in self._pages else (
+                list(self._pages.values()) if page is None else []
+            )
+            reruns = sum(entry['reruns'] for entry in selected)
+            seconds = sum(entry['seconds'] for entry in selected)
+            sections = {}
+            functions = {}
+            for entry in selected:
+                for name, value in entry['sections'].items():
+                    sections[name] = sections.get(name, 0.0) + value
+                for key, (calls, own, cumulative) in entry['functions'].items():
+                    previous = functions.get(key, (0, 0.0, 0.0))
+                    functions[key] = (previous[0] + calls, previous[1] + own, previous[2] + cumulative)
+            max_seconds = max((entry['max_seconds'] for entry in selected), default=0.0)
+
+        if not reruns:
+            return {'reruns': 0, 'mean_ms': 0.0, 'max_ms': 0.0, 'sections_ms': {}, 'hot_spots': []}
+
+        column = 2 if sort_by == 'cumulative' else 1
+        ranked = sorted(functions.items(), key=lambda item: item[1][column], reverse=True)[:top]
+        return {
+            'reruns': reruns,
+            'mean_ms': seconds / reruns * 1000,
+            'max_ms': max_seconds * 1000,
+            'sections_ms': {
+                name: value / reruns * 1000
+                for name, value in sorted(sections.items(), key=lambda item: -item[1])
+            },
+            'hot_spots': [
+                {
+                    'function': _function_label(*key),
+                    'calls_per_rerun': round(calls / reruns, 1),
+                    'own_ms_per_rerun': round(own / reruns * 1000, 3),
+                    'cumulative_ms_per_rerun': round(cumulative / reruns * 1000, 3),
+                }
+                for key, (calls, own, cumulative) in ranked
+            ],
+        }
+
+    def dump(self, path=None, top=50):
+        """
+        Save every page's report as JSON.
+
+        Args:
+            path (str, optional): Output path (defaults to data/profiles/)
+            top (int): Hot spots per page
+
+        Returns:
+            str: Path written
+        """
+        if path is None:
+            from .helpers import get_data_dir
+
+            path = os.path.join(
+                get_data_dir("profiles"), f"reruns-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+            )
+        report = {
+            'created_at': datetime.now().isoformat(timespec="seconds"),
+            'all_pages': self.report(top=top),
+            'pages': {page: self.report(page, top=top) for page in self.pages()},
+        }
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        return path
+
+    def reset(self):
+        """Discard everything collected so far."""
+        with self._lock:
+            self._pages.clear()
+
+
+_aggregator = ProfileAggregator()
+
+
+def get_profile_aggregator():
+    """Get the process-wide rerun profile aggregator."""
+    return _aggregator
+
+
+@contextmanager
+def profile_rerun(mode=None):
+    """
+    Profile one rerun of the app when profiling is enabled.
+
+    Args:
+        mode (str, optional): Overrides the session's profiling mode
+    """
+    mode = mode or get_profile_mode()
+    if mode is None or getattr(_local, 'rerun', None) is not None:
+        yield
+        return
+
+    try:
+        interval = float(os.getenv("KLIPIFY_PROFILE_INTERVAL", DEFAULT_SAMPLE_INTERVAL))
+    except ValueError:
+        interval = DEFAULT_SAMPLE_INTERVAL
+    # The frame that entered the with-block (past contextlib's __enter__)
+    rerun = _Rerun(mode, interval, root_frame=sys._getframe(2))
+    _local.rerun = rerun
+    try:
+        yield
+    finally:
+        # Also runs when st.rerun() or st.stop() ends the script early
+        _local.rerun = None
+        _aggregator.add(rerun, rerun.stop())
+
+
+@contextmanager
+def profile_section(name):
+    """
+    Time a named part of the current rerun (no-op when not profiling).
+
+    Args:
+        name (str): Section name (e.g. 'load_modern_css')
+    """
+    rerun = getattr(_local, 'rerun', None)
+    if rerun is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        rerun.sections[name] = rerun.sections.get(name, 0.0) + time.perf_counter() - started
+
+
+def set_profiled_page(page):
+    """
+    Attribute the current rerun to a page (no-op when not profiling).
+
+    Args:
+        page (str): Page renderer name (e.g. 'show_clips_page')
+    """
+    rerun = getattr(_local, 'rerun', None)
+    if rerun is not None:
+        rerun.page = page
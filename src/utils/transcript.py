@@ -0,0 +1,338 @@
+"""
+Compact Transcript Storage for Klipify
+Columnar, memory-mappable replacement for lists of transcript segment dicts.
+"""
+
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping, Sequence
+
+
+_MAGIC = b"KLPT"
+_VERSION = 1
+# magic, version, segment count, text buffer length (bytes)
+_HEADER = struct.Struct("<4sIQQ")
+
+
+class SegmentView(Mapping):
+    """Read-only dict-style view of one segment in a CompactTranscript."""
+
+    __slots__ = ('_transcript', '_index')
+
+    _KEYS = ('start', 'end', 'text')
+
+    def __init__(self, transcript, index):
+        self._transcript = transcript
+        self._index = index
+
+    def __getitem__(self, key):
+        if key == 'start':
+            return self._transcript.starts[self._index]
+        if key == 'end':
+            return self._transcript.ends[self._index]
+        if key == 'text':
+            return self._transcript.text_at(self._index)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __repr__(self):
+        return f"SegmentView({dict(self)!r})"
+
+
+class CompactTranscript(Sequence):
+    """
+    Columnar transcript: float arrays for start/end times, one UTF-8 text
+    buffer with offsets and precomputed per-segment word counts.
+
+    Indexing returns a SegmentView, so existing code written against
+    ``segment.get('text', '')`` keeps working unchanged.
+    """
+
+    def __init__(self, starts, ends, offsets, word_counts, text_buffer, _mmap=None):
+        """
+        Initialize from prebuilt columns. Use from_segments() or load() instead.
+
+        Args:
+            starts: Sequence of float start times (seconds)
+            ends: Sequence of float end times (seconds)
+            offsets: Byte offsets into text_buffer, one more than segment count
+            word_counts: Per-segment word counts
+            text_buffer: UTF-8 encoded text of all segments back to back
+        """
+        self.starts = starts
+        self.ends = ends
+        self.offsets = offsets
+        self.word_counts = word_counts
+        self.text_buffer = text_buffer
+        self._mmap = _mmap
+        self._total_words = None
+
+    @classmethod
+    def from_segments(cls, segments):
+        """
+        Build a compact transcript from VideoDB-style segment dicts.
+
+        Args:
+            segments (list): Segments with 'start', 'end' and 'text' keys
+
+        Returns:
+            CompactTranscript: Compact transcript
+        """
+        if isinstance(segments, CompactTranscript):
+            return segments
+
+        starts = array('d')
+        ends = array('d')
+        offsets = array('q', [0])
+        word_counts = array('I')
+        chunks = []
+        position = 0
+
+        for segment in segments or []:
+            text = segment.get('text', '') or ''
+            start = float(segment.get('start', 0) or 0)
+            end = float(segment.get('end', start) or start)
+            encoded = text.encode('utf-8')
+
+            starts.append(start)
+            ends.append(end)
+            word_counts.append(len(text.split()))
+            chunks.append(encoded)
+            position += len(encoded)
+            offsets.append(position)
+
+        return cls(starts, ends, offsets, word_counts, b"".join(chunks))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._take(range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("transcript segment index out of range")
+        return SegmentView(self, index)
+
+    def text_at(self, index):
+        """Return the text of a single segment."""
+        return bytes(self.text_buffer[self.offsets[index]:self.offsets[index + 1]]).decode('utf-8')
+
+    @property
+    def total_words(self):
+        """Total word count across all segments (computed once)."""
+        if self._total_words is None:
+            self._total_words = sum(self.word_counts)
+        return self._total_words
+
+    @property
+    def duration(self):
+        """End time of the last segment in seconds."""
+        return self.ends[-1] if len(self) else 0.0
+
+    def iter_rows(self):
+        """
+        Iterate segments as plain tuples, avoiding per-segment view objects.
+
+        Yields:
+            tuple: (start, end, text)
+        """
+        starts, ends, offsets, buffer = self.starts, self.ends, self.offsets, self.text_buffer
+        for i in range(len(starts)):
+            yield starts[i], ends[i], bytes(buffer[offsets[i]:offsets[i + 1]]).decode('utf-8')
+
+    def to_dicts(self):
+        """Materialize the legacy list-of-dicts representation."""
+        return [{'start': start, 'end': end, 'text': text} for start, end, text in self.iter_rows()]
+
+    def text(self, separator=" "):
+        """Return the full transcript text joined by separator."""
+        return separator.join(row[2] for row in self.iter_rows())
+
+    def index_range(self, start_time, end_time):
+        """
+        Find the indices of segments overlapping a time range.
+
+        Args:
+            start_time (float): Range start in seconds
+            end_time (float): Range end in seconds
+
+        Returns:
+            tuple: (first_index, stop_index) suitable for slicing
+        """
+        # Segments are ordered by start; a segment overlaps if it starts before
+        # end_time and ends after start_time.
+        stop = bisect_left(self.starts, end_time)
+        first = bisect_right(self.starts, start_time)
+        while first > 0 and self.ends[first - 1] > start_time:
+            first -= 1
+        return first, max(first, stop)
+
+    def slice_time(self, start_time, end_time):
+        """
+        Return the segments overlapping [start_time, end_time) as a new transcript.
+
+        Args:
+            start_time (float): Range start in seconds
+            end_time (float): Range end in seconds
+
+        Returns:
+            CompactTranscript: Transcript covering the time range
+        """
+        first, stop = self.index_range(start_time, end_time)
+        return self[first:stop]
+
+    def _take(self, indices):
+        """Copy the given segment indices into a new transcript."""
+        if isinstance(indices, range) and indices.step == 1:
+            first, stop = indices.start, indices.stop
+            base = self.offsets[first] if stop > first else 0
+            return CompactTranscript(
+                array('d', self.starts[first:stop]),
+                array('d', self.ends[first:stop]),
+                array('q', (offset - base for offset in self.offsets[first:stop + 1])) if stop > first else array('q', [0]),
+                array('I', self.word_counts[first:stop]),
+                bytes(self.text_buffer[base:self.offsets[stop]]) if stop > first else b"",
+            )
+
+        starts = array('d')
+        ends = array('d')
+        offsets = array('q', [0])
+        word_counts = array('I')
+        chunks = []
+        position = 0
+        for i in indices:
+            chunk = self.text_buffer[self.offsets[i]:self.offsets[i + 1]]
+            starts.append(self.starts[i])
+            ends.append(self.ends[i])
+            word_counts.append(self.word_counts[i])
+            chunks.append(bytes(chunk))
+            position += len(chunk)
+            offsets.append(position)
+        return CompactTranscript(starts, ends, offsets, word_counts, b"".join(chunks))
+
+    def take(self, indices):
+        """
+        Select arbitrary segments (e.g. search hits) into a new transcript.
+
+        Args:
+            indices (iterable): Segment indices in the desired order
+
+        Returns:
+            CompactTranscript: Transcript with only the selected segments
+        """
+        return self._take(list(indices))
+
+    def nbytes(self):
+        """Approximate memory footprint of the column data in bytes."""
+        return (
+            len(self.starts) * 8 + len(self.ends) * 8 +
+            len(self.offsets) * 8 + len(self.word_counts) * 4 +
+            len(self.text_buffer)
+        )
+
+    def to_bytes(self):
+        """
+        Serialize to the binary on-disk format.
+
+        Layout: header, starts (f64), ends (f64), offsets (i64),
+        word counts (u32, padded to 8 bytes), UTF-8 text buffer.
+        """
+        count = len(self)
+        word_counts = array('I', self.word_counts)
+        if count % 2:
+            word_counts.append(0)  # keep the text buffer 8-byte aligned
+        parts = [
+            _HEADER.pack(_MAGIC, _VERSION, count, len(self.text_buffer)),
+            array('d', self.starts).tobytes(),
+            array('d', self.ends).tobytes(),
+            array('q', self.offsets).tobytes(),
+            word_counts.tobytes(),
+            bytes(self.text_buffer),
+        ]
+        return b"".join(parts)
+
+    def save(self, path):
+        """
+        Write the transcript to a binary file that can be memory-mapped.
+
+        Args:
+            path (str): Destination file path
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as handle:
+            handle.write(self.to_bytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Deserialize a transcript from to_bytes() output (copy or mmap)."""
+        view = memoryview(data)
+        magic, version, count, text_len = _HEADER.unpack_from(view, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a Klipify compact transcript file")
+
+        position = _HEADER.size
+        starts = view[position:position + count * 8].cast('d')
+        position += count * 8
+        ends = view[position:position + count * 8].cast('d')
+        position += count * 8
+        offsets = view[position:position + (count + 1) * 8].cast('q')
+        position += (count + 1) * 8
+        word_counts = view[position:position + count * 4].cast('I')
+        position += (count + count % 2) * 4
+        text_buffer = view[position:position + text_len]
+
+        return cls(starts, ends, offsets, word_counts, text_buffer, _mmap=data if isinstance(data, mmap.mmap) else None)
+
+    @classmethod
+    def load(cls, path, use_mmap=True):
+        """
+        Load a transcript written by save().
+
+        Args:
+            path (str): Transcript file path
+            use_mmap (bool): Memory-map the file instead of reading it
+
+        Returns:
+            CompactTranscript: Loaded transcript
+        """
+        with open(path, "rb") as handle:
+            if not use_mmap:
+                return cls.from_bytes(handle.read())
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls.from_bytes(mapped)
+
+    def __getstate__(self):
+        return {'data': self.to_bytes()}
+
+    def __setstate__(self, state):
+        loaded = CompactTranscript.from_bytes(state['data'])
+        self.__dict__.update(loaded.__dict__)
+
+    def __repr__(self):
+        return f"CompactTranscript(segments={len(self)}, words={self.total_words})"
+
+
+def as_compact_transcript(segments):
+    """
+    Coerce transcript segments to a CompactTranscript.
+
+    Args:
+        segments: CompactTranscript, list of segment dicts, or None
+
+    Returns:
+        CompactTranscript: Compact transcript (empty if segments is falsy)
+    """
+    if isinstance(segments, CompactTranscript):
+        return segments
+    return CompactTranscript.from_segments(segments or [])
@@ -0,0 +1,261 @@
+"""
+Transcript Search Index for Klipify
+Per-video inverted index supporting token, prefix and phrase queries.
+"""
+
+import re
+from array import array
+from bisect import bisect_left
+
+from .transcript import as_compact_transcript
+
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+_QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def tokenize(text):
+    """
+    Split text into lowercase tokens with their character offsets.
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        list: (token, start, end) tuples
+    """
+    return [(match.group().lower(), match.start(), match.end()) for match in _TOKEN_PATTERN.finditer(text)]
+
+
+class SearchResult:
+    """
+    Ordered transcript search hits.
+
+    Highlight offsets are resolved lazily per segment, so only the segments
+    on the visible page pay for span construction.
+    """
+
+    def __init__(self, query, segment_indices, index=None, clause_matches=()):
+        """
+        Args:
+            query (str): Original query string
+            segment_indices (list): Matching segment indices in transcript order
+            index (TranscriptIndex): Index the search ran against
+            clause_matches (tuple): Per clause, parallel sorted lists of match
+                first and last token positions
+        """
+        self.query = query
+        self.segment_indices = segment_indices
+        self._index = index
+        self._clause_matches = clause_matches
+
+    def __len__(self):
+        return len(self.segment_indices)
+
+    def __bool__(self):
+        return bool(self.segment_indices)
+
+    def page(self, page_number, page_size):
+        """
+        Return the segment indices for one page of results.
+
+        Args:
+            page_number (int): Zero-based page number
+            page_size (int): Results per page
+
+        Returns:
+            list: Segment indices on the page
+        """
+        start = page_number * page_size
+        return self.segment_indices[start:start + page_size]
+
+    def within(self, first_segment, stop_segment):
+        """
+        Restrict the hits to a range of segments (e.g. one chapter).
+
+        Args:
+            first_segment (int): First segment index in the range
+            stop_segment (int): Segment index just past the range
+
+        Returns:
+            SearchResult: Hits inside the range, with the same highlighting
+        """
+        low = bisect_left(self.segment_indices, first_segment)
+        high = bisect_left(self.segment_indices, stop_segment)
+        return SearchResult(self.query, self.segment_indices[low:high], self._index, self._clause_matches)
+
+    def spans(self, segment_index):
+        """
+        Return the highlight offsets for one matching segment.
+
+        Args:
+            segment_index (int): Segment index from segment_indices
+
+        Returns:
+            list: Sorted (start, end) character offsets within the segment text
+        """
+        if self._index is None:
+            return []
+        first_position, stop_position = self._index.segment_positions(segment_index)
+        spans = []
+        for firsts, lasts in self._clause_matches:
+            low = bisect_left(firsts, first_position)
+            high = bisect_left(firsts, stop_position)
+            spans.extend(
+                (self._index._occ_start[firsts[i]], self._index._occ_end[lasts[i]])
+                for i in range(low, high)
+            )
+        return sorted(spans)
+
+
+class TranscriptIndex:
+    """
+    Inverted index over a transcript's tokens.
+
+    Every token occurrence gets a global position; postings map each token to
+    its sorted positions, so phrase matching is a position-offset intersection.
+    """
+
+    def __init__(self, transcript):
+        """
+        Build the index for a transcript.
+
+        Args:
+            transcript: CompactTranscript or list of segment dicts
+        """
+        transcript = as_compact_transcript(transcript)
+        self.segment_count = len(transcript)
+
+        # Per-occurrence columns, addressed by global position
+        self._occ_segment = array('I')
+        self._occ_start = array('I')
+        self._occ_end = array('I')
+        postings = {}
+
+        self._segment_first = array('I')
+        position = 0
+        for segment_index, (_start, _end, text) in enumerate(transcript.iter_rows()):
+            self._segment_first.append(position)
+            for token, start, end in tokenize(text):
+                self._occ_segment.append(segment_index)
+                self._occ_start.append(start)
+                self._occ_end.append(end)
+                postings.setdefault(token, []).append(position)
+                position += 1
+        self._segment_first.append(position)
+
+        self._postings = {token: array('I', positions) for token, positions in postings.items()}
+        self._vocabulary = sorted(self._postings)
+
+    @property
+    def token_count(self):
+        """Total number of indexed token occurrences."""
+        return len(self._occ_segment)
+
+    def _prefix_positions(self, prefix):
+        """Return sorted positions of all tokens starting with prefix."""
+        first = bisect_left(self._vocabulary, prefix)
+        merged = []
+        for token in self._vocabulary[first:]:
+            if not token.startswith(prefix):
+                break
+            merged.extend(self._postings[token])
+        merged.sort()
+        return merged
+
+    def _term_positions(self, term):
+        """Return positions for a single query term ("foo" or "foo*")."""
+        if term.endswith('*'):
+            prefix = term.rstrip('*').lower()
+            return self._prefix_positions(prefix) if prefix else []
+        return self._postings.get(term.lower(), [])
+
+    def segment_positions(self, segment_index):
+        """Return the (first, stop) global token positions of a segment."""
+        return self._segment_first[segment_index], self._segment_first[segment_index + 1]
+
+    def _phrase_matches(self, terms):
+        """
+        Find phrase occurrences.
+
+        Returns:
+            tuple: Parallel sorted lists of (first_positions, last_positions)
+        """
+        if len(terms) == 1:
+            positions = self._term_positions(terms[0])
+            return positions, positions
+
+        # Intersect candidate starting positions, rarest term first
+        term_positions = [(offset, self._term_positions(term)) for offset, term in enumerate(terms)]
+        term_positions.sort(key=lambda item: len(item[1]))
+        candidates = None
+        for offset, positions in term_positions:
+            shifted = {position - offset for position in positions}
+            candidates = shifted if candidates is None else candidates & shifted
+            if not candidates:
+                return [], []
+
+        last = len(terms) - 1
+        occ_segment = self._occ_segment
+        firsts = [
+            position for position in sorted(candidates)
+            if position >= 0 and occ_segment[position] == occ_segment[position + last]
+        ]
+        return firsts, [position + last for position in firsts]
+
+    def search(self, query):
+        """
+        Search the transcript.
+
+        Query syntax: bare words must all appear in a segment, ``word*``
+        matches a prefix and ``"quoted words"`` matches an exact phrase.
+
+        Args:
+            query (str): Search query
+
+        Returns:
+            SearchResult: Matching segments with lazily resolved highlight offsets
+        """
+        clauses = []
+        for phrase, word in _QUERY_PATTERN.findall(query or ""):
+            if phrase:
+                terms = [token for token, _s, _e in tokenize(phrase)]
+            else:
+                # Punctuated words like "x-ray" become a phrase; a trailing
+                # '*' applies to the final token only
+                terms = [token for token, _s, _e in tokenize(word)]
+                if terms and word.endswith('*'):
+                    terms[-1] += '*'
+            if terms:
+                clauses.append(terms)
+
+        if not clauses:
+            return SearchResult(query, [])
+
+        segment_of = self._occ_segment.__getitem__
+        matching = None
+        clause_matches = []
+        for terms in clauses:
+            firsts, lasts = self._phrase_matches(terms)
+            segments = set(map(segment_of, firsts))
+            matching = segments if matching is None else matching & segments
+            if not matching:
+                return SearchResult(query, [])
+            clause_matches.append((firsts, lasts))
+
+        return SearchResult(query, sorted(matching), self, tuple(clause_matches))
+
+
+def build_transcript_index(transcript):
+    """
+    Build a TranscriptIndex, returning None for empty transcripts.
+
+    Args:
+        transcript: CompactTranscript or list of segment dicts
+
+    Returns:
+        TranscriptIndex or None
+    """
+    if not transcript:
+        return None
+    return TranscriptIndex(transcript)
@@ -3,12 +3,20 @@ Video Format Utilities for Klipify
 Handles HLS (.m3u8) files and provides conversion options.
 """
 
+import hashlib
+import json
 import streamlit as st
-import requests
 import tempfile
 import os
 
 
+# Pinned so browsers keep one cached copy across pages and sessions
+HLS_JS_URL = "https://cdn.jsdelivr.net/npm/hls.js@1.5.13/dist/hls.min.js"
+
+PLAYER_HEIGHT = 400
+CHAPTER_ROW_HEIGHT = 34
+
+
 class VideoFormatHandler:
     """Handles different video formats and conversion options."""
     
@@ -64,83 +72,10 @@ class VideoFormatHandler:
         if is_timeline_based:
             st.success("✨ Timeline-based clip - Enhanced compatibility")
         
-        # Enhanced HLS player using video.js
+        # Shared HLS player with a single chapter
         try:
-            # Create a custom HTML5 video player with HLS.js support
-            video_html = f"""
-            <div style="width: 100%; max-width: 800px; margin: 0 auto;">
-                <video 
-                    id="video_{clip_index}"
-                    controls 
-                    preload="metadata"
-                    style="width: 100%; height: 400px; background: #000;"
-                    crossorigin="anonymous">
-                    <source src="{stream_url}" type="application/x-mpegURL">
-                    <p style="color: #fff; text-align: center; padding: 20px;">
-                        Your browser doesn't support HLS playback. 
-                        <a href="{stream_url}" style="color: #2563eb;">Click here to download</a>
-                    </p>
-                </video>
-                
-                <script src="https://vjs.zencdn.net/8.0.4/video.min.js"></script>
-                <script src="https://vjs.zencdn.net/ie8/1.1.4/videojs-ie8.min.js"></script>
-                <script src="https://cdn.jsdelivr.net/npm/hls.js@latest"></script>
-                
-                <script>
-                document.addEventListener('DOMContentLoaded', function() {{
-                    const video = document.getElementById('video_{clip_index}');
-                    const videoSrc = '{stream_url}';
-                    
-                    if (Hls.isSupported()) {{
-                        const hls = new Hls({{
-                            enableWorker: true,
-                            lowLatencyMode: true,
-                            backBufferLength: 90
-                        }});
-                        hls.loadSource(videoSrc);
-                        hls.attachMedia(video);
-                        
-                        hls.on(Hls.Events.MANIFEST_PARSED, function() {{
-                            console.log('HLS manifest loaded successfully');
-                        }});
-                        
-                        hls.on(Hls.Events.ERROR, function(event, data) {{
-                            console.error('HLS error:', data);
-                            if (data.fatal) {{
-                                switch(data.type) {{
-                                    case Hls.ErrorTypes.NETWORK_ERROR:
-                                        console.log('Network error - trying to recover');
-                                        hls.startLoad();
-                                        break;
-                                    case Hls.ErrorTypes.MEDIA_ERROR:
-                                        console.log('Media error - trying to recover');
-                                        hls.recoverMediaError();
-                                        break;
-                                    default:
-                                        console.log('Fatal error - cannot recover');
-                                        hls.destroy();
-                                        break;
-                                }}
-                            }}
-                        }});
-                    }} else if (video.canPlayType('application/vnd.apple.mpegurl')) {{
-                        // Native HLS support (Safari)
-                        video.src = videoSrc;
-                    }} else {{
-                        console.error('HLS not supported');
-                    }}
-                }});
-                </script>
-                
-                <link href="https://vjs.zencdn.net/8.0.4/video-js.css" rel="stylesheet">
-            </div>
-            """
-            
-            st.markdown(video_html, unsafe_allow_html=True)
-            
-            # Add a small delay and check message
-            st.info("🔄 Loading video... If it doesn't play, try the alternatives below.")
-            
+            chapters = [{'id': str(clip_index), 'title': clip_title, 'src': stream_url, 'start': 0.0, 'end': None}]
+            render_hls_player(chapters, f"player_{clip_index}", show_chapters=False)
         except Exception as e:
             st.error(f"❌ Video player failed to load: {str(e)}")
         
@@ -239,6 +174,18 @@ class VideoFormatHandler:
             st.markdown("**Online Converters:**")
             st.markdown("Search for 'HLS to MP4 converter' - many free options available")
     
+    @staticmethod
+    def _show_conversion_help(stream_url):
+        """Show help for converting HLS to MP4."""
+        if not stream_url:
+            st.error("No stream URL available for conversion")
+            return
+        
+        st.info("💡 **MP4 Conversion Options:**")
+        
+        with st.expander("🔧 How to convert HLS to MP4"):
+            VideoFormatHandler._show_playback_alternatives(stream_url)
+    
     @staticmethod
     def create_download_buttons(clip_data, youtube_id):
         """Create download buttons with multiple options."""
@@ -250,14 +197,15 @@ class VideoFormatHandler:
         
         # YouTube link (always available)
         youtube_link = create_youtube_link(youtube_id, clip_data.get('start_time', 0))
+        player_id = clip_player_id(clip_data)
         with col1:
             st.link_button("▶️ YouTube", youtube_link, use_container_width=True)
         
         # HLS Stream
         with col2:
             if clip_data.get('stream_url'):
-                if st.button("🎥 HLS Stream", key=f"hls_{id(clip_data)}", use_container_width=True):
-                    st.session_state[f'show_player_{id(clip_data)}'] = True
+                if st.button("🎥 HLS Stream", key=f"hls_{player_id}", use_container_width=True):
+                    st.session_state[f'show_player_{player_id}'] = True
             else:
                 st.button("🎥 HLS (N/A)", disabled=True, use_container_width=True)
         
@@ -266,20 +214,20 @@ class VideoFormatHandler:
             if clip_data.get('download_url'):
                 st.link_button("📱 Download MP4", clip_data['download_url'], use_container_width=True)
             else:
-                if st.button("📱 Convert MP4", key=f"convert_{id(clip_data)}", use_container_width=True):
+                if st.button("📱 Convert MP4", key=f"convert_{player_id}", use_container_width=True):
                     VideoFormatHandler._show_conversion_help(clip_data.get('stream_url'))
         
         # Copy URL
         with col4:
-            if st.button("📋 Copy URL", key=f"copy_{id(clip_data)}", use_container_width=True):
+            if st.button("📋 Copy URL", key=f"copy_{player_id}", use_container_width=True):
                 st.code(clip_data.get('stream_url', youtube_link), language=None)
         
         # Show player if requested
-        if st.session_state.get(f'show_player_{id(clip_data)}'):
+        if st.session_state.get(f'show_player_{player_id}'):
             VideoFormatHandler.display_video_player(
                 clip_data.get('stream_url'), 
                 clip_data.get('concept', 'Video Clip'),
-                id(clip_data)
+                player_id
             )
 
 
@@ -287,7 +235,7 @@ def display_video_player(clip):
     """Simple function to display video player for clips (used by UI components)."""
     stream_url = clip.get('timeline_url') or clip.get('stream_url')
     clip_title = clip.get('concept', clip.get('title', 'Video Clip'))
-    clip_index = id(clip) % 1000  # Simple unique ID
+    clip_index = clip_player_id(clip)
     
     if stream_url:
         VideoFormatHandler.display_video_player(stream_url, clip_title, clip_index)
@@ -295,23 +243,206 @@ def display_video_player(clip):
         st.error("❌ No video URL available for this clip")
 
 
+
+def display_clip_player(clips, key="clips", stream_url=None):
+    """
+    Display one shared player for a list of clips.
+    
+    Args:
+        clips (list): Clip dicts
+        key (str): Identifies the player on the page
+        stream_url (str, optional): One stream containing every clip (e.g. the
+            full video); clips then play as chapters of it
+    """
+    chapters = build_chapter_map(clips, stream_url)
+    if not chapters:
+        st.info("No playable clips to show in the player.")
+        return
+    
+    render_hls_player(chapters, f"player_{key}")
+
+
+def clip_player_id(clip):
+    """
+    Get a stable ID for a clip's player and widgets.
+    
+    Derived from the clip's stream and time range, so it stays the same across
+    reruns and does not collide between clips.
+    
+    Args:
+        clip (dict): Clip data
+        
+    Returns:
+        str: Element-safe ID
+    """
+    fields = ('timeline_url', 'stream_url', 'start_time', 'end_time', 'concept')
+    identity = "|".join(str(clip.get(field) or '') for field in fields)
+    return "clip_" + hashlib.sha1(identity.encode("utf-8")).hexdigest()[:12]
+
+
+def build_chapter_map(clips, stream_url=None):
+    """
+    Build the chapters the shared player switches between.
+    
+    Args:
+        clips (list): Clip dicts
+        stream_url (str, optional): One stream containing every clip; each
+            clip becomes its start/end range within it
+        
+    Returns:
+        list: Chapters with id, title, src, start and end (None plays to the end)
+    """
+    chapters = []
+    for index, clip in enumerate(clips):
+        if clip.get('error'):
+            continue
+        
+        if stream_url:
+            src = stream_url
+            start = clip.get('start_time') or 0
+            end = clip.get('end_time')
+        else:
+            # A clip's own stream contains only the clip
+            src = clip.get('timeline_url') or clip.get('stream_url')
+            start, end = 0, None
+        
+        if not src:
+            continue
+        
+        chapters.append({
+            'id': clip_player_id(clip),
+            'title': clip.get('concept') or clip.get('title') or f"Clip {index + 1}",
+            'src': src,
+            'start': float(start),
+            'end': float(end) if end is not None else None
+        })
+    
+    return chapters
+
+
+def render_hls_player(chapters, player_id, height=PLAYER_HEIGHT, show_chapters=True):
+    """
+    Render a single HLS player that switches between chapters.
+    
+    hls.js loads once for the player and one Hls instance is reused. Only
+    manifests load until playback starts, and chapters that share a stream
+    seek within it instead of reloading.
+    
+    Args:
+        chapters (list): Chapters from build_chapter_map()
+        player_id (str): Stable element ID
+        height (int): Video height in pixels
+        show_chapters (bool): Show the chapter list under the video
+    """
+    import streamlit.components.v1 as components
+    
+    list_height = min(len(chapters), 6) * CHAPTER_ROW_HEIGHT + 12 if show_chapters and len(chapters) > 1 else 0
+    components.html(
+        _hls_player_html(chapters, player_id, height, list_height),
+        height=height + list_height + 48
+    )
+
+
+def _hls_player_html(chapters, player_id, height, list_height):
+    """Build the self-contained player document."""
+    # Escape "</" so titles and URLs can never close the script element
+    data = json.dumps({'chapters': chapters, 'playerId': player_id}).replace("</", "<\\/")
+    
+    return f"""
+<style>
+  body {{ margin: 0; font-family: "Source Sans Pro", sans-serif; }}
+  video {{ width: 100%; height: {height}px; background: #000; border-radius: 8px; }}
+  .status {{ font-size: 0.8rem; color: #6b7280; margin: 4px 2px; }}
+  .chapters {{ max-height: {list_height}px; overflow-y: auto; display: {'block' if list_height else 'none'}; }}
+  .chapter {{ display: block; width: 100%; height: {CHAPTER_ROW_HEIGHT - 4}px; margin: 2px 0; text-align: left;
+              border: 1px solid #e5e7eb; border-radius: 6px; background: #fff; cursor: pointer;
+              white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }}
+  .chapter.active {{ border-color: #2563eb; background: #eff6ff; }}
+</style>
+<video id="{player_id}" controls preload="none" crossorigin="anonymous" playsinline></video>
+<div class="status" id="{player_id}_status"></div>
+<div class="chapters" id="{player_id}_chapters"></div>
+<script src="{HLS_JS_URL}"></script>
+<script>
+  const data = {data};
+  const video = document.getElementById(data.playerId);
+  const status = document.getElementById(data.playerId + "_status");
+  const list = document.getElementById(data.playerId + "_chapters");
+  let hls = null, currentSrc = null, current = null, loading = false;
+
+  function createHls() {{
+    // Fetch only the manifest until the learner presses play
+    const instance = new Hls({{ autoStartLoad: false, enableWorker: true, backBufferLength: 90 }});
+    instance.attachMedia(video);
+    instance.on(Hls.Events.ERROR, function(event, error) {{
+      if (!error.fatal) return;
+      if (error.type === Hls.ErrorTypes.NETWORK_ERROR) {{
+        instance.startLoad();
+      }} else if (error.type === Hls.ErrorTypes.MEDIA_ERROR) {{
+        instance.recoverMediaError();
+      }} else {{
+        status.textContent = "⚠️ This clip can't be played here - use the stream URL instead.";
+        instance.destroy();
+        hls = null;
+        currentSrc = null;
+      }}
+    }});
+    return instance;
+  }}
+
+  function select(index, autoplay) {{
+    current = data.chapters[index];
+    list.querySelectorAll(".chapter").forEach((button, i) => button.classList.toggle("active", i === index));
+    status.textContent = "🎥 " + current.title;
+
+    if (current.src === currentSrc) {{
+      // Chapters of one stream only seek
+      video.currentTime = current.start;
+    }} else if (window.Hls && Hls.isSupported()) {{
+      if (!hls) hls = createHls();
+      hls.stopLoad();
+      loading = false;
+      hls.loadSource(current.src);
+      currentSrc = current.src;
+    }} else if (video.canPlayType("application/vnd.apple.mpegurl")) {{
+      video.src = current.src;
+      currentSrc = current.src;
+      video.addEventListener("loadedmetadata", () => {{ video.currentTime = current.start; }}, {{ once: true }});
+    }} else {{
+      status.textContent = "⚠️ HLS playback isn't supported in this browser.";
+      return;
+    }}
+    if (autoplay) video.play().catch(() => {{}});
+  }}
+
+  video.addEventListener("play", () => {{
+    if (hls && !loading) {{
+      loading = true;
+      hls.startLoad(current.start);
+    }}
+  }});
+  video.addEventListener("timeupdate", () => {{
+    if (current && current.end !== null && video.currentTime >= current.end) video.pause();
+  }});
+
+  data.chapters.forEach((chapter, index) => {{
+    const button = document.createElement("button");
+    button.className = "chapter";
+    button.textContent = (index + 1) + ". " + chapter.title;
+    button.title = chapter.title;
+    button.addEventListener("click", () => select(index, true));
+    list.append(button);
+  }});
+  select(0, false);
+</script>
+"""
+
+
 def create_youtube_link(youtube_id, start_time=0):
     """Create a YouTube link with timestamp."""
     if not youtube_id:
         return "#"
     return f"https://www.youtube.com/watch?v={youtube_id}&t={int(start_time)}s"
-    
-    @staticmethod
-    def _show_conversion_help(stream_url):
-        """Show help for converting HLS to MP4."""
-        if not stream_url:
-            st.error("No stream URL available for conversion")
-            return
-        
-        st.info("💡 **MP4 Conversion Options:**")
-        
-        with st.expander("🔧 How to convert HLS to MP4"):
-            VideoFormatHandler._show_playback_alternatives(stream_url)
 
 
 def check_video_compatibility(url):
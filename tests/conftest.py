@@ -0,0 +1,48 @@
+"""
+Shared fixtures for the Klipify test suite.
+
+Tests run offline against the fake VideoDB and Gemini backends, with all
+local data (store, queue, library index) kept in a temporary directory.
+"""
+
+import os
+import sys
+
+import pytest
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+
+# Module-level singletons that cache paths or state under the data directory
+_SINGLETONS = (
+    ('src.services.video_store', '_store'),
+    ('src.services.job_queue', '_queue'),
+    ('src.services.scheduler', '_pools'),
+    ('src.services.artifact_cache', '_cache'),
+    ('src.services.job_registry', '_registry'),
+)
+
+
+@pytest.fixture
+def klipify_env(tmp_path, monkeypatch):
+    """
+    Point Klipify at the fake backends and a throwaway data directory.
+
+    Yields:
+        str: The temporary data directory
+    """
+    import importlib
+
+    from src.services.fake_backends import configure_fake_backend
+
+    data_dir = tmp_path / "data"
+    monkeypatch.setenv("KLIPIFY_BACKEND", "fake")
+    monkeypatch.setenv("KLIPIFY_DATA_DIR", str(data_dir))
+    for module_name, attribute in _SINGLETONS:
+        monkeypatch.setattr(importlib.import_module(module_name), attribute, None)
+
+    # No simulated latency, and short videos so each pipeline run is quick
+    configure_fake_backend(latency_scale=0, transcript_minutes=6)
+    yield str(data_dir)
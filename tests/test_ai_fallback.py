@@ -0,0 +1,84 @@
+"""Local fallback tests for Gemini-backed stages."""
+
+import threading
+from contextlib import contextmanager
+
+from src.services.ai_service import FALLBACK_DEADLINE, FALLBACK_QUOTA, AIService
+from src.services.scheduler import POOL_GEMINI, ResourcePools
+
+
+class _Slot:
+    """Records how long a pool slot stays held."""
+
+    def __init__(self):
+        self.held = 0
+        self.released = threading.Event()
+
+    @contextmanager
+    def __call__(self, abandoned):
+        self.held += 1
+        try:
+            yield
+        finally:
+            self.held -= 1
+            self.released.set()
+
+
+def test_abandoned_call_keeps_its_slot_until_it_returns():
+    service = AIService(client=None)
+    slot = _Slot()
+    finish = threading.Event()
+
+    def slow_generate():
+        finish.wait(5)
+        return "from gemini"
+
+    result, reason = service._with_fallback(
+        'summary', slow_generate, lambda: "local", deadline=0.05, hold=slot
+    )
+    assert (result, reason) == ("local", FALLBACK_DEADLINE)
+    assert slot.held == 1
+
+    finish.set()
+    assert slot.released.wait(5)
+    assert slot.held == 0
+
+
+def test_quota_error_falls_back_and_releases_slot():
+    service = AIService(client=None)
+    slot = _Slot()
+
+    def over_quota():
+        raise Exception("429 RESOURCE_EXHAUSTED: quota exceeded")
+
+    result, reason = service._with_fallback('concepts', over_quota, lambda: ["local"], deadline=1, hold=slot)
+    assert (result, reason) == (["local"], FALLBACK_QUOTA)
+    assert slot.held == 0
+
+
+def test_waiting_for_a_slot_counts_against_the_deadline(tmp_path, monkeypatch):
+    monkeypatch.setenv("KLIPIFY_GEMINI_CONCURRENCY", "1")
+    pools = ResourcePools(str(tmp_path / "pools.db"), poll_interval=0.01)
+    service = AIService(client=None)
+    calls = []
+    gave_up = threading.Event()
+
+    @contextmanager
+    def hold(abandoned):
+        try:
+            with pools.slot(POOL_GEMINI, "late", should_cancel=abandoned):
+                yield
+        finally:
+            gave_up.set()
+
+    # Another stage keeps the only Gemini slot busy
+    with pools.slot(POOL_GEMINI, "busy"):
+        result, reason = service._with_fallback(
+            'summary', lambda: calls.append(1), lambda: "local", deadline=0.1, hold=hold
+        )
+        assert (result, reason) == ("local", FALLBACK_DEADLINE)
+        # The abandoned wait stops instead of calling Gemini once a slot frees up
+        assert gave_up.wait(5)
+
+    assert calls == []
+    assert pools.get_stats()[POOL_GEMINI]['in_use'] == 0
@@ -0,0 +1,36 @@
+"""Bulk clip generation from My Videos on the fake backends."""
+
+from src.services.fake_backends import FakeVideoDBConnection, get_fake_backend_stats
+from src.services.video_store import get_video_store
+from src.services.videodb_manager import VideoDBManager
+
+
+def test_bulk_generate_clips_for_existing_videos(klipify_env):
+    conn = FakeVideoDBConnection()
+    videos = [
+        conn.upload(url=f"https://www.youtube.com/watch?v={youtube_id}", name=name)
+        for youtube_id, name in (("aaaaaaaaaaa", "Lecture one"), ("bbbbbbbbbbb", "Lecture two"))
+    ]
+    manager = VideoDBManager()
+    progress = []
+
+    result = manager.generate_clips_for_videos(
+        [video.id for video in videos] + ["m-missing"],
+        on_progress=lambda done, total, video_id, error: progress.append((done, total, video_id, error))
+    )
+
+    assert result.succeeded == [video.id for video in videos]
+    assert result.failed == ["m-missing"]
+    assert "not found" in result.errors["m-missing"]
+    # A failed video is not rerun through the whole pipeline
+    assert result.attempts["m-missing"] == 1
+    assert [entry[0] for entry in progress] == [1, 2, 3]
+
+    for video in videos:
+        video_data = result.results[video.id]['video_data']
+        assert video_data['clips']
+        assert video_data['videodb_id'] == video.id
+        # Results are stored under the YouTube ID from the video's source URL
+        assert get_video_store().has_video(video_data['youtube_id'])
+    # Existing videos are never uploaded again
+    assert get_fake_backend_stats()['upload']['calls'] == 2
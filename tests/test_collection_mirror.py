@@ -0,0 +1,48 @@
+"""Collection mirror sync tests."""
+
+from types import SimpleNamespace
+
+from src.services.collection_mirror import CollectionMirror
+
+
+def _video(video_id, name, description="", status="ready", length=60):
+    return SimpleNamespace(id=video_id, name=name, description=description, length=length,
+                           created_at="2026-01-01", status=status, thumbnail_url="", stream_url="")
+
+
+class _Collection:
+    id = "c-test"
+
+    def __init__(self, videos):
+        self.videos = videos
+
+    def get_videos(self):
+        return list(self.videos)
+
+
+def _names(mirror, search_term=None):
+    return [video['name'] for video in mirror.query("c-test", search_term)['videos']]
+
+
+def test_sync_applies_additions_edits_and_removals(tmp_path):
+    mirror = CollectionMirror(str(tmp_path / "collection.db"))
+    collection = _Collection([_video("v1", "Gradient descent"), _video("v2", "Linear algebra")])
+
+    assert mirror.sync(collection)['added'] == 2
+    assert mirror.sync(collection, force=True) == {
+        'fetched': True, 'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 2
+    }
+
+    # A rename and a status change reach the mirror and the search index
+    collection.videos = [_video("v1", "Backpropagation basics"), _video("v2", "Linear algebra", status="failed")]
+    result = mirror.sync(collection, force=True)
+    assert (result['added'], result['updated'], result['removed']) == (0, 2, 0)
+    assert _names(mirror, "backpropagaton") == ["Backpropagation basics"]
+    assert _names(mirror, "gradient") == []
+    statuses = {video['id']: video['status'] for video in mirror.query("c-test")['videos']}
+    assert statuses["v2"] == "failed"
+
+    collection.videos = [_video("v2", "Linear algebra", status="failed")]
+    result = mirror.sync(collection, force=True)
+    assert (result['updated'], result['removed'], result['unchanged']) == (0, 1, 1)
+    assert _names(mirror) == ["Linear algebra"]
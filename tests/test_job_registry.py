@@ -0,0 +1,79 @@
+"""Single-flight job registry tests."""
+
+import threading
+
+from src.services.job_registry import JOB_CANCELLED, JOB_SUCCEEDED, JobRegistry, ProcessingCancelled
+
+
+def _blocking_run(release, checked=None):
+    def run(job):
+        release.wait(5)
+        if checked is not None:
+            checked.set()
+        if job.is_cancel_requested():
+            raise ProcessingCancelled("Processing was cancelled")
+        return job.key
+    return run
+
+
+def test_joining_after_cancel_withdraws_the_cancel():
+    registry = JobRegistry()
+    release = threading.Event()
+    job, started = registry.submit("abc", _blocking_run(release), "learner-a")
+    assert started
+
+    assert job.cancel("learner-a")
+    joined, started = registry.submit("abc", _blocking_run(release), "learner-b")
+    assert joined is job and not started
+    assert not job.is_cancel_requested()
+
+    release.set()
+    assert job.wait(5)
+    assert job.state == JOB_SUCCEEDED
+
+
+def test_job_already_stopping_is_replaced():
+    registry = JobRegistry()
+    release_old = threading.Event()
+    job, _ = registry.submit("abc", _blocking_run(release_old), "learner-a")
+    job.cancel("learner-a")
+    # The pipeline has seen the request, so the run cannot be revived
+    assert job.is_cancel_requested()
+
+    release = threading.Event()
+    release.set()
+    fresh, started = registry.submit("abc", _blocking_run(release), "learner-b")
+    assert started and fresh is not job
+    assert fresh.wait(5)
+    assert fresh.state == JOB_SUCCEEDED
+
+    release_old.set()
+    assert job.wait(5)
+    assert job.state == JOB_CANCELLED
+    # The stopped run does not evict its replacement
+    assert registry.get("abc") is fresh
+
+
+def test_cancel_by_last_waiter_stops_the_job():
+    registry = JobRegistry()
+    release = threading.Event()
+    job, _ = registry.submit("abc", _blocking_run(release), "learner-a")
+    job.cancel("learner-a")
+    release.set()
+    assert job.wait(5)
+    assert job.state == JOB_CANCELLED
+
+
+def test_finished_job_opens_results_through_its_loader():
+    registry = JobRegistry()
+    results = {}
+
+    def run(job):
+        results[job.key] = {'youtube_id': job.key}
+        return results[job.key]
+
+    job, _ = registry.submit("abc", run, "learner-a", result_loader=lambda key: dict(results[key]))
+    assert job.wait(5)
+    assert job.result == {'youtube_id': "abc"}
+    # Only the key is kept; every waiter opens its own copy
+    assert job.result is not job.result
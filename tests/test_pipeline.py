@@ -0,0 +1,106 @@
+"""End-to-end pipeline tests on the fake VideoDB and Gemini backends."""
+
+import pytest
+
+from src.processing import SilentReporter, VideoProcessingPipeline
+from src.services.backends import connect_videodb, create_genai_client
+from src.services.fake_backends import (
+    configure_fake_backend, get_fake_backend_stats, inject_failures, reset_fake_backend_stats
+)
+from src.services.video_store import get_video_store
+
+
+YOUTUBE_ID = "dQw4w9WgXcQ"
+YOUTUBE_URL = f"https://www.youtube.com/watch?v={YOUTUBE_ID}"
+
+RUN_STAGES = {
+    'upload_index', 'transcript_index', 'chapters', 'summary', 'concepts',
+    'segments', 'clips', 'notes', 'store', 'library_index',
+}
+
+
+def _calls():
+    return {operation: stats['calls'] for operation, stats in get_fake_backend_stats().items()}
+
+
+@pytest.fixture
+def pipeline(klipify_env):
+    return VideoProcessingPipeline(connect_videodb(), create_genai_client(), reporter=SilentReporter())
+
+
+def test_run_produces_every_stage_output(pipeline):
+    video_data = pipeline.run(YOUTUBE_URL, YOUTUBE_ID)
+
+    assert set(video_data['stage_timings']) == RUN_STAGES
+    assert video_data['videodb_id']
+    assert len(video_data['transcript_segments']) > 0
+    assert len(video_data['transcript_index'].search("the")) > 0
+    assert video_data['summary']
+    assert video_data['concepts']
+    assert video_data['clips']
+    assert {clip['concept'] for clip in video_data['clips']} <= set(video_data['concepts'])
+    assert video_data['notes']
+    assert video_data['chapters']
+    assert video_data['degraded'] == {}
+
+    calls = _calls()
+    assert calls['upload'] == 1
+    assert calls['index_spoken_words'] == 1
+    # Summary, concepts and one notes call per chapter
+    assert calls['generate_content'] == 2 + len(video_data['chapters'])
+    assert calls['search'] == len(video_data['concepts'])
+
+    stored = get_video_store().load_video(YOUTUBE_ID)
+    assert stored['summary'] == video_data['summary']
+    assert stored['concepts'] == video_data['concepts']
+
+
+def test_regenerate_reuses_stored_results(pipeline):
+    video_data = pipeline.run(YOUTUBE_URL, YOUTUBE_ID)
+    stored = get_video_store().load_video(YOUTUBE_ID)
+    reset_fake_backend_stats()
+
+    regenerated = pipeline.regenerate(video_data['video_object'], stored=stored)
+
+    assert regenerated['reused'] == ['transcript', 'summary', 'concepts', 'notes']
+    assert regenerated['youtube_id'] == YOUTUBE_ID
+    assert regenerated['summary'] == video_data['summary']
+    assert regenerated['clips']
+    assert not {'summary', 'concepts', 'notes'} & set(regenerated['stage_timings'])
+
+    calls = _calls()
+    # Nothing is uploaded, indexed or sent to Gemini again; only clips are rebuilt
+    assert 'upload' not in calls
+    assert 'index_spoken_words' not in calls
+    assert 'get_transcript' not in calls
+    assert 'generate_content' not in calls
+    assert calls['search'] == len(stored['concepts'])
+
+
+def test_regenerate_replaces_local_fallback_results(pipeline):
+    inject_failures('generate_content', count=1)
+    video_data = pipeline.run(YOUTUBE_URL, YOUTUBE_ID)
+    assert video_data['degraded'] == {'summary': 'quota'}
+    assert video_data['summary']
+
+    stored = get_video_store().load_video(YOUTUBE_ID)
+    reset_fake_backend_stats()
+    regenerated = pipeline.regenerate(video_data['video_object'], stored=stored)
+
+    assert 'summary' not in regenerated['reused']
+    assert regenerated['degraded'] == {}
+    assert _calls()['generate_content'] == 1
+
+
+def test_run_completes_locally_when_gemini_is_out_of_quota(klipify_env):
+    configure_fake_backend(latency_scale=0, transcript_minutes=6, error_rates={'generate_content': 1.0})
+    pipeline = VideoProcessingPipeline(connect_videodb(), create_genai_client(), reporter=SilentReporter())
+
+    video_data = pipeline.run(YOUTUBE_URL, YOUTUBE_ID)
+
+    assert video_data['degraded'] == {'summary': 'quota', 'concepts': 'quota', 'notes': 'quota'}
+    assert video_data['summary']
+    assert video_data['concepts']
+    # Local notes keep one section per chapter, with clickable timestamps
+    assert all(chapter['title'] in video_data['notes'] for chapter in video_data['chapters'])
+    assert f"youtube.com/watch?v={YOUTUBE_ID}&t=" in video_data['notes']
@@ -0,0 +1,38 @@
+"""Resource pool tests: inline defaults and slot renewal."""
+
+import sqlite3
+import time
+
+from src.services.scheduler import POOL_GEMINI, ResourcePools, get_resource_pools
+
+
+def test_inline_mode_runs_without_pools(klipify_env, monkeypatch):
+    monkeypatch.delenv("KLIPIFY_PROCESSING_MODE", raising=False)
+    monkeypatch.delenv("KLIPIFY_VIDEODB_CONCURRENCY", raising=False)
+    monkeypatch.delenv("KLIPIFY_GEMINI_CONCURRENCY", raising=False)
+    assert get_resource_pools() is None
+
+    monkeypatch.setenv("KLIPIFY_GEMINI_CONCURRENCY", "3")
+    assert get_resource_pools() is not None
+
+
+def test_held_slot_is_renewed_until_released(tmp_path):
+    pools = ResourcePools(str(tmp_path / "pools.db"), slot_ttl=0.3, poll_interval=0.01)
+
+    def expiry():
+        conn = sqlite3.connect(pools.db_path)
+        try:
+            row = conn.execute("SELECT expires_at FROM pool_slots WHERE holder = 'a'").fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    with pools.slot(POOL_GEMINI, "a"):
+        first = expiry()
+        # Held well past the original expiry; the slot must still be there
+        time.sleep(0.6)
+        assert expiry() > first
+        assert pools.get_stats()[POOL_GEMINI]['in_use'] == 1
+
+    assert expiry() is None
+    assert pools.get_stats()[POOL_GEMINI]['in_use'] == 0
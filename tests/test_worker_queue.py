@@ -0,0 +1,108 @@
+"""Queue and worker tests: job completion and recovery from crashed workers."""
+
+import time
+
+import pytest
+
+from klipify_worker import Worker
+from src.services.backends import connect_videodb, create_genai_client
+from src.services.job_queue import (
+    JobQueue,
+    LeaseLost,
+    STATE_DONE,
+    STATE_FAILED,
+    STATE_LEASED,
+)
+from src.services.video_store import get_video_store
+
+
+YOUTUBE_ID = "dQw4w9WgXcQ"
+
+
+def _enqueue(queue, youtube_id=YOUTUBE_ID, **kwargs):
+    payload = {'youtube_url': f"https://www.youtube.com/watch?v={youtube_id}", 'youtube_id': youtube_id}
+    job_id, created = queue.enqueue(youtube_id, payload, **kwargs)
+    assert created
+    return job_id
+
+
+def _worker(queue, worker_id):
+    return Worker(queue, connect_videodb(), create_genai_client(), lease_seconds=30, worker_id=worker_id)
+
+
+@pytest.fixture
+def queue(klipify_env):
+    return JobQueue()
+
+
+def test_worker_completes_job_and_stores_result(queue):
+    job_id = _enqueue(queue)
+    worker = _worker(queue, "worker-a")
+
+    job = queue.lease(worker.worker_id, worker.lease_seconds)
+    assert job['id'] == job_id
+    worker.process(job)
+
+    row = queue.get_job(job_id)
+    assert row['state'] == STATE_DONE
+    assert row['finished_at'] is not None
+    assert queue.lease(worker.worker_id) is None
+
+    stored = get_video_store().load_video(YOUTUBE_ID)
+    assert stored is not None
+    assert stored['summary']
+    assert stored['clips']
+    assert len(stored['transcript_segments']) > 0
+
+
+def test_expired_lease_is_recovered_by_another_worker(queue):
+    job_id = _enqueue(queue)
+
+    # A worker leases the job and crashes without heartbeating
+    crashed = queue.lease("worker-crashed", lease_seconds=0.05)
+    assert crashed['id'] == job_id
+    assert queue.lease("worker-b") is None
+    time.sleep(0.1)
+
+    worker = _worker(queue, "worker-b")
+    job = queue.lease(worker.worker_id, worker.lease_seconds)
+    assert job['id'] == job_id
+    assert job['attempts'] == 2
+
+    # The crashed worker no longer owns the job and cannot finish it
+    with pytest.raises(LeaseLost):
+        queue.heartbeat(job_id, "worker-crashed")
+    queue.complete(job_id, "worker-crashed")
+    assert queue.get_job(job_id)['state'] == STATE_LEASED
+
+    worker.process(job)
+    assert queue.get_job(job_id)['state'] == STATE_DONE
+    assert get_video_store().has_video(YOUTUBE_ID)
+
+
+def test_lease_expiring_on_last_attempt_fails_job(queue):
+    job_id = _enqueue(queue, max_attempts=1)
+    queue.lease("worker-crashed", lease_seconds=0.05)
+    time.sleep(0.1)
+
+    assert queue.lease("worker-b") is None
+    row = queue.get_job(job_id)
+    assert row['state'] == STATE_FAILED
+    assert row['finished_at'] is not None
+
+
+def test_enqueue_does_not_join_a_cancelled_job(queue):
+    payload = {'youtube_url': f"https://www.youtube.com/watch?v={YOUTUBE_ID}", 'youtube_id': YOUTUBE_ID}
+    job_id, _ = queue.enqueue(YOUTUBE_ID, payload, waiter_id="learner-a")
+    queue.lease("worker-a")
+    assert queue.cancel(job_id, "learner-a")
+
+    new_id, created = queue.enqueue(YOUTUBE_ID, payload, waiter_id="learner-b")
+    assert created and new_id != job_id
+    assert queue.waiter_count(new_id) == 1
+
+    # A waiter attached at enqueue keeps the job alive when another one cancels
+    same_id, created = queue.enqueue(YOUTUBE_ID, payload, waiter_id="learner-c")
+    assert same_id == new_id and not created
+    assert not queue.cancel(new_id, "learner-b")
+    assert not queue.is_cancel_requested(new_id)